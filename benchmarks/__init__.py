@@ -0,0 +1,8 @@
+"""
+Package containing standalone performance benchmarks. Run each one from the project root, e.g.
+``python -m benchmarks.server_tick``
+
+├-- benchmarks
+    ├-- server_tick.py
+    ├-- triangle_collide.py
+"""
@@ -0,0 +1,104 @@
+"""
+Measures how long ``OrbeetoServer.tick`` takes for a single match, and how many bytes it sends, as the number of live
+bullets grows.
+"""
+import random as rand
+import time
+
+from server import OrbeetoServer
+from server_match import Match
+
+BULLET_COUNTS = (0, 100, 500, 1000, 2500, 5000, 10000)
+PLAYER_COUNT = 8
+TICKS_PER_COUNT = 20
+
+
+class BenchChannel:
+    def __init__(self, player_id: int, x: float, y: float):
+        """A stand-in for a connected PlayerChannel that counts and discards everything sent to it.
+
+        :param player_id: The ID of the fake player
+        :param x: The x-position of the fake player
+        :param y: The y-position of the fake player
+        """
+        self.id = player_id
+        self.ip = f'10.0.0.{player_id}'
+        self.state = {
+            "x": x,
+            "y": y,
+            "vel_x": 0,
+            "vel_y": 0,
+            "hp": 10 ** 9,
+            "hit_w": 32,
+            "hit_h": 32,
+            "angle": 0,
+            "username": f'bench{player_id}',
+            "lobby_mode": False,
+            "last_input": 0,
+        }
+        self.bytes_sent = 0
+        self.acked_seq = None
+        self.view_history = {}
+        self.view_cell = None
+        self.last_move_seq = None
+        self.move_budget = 0.0
+
+    def Send(self, data):
+        pass
+
+    def SendEncoded(self, payload):
+        self.bytes_sent += len(payload)
+
+
+def populate(match: Match, bullet_count: int) -> None:
+    """Replaces every bullet in a match with a fresh, randomly placed set of bullets.
+
+    :param match: The match to fill with bullets
+    :param bullet_count: The number of bullets to spawn
+    :return: None
+    """
+    match.bullets.clear()
+    for _ in range(bullet_count):
+        match.spawn_bullet(
+            owner=rand.randrange(PLAYER_COUNT),
+            bullet_type="standard",
+            x=rand.uniform(64, 1280 * 4 - 64),
+            y=rand.uniform(64, 720 * 4 - 64),
+            vel_x=rand.uniform(-10, 10),
+            vel_y=rand.uniform(-10, 10),
+            hit_w=6,
+            hit_h=6,
+        )
+
+
+def run() -> None:
+    rand.seed(0)
+    server = OrbeetoServer(host="127.0.0.1", port=0)
+    match = server.create_match()
+    match.lobby_mode = False
+
+    for pid in range(PLAYER_COUNT):
+        match.add_player(BenchChannel(pid, rand.uniform(200, 5000), rand.uniform(200, 2700)))
+
+    print(f'{"bullets":>8} | {"tick (ms)":>10} | {"per bullet (us)":>15} | {"sent (KiB/tick)":>15}')
+    for count in BULLET_COUNTS:
+        total = 0.0
+        sent = 0
+        for _ in range(TICKS_PER_COUNT):
+            populate(match, count)
+            start = time.perf_counter()
+            server.tick()
+            total += time.perf_counter() - start
+
+            for ch in match.players.values():
+                sent += ch.bytes_sent
+                ch.bytes_sent = 0
+
+        tick_ms = total / TICKS_PER_COUNT * 1000
+        per_bullet = tick_ms * 1000 / count if count else 0.0
+        sent_kib = sent / TICKS_PER_COUNT / 1024
+        print(f'{count:>8} | {tick_ms:>10.3f} | {per_bullet:>15.3f} | {sent_kib:>15.1f}')
+
+
+if __name__ == '__main__':
+    run()
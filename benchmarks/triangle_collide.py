@@ -0,0 +1,175 @@
+"""
+Measures how long it takes to find which side of a box something hit, comparing the original trigonometric
+``triangle_collide`` against the distance-based ``simulation.get_collision_side`` and its batched NumPy version.
+
+Before timing anything, every version is run over the same seeded golden set of points and boxes to check that they
+all agree. Points that are almost exactly as close to two sides are counted separately, since the original picks
+whichever side its trigonometry happens to round toward there, while the current versions break ties in a fixed order.
+"""
+import math
+import random as rand
+import time
+
+import numpy as np
+from pygame.math import Vector2 as vec
+
+import constants as cst
+import simulation
+
+GOLDEN_SEED = 0
+GOLDEN_SIZE = 50000
+TIE_TOLERANCE = 1e-9  # Points whose two nearest sides are closer together than this count as ties
+REPEATS = 5
+
+
+def legacy_triangle_collide(inst: vec, spr: vec, spr_hit: vec) -> str | None:
+    """The original side finder, which measured the distance to each side from the corners using trigonometry. Kept
+    here as the reference the current one is checked and timed against.
+
+    :param inst: The position of the instigator
+    :param spr: The position of the center of the box
+    :param spr_hit: The size of the box
+    :return: The side of the box the instigator struck
+    """
+    point_a = vec(spr.x + spr_hit.x // 2, spr.y + spr_hit.y // 2)  # Bottom right corner
+    point_b = vec(spr.x + spr_hit.x // 2, spr.y - spr_hit.y // 2)  # Top right corner
+    point_c = vec(spr.x - spr_hit.x // 2, spr.y - spr_hit.y // 2)  # Top left corner
+    point_d = vec(spr.x - spr_hit.x // 2, spr.y + spr_hit.y // 2)  # Bottom left corner
+
+    def get_height(point: vec, trig) -> float:
+        length = math.sqrt((point.x - inst.x) ** 2 + (point.y - inst.y) ** 2)
+        angle = math.radians(math.degrees(math.atan2(inst.x - point.x, inst.y - point.y)) + 90)
+        return abs(length * trig(angle))
+
+    heights = [get_height(point_a, math.sin), get_height(point_b, math.cos),
+               get_height(point_c, math.sin), get_height(point_d, math.cos)]
+
+    def is_closest_side(index: int) -> bool:
+        return all(heights[index] < height for i, height in enumerate(heights) if i != index)
+
+    if is_closest_side(0):
+        if inst.x >= point_b.x:
+            return cst.EAST
+        if inst.x <= point_d.x:
+            return cst.WEST
+        return cst.SOUTH
+
+    elif is_closest_side(1):
+        if inst.y >= point_a.y:
+            return cst.SOUTH
+        if inst.y <= point_c.y:
+            return cst.NORTH
+        return cst.EAST
+
+    elif is_closest_side(2):
+        if inst.x >= point_b.x:
+            return cst.EAST
+        if inst.x <= point_d.x:
+            return cst.WEST
+        return cst.NORTH
+
+    elif is_closest_side(3):
+        if inst.y >= point_a.y:
+            return cst.SOUTH
+        if inst.y <= point_c.y:
+            return cst.NORTH
+        return cst.WEST
+
+
+def make_golden_set() -> list[tuple[float, float, float, float, float, float]]:
+    """Builds the seeded set of points and boxes every version is checked against. Half of the points are on whole
+    pixels, like sprite positions usually are, which makes exact ties common.
+
+    :return: A list of (x, y, box_x, box_y, box_w, box_h) cases
+    """
+    rng = rand.Random(GOLDEN_SEED)
+    cases = []
+    for i in range(GOLDEN_SIZE):
+        box_w = rng.choice((4, 16, 17, 54, 64, 180, 2880))
+        box_h = rng.choice((4, 16, 20, 33, 64, 180))
+        box_x = rng.randint(-8, 8) * 32
+        box_y = rng.randint(-8, 8) * 32
+        x = box_x + rng.uniform(-box_w, box_w)
+        y = box_y + rng.uniform(-box_h, box_h)
+        if i % 2:
+            x, y = round(x), round(y)
+        cases.append((x, y, box_x, box_y, box_w, box_h))
+    return cases
+
+
+def is_near_tie(x: float, y: float, box_x: float, box_y: float, box_w: float, box_h: float) -> bool:
+    left = box_x - box_w // 2
+    right = box_x + box_w // 2
+    top = box_y - box_h // 2
+    bottom = box_y + box_h // 2
+    dists = sorted((abs(y - bottom), abs(x - right), abs(y - top), abs(x - left)))
+    return dists[1] - dists[0] <= TIE_TOLERANCE * max(1.0, dists[1])
+
+
+def check_golden_set(cases: list) -> None:
+    """Checks that the original, scalar, and batched versions all agree on every case of the golden set.
+
+    :raises AssertionError: If any version disagrees with another outside of a tie
+    """
+    legacy = [legacy_triangle_collide(vec(x, y), vec(bx, by), vec(bw, bh)) for x, y, bx, by, bw, bh in cases]
+    scalar = [simulation.get_collision_side(*case) for case in cases]
+
+    # Cases are grouped by box, since the batched version tests many points against one box
+    by_box = {}
+    for i, case in enumerate(cases):
+        by_box.setdefault(case[2:], []).append(i)
+
+    batched = [None] * len(cases)
+    for (bx, by, bw, bh), indices in by_box.items():
+        x = np.array([cases[i][0] for i in indices], np.float64)
+        y = np.array([cases[i][1] for i in indices], np.float64)
+        codes = simulation.get_collision_sides(x, y, bx, by, bw, bh)
+        for i, code in zip(indices, codes.tolist()):
+            batched[i] = simulation.SIDES[code]
+
+    ties = mismatches = batch_mismatches = 0
+    for case, old, new, batch in zip(cases, legacy, scalar, batched):
+        if new != batch:
+            batch_mismatches += 1
+        if old != new:
+            if is_near_tie(*case):
+                ties += 1
+            else:
+                mismatches += 1
+
+    print(f'Golden set: {len(cases)} cases, {mismatches} mismatches against the original, {ties} differing ties, '
+          f'{batch_mismatches} batched mismatches')
+    assert mismatches == 0, f'{mismatches} cases disagree with the original outside of a tie'
+    assert batch_mismatches == 0, f'{batch_mismatches} cases disagree between the scalar and batched versions'
+
+
+def time_call(function, cases: list) -> float:
+    """Returns the shortest time (in seconds) out of REPEATS runs of a function over every case."""
+    best = math.inf
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function(cases)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run() -> None:
+    cases = make_golden_set()
+    check_golden_set(cases)
+
+    legacy_cases = [(vec(x, y), vec(bx, by), vec(bw, bh)) for x, y, bx, by, bw, bh in cases]
+    x = np.array([case[0] for case in cases])
+    y = np.array([case[1] for case in cases])
+
+    legacy_time = time_call(lambda c: [legacy_triangle_collide(*case) for case in legacy_cases], cases)
+    scalar_time = time_call(lambda c: [simulation.get_collision_side(*case) for case in c], cases)
+    batched_time = time_call(lambda c: simulation.get_collision_sides(x, y, 0, 0, 64, 64), cases)
+
+    print(f'{"version":>10} | {"per call (us)":>13} | {"speedup":>8}')
+    for name, elapsed in (("original", legacy_time), ("scalar", scalar_time), ("batched", batched_time)):
+        per_call = elapsed / len(cases) * 1e6
+        print(f'{name:>10} | {per_call:>13.3f} | {legacy_time / elapsed:>7.1f}x')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,382 @@
+"""
+Contains the NumPy-backed bullet table the server simulates all of its bullets with.
+"""
+from collections import deque
+import math
+
+import numpy as np
+
+BULLET_TYPES = ("standard", "portal_bullet")
+BULLET_TYPE_CODES = {name: code for code, name in enumerate(BULLET_TYPES)}
+
+
+class BulletTable:
+    """Stores every live bullet as a row across a set of parallel arrays (structure-of-arrays). A bullet's ID is the
+    index of its row, and rows freed by destroyed bullets are reused through a free-list."""
+    def __init__(self, capacity: int = 1024):
+        """Stores every live bullet as a row across a set of parallel arrays.
+
+        :param capacity: The number of rows to allocate up front. The table doubles in size whenever it runs out.
+        """
+        self.capacity = 0
+        self.x = np.zeros(0, np.float64)
+        self.y = np.zeros(0, np.float64)
+        self.vx = np.zeros(0, np.float64)
+        self.vy = np.zeros(0, np.float64)
+        self.hit_w = np.zeros(0, np.int32)
+        self.hit_h = np.zeros(0, np.int32)
+        self.owner = np.zeros(0, np.int32)
+        self.type = np.zeros(0, np.int8)
+        self.alive = np.zeros(0, np.bool_)
+
+        self.count = 0
+        self._free = []  # Stack of unused row indices, lowest index on top
+        self._pending_free = []  # Rows destroyed since the last call to retire_ids()
+        self._retired = deque()  # (seq, rows) for rows missing from every snapshot since seq, oldest first
+
+        self._grow(capacity)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, bullet_id):
+        return 0 <= bullet_id < self.capacity and bool(self.alive[bullet_id])
+
+    def _grow(self, new_capacity: int) -> None:
+        """Resizes every column of the table, keeping all existing rows.
+
+        :param new_capacity: The new number of rows
+        :return: None
+        """
+        extra = new_capacity - self.capacity
+        for column in ('x', 'y', 'vx', 'vy', 'hit_w', 'hit_h', 'owner', 'type', 'alive'):
+            old = getattr(self, column)
+            setattr(self, column, np.concatenate((old, np.zeros(extra, old.dtype))))
+
+        self._free.extend(range(new_capacity - 1, self.capacity - 1, -1))
+        self.capacity = new_capacity
+
+    # ------------------------------- Adding and removing ------------------------------- #
+    def spawn(self, owner: int, bullet_type: str, x: float, y: float, vel_x: float, vel_y: float,
+              hit_w: int, hit_h: int) -> int:
+        """Adds a bullet to the table.
+
+        :param owner: The ID of the player that fired the bullet
+        :param bullet_type: The name of the bullet's type. Must be in BULLET_TYPES.
+        :param x: The x-position of the bullet's center
+        :param y: The y-position of the bullet's center
+        :param vel_x: The x-axis component of the bullet's velocity
+        :param vel_y: The y-axis component of the bullet's velocity
+        :param hit_w: The width of the bullet's hitbox
+        :param hit_h: The height of the bullet's hitbox
+        :return: The ID of the new bullet
+        """
+        if not self._free:
+            self._grow(self.capacity * 2)
+
+        bullet_id = self._free.pop()
+        self.x[bullet_id] = x
+        self.y[bullet_id] = y
+        self.vx[bullet_id] = vel_x
+        self.vy[bullet_id] = vel_y
+        self.hit_w[bullet_id] = hit_w
+        self.hit_h[bullet_id] = hit_h
+        self.owner[bullet_id] = owner
+        self.type[bullet_id] = BULLET_TYPE_CODES[bullet_type]
+        self.alive[bullet_id] = True
+        self.count += 1
+
+        return bullet_id
+
+    def destroy(self, bullet_id: int) -> bool:
+        """Removes a bullet from the table. Its ID is not handed out again until ``retire_ids`` and ``recycle_ids``
+        say that no client can still be holding the bullet, so clients always see it disappear before its ID is reused.
+
+        :param bullet_id: The ID of the bullet to remove
+        :return: Whether the bullet was alive before being removed
+        """
+        if bullet_id not in self:
+            return False
+
+        self.alive[bullet_id] = False
+        self.vx[bullet_id] = 0
+        self.vy[bullet_id] = 0
+        self.count -= 1
+        self._pending_free.append(bullet_id)
+        return True
+
+    def retire_ids(self, seq: int) -> None:
+        """Records that every bullet destroyed since the last call is missing from a snapshot, and from every snapshot
+        after it.
+
+        :param seq: The sequence number of the snapshot
+        :return: None
+        """
+        if self._pending_free:
+            self._retired.append((seq, self._pending_free))
+            self._pending_free = []
+
+    def recycle_ids(self, oldest_baseline: int) -> None:
+        """Makes the IDs of bullets retired at or before a snapshot available to new bullets. Clients are sent deltas
+        against snapshots they have acknowledged, so an ID is only safe to reuse once every snapshot a client could
+        still be holding was taken after the bullet was destroyed.
+
+        :param oldest_baseline: The oldest snapshot any client could still be sent a delta against
+        :return: None
+        """
+        freed = []
+        while self._retired and self._retired[0][0] <= oldest_baseline:
+            freed.extend(self._retired.popleft()[1])
+        if freed:
+            self._free.extend(sorted(freed, reverse=True))
+
+    def clear(self) -> None:
+        """Removes every bullet from the table and makes every ID available again straight away.
+
+        :return: None
+        """
+        for bullet_id in self.live_ids().tolist():
+            self.destroy(bullet_id)
+        self.retire_ids(-1)
+        self.recycle_ids(math.inf)
+
+    # ------------------------------------ Queries ------------------------------------ #
+    def live_ids(self) -> np.ndarray:
+        """Returns the IDs of every live bullet in ascending order."""
+        return np.flatnonzero(self.alive)
+
+    def get_hitboxes(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the left, top, right, and bottom edges of every row's hitbox. Edges are truncated to integers the
+        same way ``pygame.Rect`` truncates them.
+
+        :return: The left, top, right, and bottom edge arrays
+        """
+        left = (self.x - self.hit_w // 2).astype(np.int64)
+        top = (self.y - self.hit_h // 2).astype(np.int64)
+        return left, top, left + self.hit_w, top + self.hit_h
+
+    def get_swept_hitboxes(self, scale: float) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the edges of the box every row's hitbox sweeps through when it moves along its velocity, which
+        covers the hitbox both before and after moving.
+
+        :param scale: The fraction of each bullet's velocity it will move by
+        :return: The left, top, right, and bottom edge arrays
+        """
+        left, top, right, bottom = self.get_hitboxes()
+        dx = (self.vx * scale).astype(np.int64)
+        dy = (self.vy * scale).astype(np.int64)
+        return (
+            left + np.minimum(dx, 0) - 1,  # Padded by a pixel, since the distances were truncated
+            top + np.minimum(dy, 0) - 1,
+            right + np.maximum(dx, 0) + 1,
+            bottom + np.maximum(dy, 0) + 1
+        )
+
+    def hit_test(self, left: int, top: int, width: int, height: int, mask: np.ndarray = None) -> np.ndarray:
+        """Returns the IDs of every live bullet whose hitbox overlaps a box.
+
+        :param left: The left edge of the box
+        :param top: The top edge of the box
+        :param width: The width of the box
+        :param height: The height of the box
+        :param mask: An optional boolean mask further restricting which rows are tested
+        :return: The IDs of the overlapping bullets in ascending order
+        """
+        b_left, b_top, b_right, b_bottom = self.get_hitboxes()
+        hits = (
+            self.alive
+            & (b_left < left + width) & (b_right > left)
+            & (b_top < top + height) & (b_bottom > top)
+        )
+        if mask is not None:
+            hits &= mask
+        return np.flatnonzero(hits)
+
+    def out_of_bounds(self, left: float, top: float, right: float, bottom: float) -> np.ndarray:
+        """Returns the IDs of every live bullet whose center lies on or outside the given bounds.
+
+        :return: The IDs of the bullets out of bounds in ascending order
+        """
+        oob = (self.x >= right) | (self.x <= left) | (self.y >= bottom) | (self.y <= top)
+        return np.flatnonzero(oob & self.alive)
+
+    def set_motion(self, bullet_id: int, x: float, y: float, vel_x: float, vel_y: float) -> None:
+        """Overwrites the position and velocity of a single bullet.
+
+        :param bullet_id: The ID of the bullet
+        :param x: The new x-position of the bullet's center
+        :param y: The new y-position of the bullet's center
+        :param vel_x: The new x-axis component of the bullet's velocity
+        :param vel_y: The new y-axis component of the bullet's velocity
+        :return: None
+        """
+        self.x[bullet_id] = x
+        self.y[bullet_id] = y
+        self.vx[bullet_id] = vel_x
+        self.vy[bullet_id] = vel_y
+
+    def get(self, bullet_id: int) -> dict:
+        """Returns the data of a single bullet in the same format clients receive it.
+
+        :param bullet_id: The ID of the bullet
+        :return: The bullet's data
+        """
+        return {
+            "owner": int(self.owner[bullet_id]),
+            "bullet_type": BULLET_TYPES[self.type[bullet_id]],
+            "x": float(self.x[bullet_id]),
+            "y": float(self.y[bullet_id]),
+            "vel_x": float(self.vx[bullet_id]),
+            "vel_y": float(self.vy[bullet_id]),
+            "hit_w": int(self.hit_w[bullet_id]),
+            "hit_h": int(self.hit_h[bullet_id]),
+        }
+
+    def to_dict(self) -> dict[int, dict]:
+        """Returns the data of every live bullet, keyed by bullet ID.
+
+        :return: A dict in the format ``{bullet_id: bullet_data}``
+        """
+        return self.get_columns().to_dict()
+
+    def get_columns(self) -> 'BulletColumns':
+        """Returns a copy of every live row of the table, for storing in a snapshot.
+
+        :return: The live rows, sorted by bullet ID
+        """
+        ids = self.live_ids()
+        return BulletColumns(
+            ids,
+            owner=self.owner[ids],
+            bullet_type=self.type[ids],
+            x=self.x[ids],
+            y=self.y[ids],
+            vel_x=self.vx[ids],
+            vel_y=self.vy[ids],
+            hit_w=self.hit_w[ids],
+            hit_h=self.hit_h[ids],
+        )
+
+    # ------------------------------------ Physics ------------------------------------ #
+    def integrate(self, scale: float, travel: np.ndarray = None) -> None:
+        """Moves every bullet along its velocity.
+
+        :param scale: The fraction of each bullet's velocity to move it by
+        :param travel: An optional per-row fraction of the move to make, for bullets stopped partway by a collision
+        :return: None
+        """
+        if travel is None:
+            self.x += self.vx * scale
+            self.y += self.vy * scale
+        else:
+            self.x += self.vx * scale * travel
+            self.y += self.vy * scale * travel
+
+    def __repr__(self):
+        return f'BulletTable({self.count}/{self.capacity})'
+
+
+class BulletColumns:
+    """A frozen copy of some rows of a bullet table, sorted by bullet ID. Snapshots store bullets this way, so that
+    recording, filtering, and comparing them are array operations, and dicts are only built for the bullets actually
+    sent to a client."""
+    FIELDS = ("owner", "bullet_type", "x", "y", "vel_x", "vel_y", "hit_w", "hit_h")
+
+    def __init__(self, ids: np.ndarray, **columns: np.ndarray):
+        """A frozen copy of some rows of a bullet table, sorted by bullet ID.
+
+        :param ids: The IDs of the bullets in ascending order
+        :param columns: One array per name in FIELDS, holding that field of every bullet in the same order as ids.
+            Bullet types are stored as their codes.
+        """
+        self.ids = ids
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, bullet_id):
+        row = np.searchsorted(self.ids, bullet_id)
+        return row < len(self.ids) and self.ids[row] == bullet_id
+
+    def _find_rows(self, ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Looks up the rows holding some bullets.
+
+        :param ids: The IDs of the bullets to look for in ascending order
+        :return: A mask of which of the IDs are present, and the rows of the ones that are
+        """
+        if not len(self.ids):
+            return np.zeros(len(ids), np.bool_), np.empty(0, np.int64)
+        rows = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        found = self.ids[rows] == ids
+        return found, rows[found]
+
+    def take(self, rows: np.ndarray) -> 'BulletColumns':
+        """Returns some of the rows.
+
+        :param rows: The indices of the rows to keep, in ascending order
+        :return: The chosen rows
+        """
+        return BulletColumns(self.ids[rows], **{name: column[rows] for name, column in self.columns.items()})
+
+    def select(self, ids: np.ndarray) -> 'BulletColumns':
+        """Returns the rows of some bullets. Bullets that aren't present are left out.
+
+        :param ids: The IDs of the bullets to keep in ascending order
+        :return: The chosen rows
+        """
+        return self.take(self._find_rows(ids)[1])
+
+    def to_dict(self, rows: np.ndarray = None) -> dict[int, dict]:
+        """Returns the data of some of the bullets in the same format clients receive it, keyed by bullet ID.
+
+        :param rows: The indices of the rows to convert. Defaults to every row.
+        :return: A dict in the format ``{bullet_id: bullet_data}``
+        """
+        if rows is None:
+            rows = slice(None)
+        ids = self.ids[rows].tolist()
+        fields = [
+            [BULLET_TYPES[code] for code in column[rows].tolist()] if name == "bullet_type" else column[rows].tolist()
+            for name, column in self.columns.items()
+        ]
+        names = list(self.columns)
+        return {bid: dict(zip(names, values)) for bid, *values in zip(ids, *fields)}
+
+    def diff(self, baseline: 'BulletColumns | None') -> tuple[dict, dict, list]:
+        """Returns the differences between an older copy of the rows and this one, in the same format as
+        ``snapshots.make_delta``. Bullets whose type changed are sent with their new type like any other field.
+
+        :param baseline: The rows the receiver already has. None if the receiver has nothing.
+        :return: The full state of every new bullet, the differing fields of every changed bullet, and the IDs of
+            every destroyed bullet
+        """
+        if baseline is None or not len(baseline):
+            return self.to_dict(), {}, []
+
+        existed, old_rows = baseline._find_rows(self.ids)
+        new_rows = np.flatnonzero(existed)
+        created = self.to_dict(np.flatnonzero(~existed))
+
+        kept, _ = self._find_rows(baseline.ids)
+        destroyed = baseline.ids[~kept].tolist()
+
+        changed = {}
+        for name, column in self.columns.items():
+            differs = column[new_rows] != baseline.columns[name][old_rows]
+            if not differs.any():
+                continue
+            rows = new_rows[differs]
+            values = column[rows].tolist()
+            if name == "bullet_type":
+                values = [BULLET_TYPES[code] for code in values]
+            for bid, value in zip(self.ids[rows].tolist(), values):
+                fields = changed.get(bid)
+                if fields is None:
+                    fields = changed[bid] = {}
+                fields[name] = value
+
+        return created, changed, destroyed
+
+    def __repr__(self):
+        return f'BulletColumns({len(self.ids)})'
@@ -9,6 +9,7 @@ import pygame
 from pygame.math import Vector2 as vec
 
 import controls as ctrl
+import simulation
 
 import constants as cst
 import groups
@@ -195,88 +196,14 @@ def triangle_collide(instig, sprite, spr_hit: vec = vec(0, 0)) -> str:
                 +------------+
                     Side A
     """
-    inst = instig
-    if type(instig) is not vec:
-        inst = inst.pos
-
-    spr = sprite
-    if type(sprite) is not vec:
-        spr = sprite.pos
-        spr_hit = vec(sprite.hitbox.width, sprite.hitbox.height)
-
-    # Bottom right corner
-    point_a = vec(spr.x + spr_hit.x // 2,
-                  spr.y + spr_hit.y // 2)
-
-    # Top right corner
-    point_b = vec(spr.x + spr_hit.x // 2,
-                  spr.y - spr_hit.y // 2)
-
-    # Top left corner
-    point_c = vec(spr.x - spr_hit.x // 2,
-                  spr.y - spr_hit.y // 2)
-
-    # Bottom left corner
-    point_d = vec(spr.x - spr_hit.x // 2,
-                  spr.y + spr_hit.y // 2)
-
-    len_point_a = get_dist(inst, point_a)
-    len_point_b = get_dist(inst, point_b)
-    len_point_c = get_dist(inst, point_c)
-    len_point_d = get_dist(inst, point_d)
-
-    angle_a = math.radians(get_angle(inst, point_a) + 90)
-    angle_b = math.radians(get_angle(inst, point_b) + 90)
-    angle_c = math.radians(get_angle(inst, point_c) + 90)
-    angle_d = math.radians(get_angle(inst, point_d) + 90)
-
-    height_ap = abs(len_point_a * math.sin(angle_a))
-    height_bp = abs(len_point_b * math.cos(angle_b))
-    height_cp = abs(len_point_c * math.sin(angle_c))
-    height_dp = abs(len_point_d * math.cos(angle_d))
-
-    def is_closest_side(height: float) -> bool:
-        """Determines if the given distance is the one closest to the instigator (the shortest)
-
-        :param height: The distance from a side to the instigator
-        :return: If the distance is the shortest (True) or not (False)
-        """
-        height_list = [height_ap, height_bp, height_cp, height_dp]
-        height_list.remove(height)
-
-        output = True
-        for dist in height_list:
-            if not (height < dist):
-                output = False
-        return output
-
-    if is_closest_side(height_ap):
-        if inst.x >= point_b.x:
-            return cst.EAST
-        if inst.x <= point_d.x:
-            return cst.WEST
-        return cst.SOUTH
+    inst = instig if type(instig) is vec else instig.pos
 
-    elif is_closest_side(height_bp):
-        if inst.y >= point_a.y:
-            return cst.SOUTH
-        if inst.y <= point_c.y:
-            return cst.NORTH
-        return cst.EAST
+    if type(sprite) is vec:
+        return simulation.get_collision_side(inst.x, inst.y, sprite.x, sprite.y, spr_hit.x, spr_hit.y)
 
-    elif is_closest_side(height_cp):
-        if inst.x >= point_b.x:
-            return cst.EAST
-        if inst.x <= point_d.x:
-            return cst.WEST
-        return cst.NORTH
-
-    elif is_closest_side(height_dp):
-        if inst.y >= point_a.y:
-            return cst.SOUTH
-        if inst.y <= point_c.y:
-            return cst.NORTH
-        return cst.WEST
+    spr = sprite.pos
+    hitbox = sprite.hitbox
+    return simulation.get_collision_side(inst.x, inst.y, spr.x, spr.y, hitbox.width, hitbox.height)
 
 
 # ============================================================================ #
@@ -1,5 +1,5 @@
 """
-Module containing ActorBase and AbstractBase.
+Module containing ActorBase, StaticBase, and AbstractBase.
 """
 import functools
 import time
@@ -9,11 +9,12 @@ from pygame.math import Vector2 as vec
 
 import screen
 
-import calc
 import constants as cst
 import gamestack as gs
 import groups
+import simulation
 import spritesheet
+import visuals
 
 
 def get_room():
@@ -25,6 +26,17 @@ def get_room():
     return groups.all_rooms[0]
 
 
+def get_camera_pos() -> vec:
+    """Returns where the top-left corner of the current room is on the screen. Static sprites are drawn relative to it.
+
+    Returns:
+        pygame.math.Vector2: The position of the room on the screen
+    """
+    if not groups.all_rooms:
+        return vec(0, 0)
+    return get_room().pos
+
+
 def check_update_state(method):
     """Only runs the given method if the sprite's can_update field is True
 
@@ -39,6 +51,9 @@ def check_update_state(method):
 
 class ActorBase(pygame.sprite.Sprite):
     """The base class for all actors in the game."""
+    is_static = False  # Whether the sprite keeps a fixed position within its room (see StaticBase)
+    is_anchored = False  # Whether the sprite's rect keeps a fixed place within its room, so layers can index it
+
     def __init__(self, layer: int = 1, gamestate: gs.GameState = gs.s_action):
         """The base class for all actors in the game
 
@@ -176,13 +191,14 @@ class ActorBase(pygame.sprite.Sprite):
             self.center_rects()
 
     def rotate_image(self, angle: float) -> None:
-        """Rotates the sprite's image by a specific angle
+        """Rotates the sprite's image by a specific angle. Rotations are shared through ``visuals.rotation_cache``, so
+        the rotated image must not be drawn onto.
 
         :param angle: The angle to rotate the sprite's image by
         :return: None
         """
         self.orig_image = self.orig_images[self.index]
-        self.image = pygame.transform.rotate(self.orig_image, int(angle))
+        self.image = visuals.rotation_cache.rotate(self.orig_image, angle)
         self.rect = self.image.get_rect(center=self.rect.center)
     
     # ---------------------------------- Physics --------------------------------- # 
@@ -232,52 +248,118 @@ class ActorBase(pygame.sprite.Sprite):
 
     def _block_from_side(self, sprite) -> None:
         if self.hitbox.colliderect(sprite.hitbox):
-            width = (self.hitbox.width + sprite.hitbox.width) // 2
-            height = (self.hitbox.height + sprite.hitbox.height) // 2
-
-            # If hitting the right side
-            if calc.triangle_collide(self, sprite) == cst.EAST:
+            self.pos.x, self.pos.y, side = simulation.block_from_side(
+                self.pos.x, self.pos.y, self.hitbox.width, self.hitbox.height,
+                sprite.pos.x, sprite.pos.y, sprite.hitbox.width, sprite.hitbox.height
+            )
+            if side in (cst.EAST, cst.WEST):
                 self.vel.x = 0
-                self.pos.x = sprite.pos.x + width
-
-            # Hitting bottom side
-            if calc.triangle_collide(self, sprite) == cst.SOUTH:
+            elif side in (cst.SOUTH, cst.NORTH):
                 self.vel.y = 0
-                self.pos.y = sprite.pos.y + height
-
-            # Hitting left side
-            if calc.triangle_collide(self, sprite) == cst.WEST:
-                self.vel.x = 0
-                self.pos.x = sprite.pos.x - width
-
-            # Hitting top side
-            if calc.triangle_collide(self, sprite) == cst.NORTH:
-                self.vel.y = 0
-                self.pos.y = sprite.pos.y - height
 
     def _align_sprite(self, portal_out, offset: float, direction: str) -> None:
-        width = (portal_out.hitbox.width + self.hitbox.width) // 2
-        height = (portal_out.hitbox.height + self.hitbox.height) // 2
-
         # Makes sure that sprites don't repeatedly get thrown back into the portals b/c of room velocity
         room = get_room()
-        vel_adjust = room.vel.copy()
+        margin = abs(room.vel.y) if direction in (cst.SOUTH, cst.NORTH) else abs(room.vel.x)
 
-        if direction == cst.SOUTH:
-            self.pos.x = portal_out.pos.x - offset
-            self.pos.y = portal_out.pos.y + height + abs(vel_adjust.y)
+        self.pos.x, self.pos.y = simulation.get_exit_position(
+            portal_out.get_data(), offset, self.hitbox.width, self.hitbox.height, margin
+        )
 
-        elif direction == cst.EAST:
-            self.pos.x = portal_out.pos.x + width + abs(vel_adjust.x)
-            self.pos.y = portal_out.pos.y - offset
 
-        elif direction == cst.NORTH:
-            self.pos.x = portal_out.pos.x + offset
-            self.pos.y = portal_out.pos.y - height - abs(vel_adjust.y)
+class StaticBase(ActorBase):
+    """The base class for sprites that never move within their room, like walls and floors."""
+    is_static = True
+    is_bakeable = True  # Whether the sprite's image never changes, so it can be baked into the room's static layer
+    is_anchored = True
+
+    def __init__(self, layer: int = 1, gamestate: gs.GameState = gs.s_action):
+        """The base class for sprites that never move within their room. Rather than being moved across the screen
+        every frame while the room scrolls, static sprites keep a fixed position within the room (``room_pos``), and
+        their position on the screen is worked out from the room's position whenever it is read.
+
+        :param layer: The layer the sprite should be drawn on
+        :param gamestate: The gamestate the sprite should be a part of. Defaults to 'gs.s_action'
+        """
+        self._rects_camera_pos = None  # The room position the rects were last placed for
+        super().__init__(layer, gamestate)
+
+    # --------------------------- Room-relative position -------------------------- #
+    @property
+    def room_pos(self) -> vec:
+        """The position of the sprite within its room. Assign to it to move the sprite, since changing the returned
+        vector in place doesn't move the sprite's rects."""
+        return self._room_pos
+
+    @room_pos.setter
+    def room_pos(self, value: vec):
+        self._room_pos = value
+        self._rects_camera_pos = None
+        self._reanchor()
+
+    @property
+    def pos(self) -> vec:
+        """The position of the sprite on the screen. Assign to it to move the sprite, since changing the returned
+        vector in place has no effect."""
+        return self.room_pos + get_camera_pos()
+
+    @pos.setter
+    def pos(self, value: vec):
+        self.room_pos = vec(value) - get_camera_pos()
+        self._rects_camera_pos = None
+
+    @property
+    def vel(self) -> vec:
+        """Static sprites only move across the screen as fast as the room scrolls."""
+        if not groups.all_rooms:
+            return vec(0, 0)
+        return vec(get_room().vel)
+
+    @vel.setter
+    def vel(self, value: vec):
+        pass
+
+    @property
+    def rect(self) -> pygame.Rect:
+        self._follow_camera()
+        return self._rect
+
+    @rect.setter
+    def rect(self, value: pygame.Rect):
+        self._rect = value
+        self._rects_camera_pos = None
+        self._reanchor()
+
+    @property
+    def hitbox(self) -> pygame.Rect:
+        self._follow_camera()
+        return self._hitbox
+
+    @hitbox.setter
+    def hitbox(self, value: pygame.Rect):
+        self._hitbox = value
+        self._rects_camera_pos = None
+
+    def _follow_camera(self) -> None:
+        """Re-centers the sprite's rects if the room has moved since they were last placed."""
+        camera = get_camera_pos()
+        camera_pos = (camera.x, camera.y)
+        if camera_pos != self._rects_camera_pos:
+            self._rects_camera_pos = camera_pos  # Set first, since center_rects() reads the rects again
+            self.center_rects()
+
+    def _reanchor(self) -> None:
+        """Tells the layers the sprite is drawn by that it moved within its room."""
+        if self.is_anchored:
+            for group in self.groups():
+                if isinstance(group, gs.GameLayer):
+                    group.move_anchored(self)
+
+    def set_room_pos(self) -> None:
+        pass
 
-        elif direction == cst.WEST:
-            self.pos.x = portal_out.pos.x - width - abs(vel_adjust.x)
-            self.pos.y = portal_out.pos.y + offset
+    def movement(self):
+        pass
 
 
 class AbstractBase(pygame.sprite.AbstractGroup):
@@ -3,36 +3,239 @@ import pygame
 import screen
 import timer
 
+import constants as cst
+
 
 class GameLayer(pygame.sprite.LayeredUpdates):
-    def __init__(self, *sprites, **kwargs):
+    MAX_DIRTY_RECTS = 32  # Past this many changed rects, they are merged into one
+    ANCHOR_CELL_SIZE = 256  # The size of the cells of the room that anchored sprites are found by (in pixels)
+
+    def __init__(self, *sprites, camera=None, **kwargs):
+        """A layered group that draws only the sprites on the screen. Sprites that are anchored to a fixed place in
+        their room (like walls, floors, and baked chunks) are kept in a grid over the room, so finding the ones on
+        the screen only looks at the cells the screen covers. Every other sprite is checked each frame.
+
+        :param sprites: The sprites to add to the group
+        :param camera: A function returning where the top-left corner of the room anchored sprites are placed in is on
+            the screen. Without one, the room is taken to be at the top-left corner of the screen.
+        :param kwargs: The keyword arguments to add the sprites with
+        """
+        self.camera = camera
+        self._anchored = {}  # {(cell_x, cell_y): {sprite, ...}} Anchored sprites, by the cells of the room they cover
+        self._anchored_spans = {}  # {sprite: (min_x, min_y, max_x, max_y)} The cells each anchored sprite covers
+        self._loose = {}  # {sprite: None} Every sprite that isn't anchored, in the order it was added
+        self._order = {}  # {sprite: (layer, n)} Sorting by this gives the order sprites are drawn in
+        self._added = 0  # The number of times a sprite has been added or moved to a layer
         super().__init__(sprites, kwargs)  # noqa
+        self.full_redraw = True  # Whether the whole screen is redrawn every frame, so no dirty rects are needed
+        self.viewport = pygame.Rect(0, 0, cst.WINWIDTH, cst.WINHEIGHT)
+        self.background = (0, 255, 255)  # The color behind the sprites
+
+        self._drawn_images = {}  # {sprite: image} The image each sprite was last drawn with in dirty-rect mode
+        self._drawn_underlays = []  # [(image, rect), ...] The underlays drawn in the last dirty-rect draw
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._added += 1
+        self._order[sprite] = (self._spritelayers[sprite], self._added)
+        if getattr(sprite, 'is_anchored', False):
+            self.move_anchored(sprite)
+        else:
+            self._loose[sprite] = None
 
-    def draw(self, surface):
-        """Updates version of
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self._drawn_images.pop(sprite, None)
+        del self._order[sprite]
+        self._loose.pop(sprite, None)
+        span = self._anchored_spans.pop(sprite, None)
+        if span is not None:
+            self._unbucket(sprite, span)
 
-        LayeredUpdates.draw(surface): return Rect_list
+    def change_layer(self, sprite, new_layer):
+        super().change_layer(sprite, new_layer)
+        self._added += 1
+        self._order[sprite] = (new_layer, self._added)
 
+    # ------------------------------ Anchored sprites ------------------------------ #
+    def set_camera(self, camera) -> None:
+        """Changes where the room anchored sprites are placed in is on the screen, and files every anchored sprite
+        in the grid again using it.
+
+        :param camera: A function returning where the top-left corner of the room is on the screen, or None if it is
+            at the top-left corner of the screen
+        :return: None
+        """
+        self.camera = camera
+        anchored = list(self._anchored_spans)
+        self._anchored = {}
+        self._anchored_spans = {}
+        for sprite in anchored:
+            self.move_anchored(sprite)
+
+    def _get_camera_pos(self) -> tuple[int, int]:
+        if self.camera is None:
+            return 0, 0
+        camera = self.camera()
+        return int(camera[0]), int(camera[1])
+
+    def _get_span(self, rect: pygame.Rect) -> tuple[int, int, int, int]:
+        """Returns the cells of the room a rect on the screen covers.
+
+        :param rect: The rect, in screen coordinates
+        :return: The lowest and highest x and y indices of the covered cells
+        """
+        camera_x, camera_y = self._get_camera_pos()
+        size = self.ANCHOR_CELL_SIZE
+        return (
+            (rect.left - camera_x - 1) // size,  # Padded by a pixel, since the camera position was truncated
+            (rect.top - camera_y - 1) // size,
+            (rect.right - camera_x) // size,
+            (rect.bottom - camera_y) // size,
+        )
+
+    def _unbucket(self, sprite, span: tuple[int, int, int, int]) -> None:
+        min_x, min_y, max_x, max_y = span
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                cell = self._anchored[cell_x, cell_y]
+                cell.discard(sprite)
+                if not cell:
+                    del self._anchored[cell_x, cell_y]
+
+    def move_anchored(self, sprite) -> None:
+        """Updates where an anchored sprite is in the grid. Must be called whenever the sprite moves within its room.
+
+        :param sprite: The sprite, which must already be in the group
+        :return: None
+        """
+        span = self._get_span(sprite.rect)
+        old_span = self._anchored_spans.get(sprite)
+        if span == old_span:
+            return
+        if old_span is not None:
+            self._unbucket(sprite, old_span)
+
+        min_x, min_y, max_x, max_y = span
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                self._anchored.setdefault((cell_x, cell_y), set()).add(sprite)
+        self._anchored_spans[sprite] = span
+
+    def get_on_screen(self) -> list:
+        """Returns every sprite whose rect is within the viewport, in the order they are drawn. Only the anchored
+        sprites in the cells of the room the viewport covers are looked at.
+
+        :return: The sprites on the screen
+        """
+        on_screen = self.viewport.colliderect
+        found = [spr for spr in self._loose if on_screen(spr.rect)]
+
+        seen = set()
+        min_x, min_y, max_x, max_y = self._get_span(self.viewport)
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                for spr in self._anchored.get((cell_x, cell_y), ()):
+                    if spr not in seen:
+                        seen.add(spr)
+                        if on_screen(spr.rect):
+                            found.append(spr)
+
+        found.sort(key=self._order.__getitem__)
+        return found
+
+    def invalidate(self) -> None:
+        """Forgets what has been drawn, so that the next dirty-rect draw redraws every sprite.
+
+        :return: None
+        """
+        init_rect = self._init_rect  # noqa
+        for spr in self.spritedict:
+            self.spritedict[spr] = init_rect
+        self.lostsprites = []
+        self._drawn_images.clear()
+        self._drawn_underlays = []
+
+    def draw(self, surface, underlays=()):
+        """Draws every visible sprite that is on the screen, in layer order. Sprites outside the viewport are skipped
+        without being looked at, unless they are loose (see ``get_on_screen``).
+
+        In full-redraw mode, every sprite is drawn and an empty list is returned. In dirty-rect mode, the surface is
+        expected to still hold the last frame, and only the parts of it that changed are redrawn: where sprites
+        appeared, moved, changed images, or disappeared. Sprites can also ask to be redrawn by setting ``dirty`` (1 to
+        be redrawn once, 2 to be redrawn every frame), like pygame's DirtySprite.
+
+        :param surface: The surface to draw onto
+        :param underlays: Images (with their rects) drawn onto the surface this frame beneath the sprites, such as text.
+                          In dirty-rect mode they are redrawn beneath the sprites wherever the surface is redrawn.
+        :return: The rects of the surface that changed (empty in full-redraw mode)
         """
-        spritedict = self.spritedict
         surface_blit = surface.blit
+        if self.full_redraw:
+            for spr in self.get_on_screen():
+                if spr.in_gamestate and spr.visible:
+                    surface_blit(spr.image, spr.rect)
+            return []
+
+        dirty = self._get_changes(list(underlays))
+        if len(dirty) > self.MAX_DIRTY_RECTS:
+            dirty = [dirty[0].unionall(dirty[1:])]
+
+        # Redrawing the background, underlays, and sprites within each changed rect
+        spritedict = self.spritedict
+        init_rect = self._init_rect  # noqa
+        for rect in dirty:
+            surface.set_clip(rect)
+            surface.fill(self.background)
+            for image, image_rect in self._drawn_underlays:
+                if image_rect.colliderect(rect):
+                    surface_blit(image, image_rect)
+            for spr in self._spritelist:  # noqa
+                drawn_rect = spritedict[spr]
+                if drawn_rect is not init_rect and drawn_rect.colliderect(rect):
+                    surface_blit(spr.image, drawn_rect)
+        surface.set_clip(None)
+        return dirty
+
+    def _get_changes(self, underlays: list) -> list:
+        """Finds the rects of the viewport that have changed since the last dirty-rect draw, and records what will be
+        drawn in this one.
+
+        :param underlays: The images (with their rects) drawn beneath the sprites this frame
+        :return: The changed rects, clipped to the viewport
+        """
+        spritedict = self.spritedict
+        drawn_images = self._drawn_images
+        init_rect = self._init_rect  # noqa
+        on_screen = self.viewport.colliderect
+
         dirty = self.lostsprites
         self.lostsprites = []
-        dirty_append = dirty.append
-        init_rect = self._init_rect  # noqa
-        for spr in [s for s in self.sprites() if s.in_gamestate]:
+        for spr in self._spritelist:  # noqa
             rec = spritedict[spr]
-            newrect = surface_blit(spr.image, spr.rect)
-            if rec is init_rect:
-                dirty_append(newrect)
-            else:
-                if newrect.colliderect(rec):
-                    dirty_append(newrect.union(rec))
-                else:
-                    dirty_append(newrect)
-                    dirty_append(rec)
-            spritedict[spr] = newrect
-        return dirty
+            if spr.in_gamestate and spr.visible and on_screen(spr.rect):
+                redraw = getattr(spr, 'dirty', 0)
+                if rec is init_rect or rec != spr.rect or drawn_images.get(spr) is not spr.image or redraw:
+                    if rec is not init_rect:
+                        dirty.append(rec)
+                    spritedict[spr] = spr.rect.copy()
+                    drawn_images[spr] = spr.image
+                    dirty.append(spritedict[spr])
+                    if redraw == 1:
+                        spr.dirty = 0
+            elif rec is not init_rect:
+                # The sprite isn't drawn anymore, so wherever it was last drawn has to be cleared
+                dirty.append(rec)
+                spritedict[spr] = init_rect
+                drawn_images.pop(spr, None)
+
+        # Underlays only need redrawing where they appeared, moved, changed, or went away
+        last_underlays = {(image, tuple(rect)) for image, rect in self._drawn_underlays}
+        new_underlays = {(image, tuple(rect)) for image, rect in underlays}
+        dirty.extend(pygame.Rect(rect) for _, rect in last_underlays ^ new_underlays)
+        self._drawn_underlays = underlays
+
+        return [rect.clip(self.viewport) for rect in dirty if on_screen(rect)]
 
 
 class GameState:
@@ -70,12 +273,19 @@ s_confirm_quit = GameState('confirm_quit', 4, timer.g_timer.update_elapsed_time)
 s_server_settings = GameState('server_settings', 2, timer.g_timer.update_elapsed_time)
 s_game_win = GameState("game_win", 2, timer.g_timer.update_elapsed_time)
 
+# These menus hardly change, so they only redraw and present the parts of the screen that do
+s_pause.all_sprites.full_redraw = False
+s_inventory.all_sprites.full_redraw = False
+s_startup.all_sprites.full_redraw = False
+s_server_settings.all_sprites.full_redraw = False
+
 
 class GameStack:
     def __init__(self):
         self.stack = [
             s_action, s_startup
         ]
+        self._last_top = None  # The game state drawn last frame
 
     def push(self, gamestate: GameState) -> None:
         """Push a new gamestate to the top of the gamestack
@@ -109,16 +319,34 @@ class GameStack:
         self.stack.insert(old_index, new_gamestate)
         self.stack.remove(old_gamestate)
 
-    def update(self):
-        self.stack[-1].all_sprites.update()
-        self.stack[-1].all_sprites.draw(screen.buffer_screen)
+    def update(self) -> list | None:
+        """Updates and draws the game state at the top of the stack onto ``screen.buffer_screen``.
+
+        :return: The rects of the buffer that changed, or None if all of it should be shown
+        """
+        top = self.stack[-1]
+        is_new_top = top is not self._last_top
+        if is_new_top:
+            # Nothing drawn for the last game state can be kept
+            screen.buffer_screen.fill(top.all_sprites.background)
+            for image, rect in screen.drawn_text:
+                screen.buffer_screen.blit(image, rect)
+            top.all_sprites.invalidate()
+            self._last_top = top
 
-        for group in self.stack[-1].groups:
+        top.all_sprites.update()
+        dirty = top.all_sprites.draw(screen.buffer_screen, screen.drawn_text)
+
+        for group in top.groups:
             group.update()
 
         # Calling function passed into game state at declaration
-        if self.stack[-1].update_call is not None:
-            self.stack[-1].update_call(*self.stack[-1].call_args, **self.stack[-1].call_kwargs)
+        if top.update_call is not None:
+            top.update_call(*top.call_args, **top.call_kwargs)
+
+        if is_new_top or top.all_sprites.full_redraw:
+            return None
+        return dirty
 
     def __repr__(self):
         return f'GameStack({self.stack})'
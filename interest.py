@@ -0,0 +1,117 @@
+"""
+Contains the area-of-interest filtering the server uses to only send each client the entities it can see.
+
+The center of every client's viewport is rounded to a cell of a coarse grid, and the client is sent the bullets and
+portals within a viewport's reach of anywhere in that cell, plus a margin. Since the area only depends on the cell,
+clients in the same cell see exactly the same entities and can be sent the same bytes, and the area doesn't shift
+with every small movement of the player. A client only leaves its cell once its viewport's center is well past the
+cell's edge, so a player moving back and forth across the edge doesn't switch areas every snapshot.
+"""
+import numpy as np
+
+import constants as cst
+from bullettable import BulletTable, BulletColumns
+
+AOI_CELL_SIZE = 256  # The width and height of each cell viewports are rounded to (in pixels)
+AOI_MARGIN = 128  # How far past the edge of any viewport in a cell entities are still sent (in pixels)
+AOI_EXIT_MARGIN = 128  # How far past the edge of its cell a viewport's center can go before it changes cells (in pixels)
+
+FILTERED_KINDS = ("bullets", "portals")
+
+
+def get_view_center(x: float, y: float, room_bounds: tuple) -> tuple[float, float]:
+    """Returns the center of a client's viewport. The camera stops scrolling at the edges of the room, so the viewport
+    isn't always centered on the player.
+
+    :param x: The x-position of the player
+    :param y: The y-position of the player
+    :param room_bounds: The left, top, right, and bottom edges of the room
+    :return: The center of the viewport
+    """
+    left, top, right, bottom = room_bounds
+    half_w = cst.WINWIDTH / 2
+    half_h = cst.WINHEIGHT / 2
+    return min(max(x, left + half_w), right - half_w), min(max(y, top + half_h), bottom - half_h)
+
+
+def get_view_cell(center: tuple[float, float], previous: tuple[int, int] | None = None) -> tuple[int, int]:
+    """Returns the cell a viewport is centered in. The viewport stays in its previous cell until its center is more
+    than ``AOI_EXIT_MARGIN`` past that cell's edge.
+
+    :param center: The center of the viewport
+    :param previous: The cell the viewport was in last time, if any
+    :return: The x and y indices of the cell
+    """
+    if previous is not None:
+        left = previous[0] * AOI_CELL_SIZE - AOI_EXIT_MARGIN
+        top = previous[1] * AOI_CELL_SIZE - AOI_EXIT_MARGIN
+        reach = AOI_CELL_SIZE + 2 * AOI_EXIT_MARGIN
+        if left <= center[0] < left + reach and top <= center[1] < top + reach:
+            return previous
+    return int(center[0] // AOI_CELL_SIZE), int(center[1] // AOI_CELL_SIZE)
+
+
+def get_cell_area(cell: tuple[int, int]) -> tuple[float, float, float, float]:
+    """Returns the area every client whose viewport is in a cell is sent the entities of. It covers viewports centered
+    up to ``AOI_EXIT_MARGIN`` outside the cell, since clients stay in their cell until they go further.
+
+    :param cell: The cell
+    :return: The left, top, right, and bottom edges of the area
+    """
+    reach_x = cst.WINWIDTH / 2 + AOI_EXIT_MARGIN + AOI_MARGIN
+    reach_y = cst.WINHEIGHT / 2 + AOI_EXIT_MARGIN + AOI_MARGIN
+    left = cell[0] * AOI_CELL_SIZE
+    top = cell[1] * AOI_CELL_SIZE
+    return left - reach_x, top - reach_y, left + AOI_CELL_SIZE + reach_x, top + AOI_CELL_SIZE + reach_y
+
+
+def get_visible_bullets(bullets: BulletTable, cell: tuple[int, int]) -> np.ndarray:
+    """Returns the IDs of the bullets the clients in a cell should be sent.
+
+    :param bullets: The bullet table
+    :param cell: The cell the clients' viewports are centered in
+    :return: The IDs of the visible bullets in ascending order
+    """
+    left, top, right, bottom = get_cell_area(cell)
+    visible = (bullets.x >= left) & (bullets.x <= right) & (bullets.y >= top) & (bullets.y <= bottom)
+    return np.flatnonzero(visible & bullets.alive)
+
+
+def get_visible_portals(portals: dict, cell: tuple[int, int]) -> frozenset:
+    """Returns the IDs of the portals the clients in a cell should be sent. The portal linked to a visible portal is
+    always sent too, since entering one portal puts the player at the other.
+
+    :param portals: The portals, keyed by ID
+    :param cell: The cell the clients' viewports are centered in
+    :return: The IDs of the visible portals
+    """
+    left, top, right, bottom = get_cell_area(cell)
+
+    visible = set()
+    for portal_id, portal in portals.items():
+        if left <= portal["x"] <= right and top <= portal["y"] <= bottom:
+            visible.add(portal_id)
+            if portal["linked_to"] is not None:
+                visible.add(portal["linked_to"])
+    return frozenset(visible)
+
+
+def filter_snapshot(snapshot: dict | None, view: dict | None) -> dict | None:
+    """Returns the part of a snapshot a client can see.
+
+    :param snapshot: The full snapshot of the world
+    :param view: The IDs of every filtered kind of entity the client can see, keyed by kind. Bullet IDs are an array
+        in ascending order.
+    :return: A snapshot with only the visible entities of each filtered kind
+    """
+    if snapshot is None or view is None:
+        return None
+
+    filtered = dict(snapshot)
+    for kind in FILTERED_KINDS:
+        entities = snapshot[kind]
+        if isinstance(entities, BulletColumns):
+            filtered[kind] = entities.select(view[kind])
+        else:
+            filtered[kind] = {entity_id: entities[entity_id] for entity_id in view[kind] if entity_id in entities}
+    return filtered
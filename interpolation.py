@@ -0,0 +1,140 @@
+"""
+Contains the buffer the client uses to smoothly interpolate between the snapshots it receives from the server.
+
+Snapshots are stamped with the server's simulation time. The client renders the world slightly in the past (by the
+interpolation delay), which almost always leaves it with a snapshot on either side of the moment it is drawing, so
+remote players and bullets move smoothly no matter how unevenly packets arrive or how fast the client draws.
+"""
+from collections import deque
+
+INTERP_DELAY = 0.1  # How far behind the server the client renders (in seconds)
+INTERP_BUFFER_SIZE = 32  # The number of snapshots kept for interpolation
+SNAP_DISTANCE = 256  # Movements longer than this between two snapshots (teleports, reused IDs) are not interpolated
+CLOCK_SMOOTHING = 0.05  # How quickly the clock offset follows packets that arrive later than expected
+CLOCK_SLEW = 0.05  # The most the render clock can speed up or slow down to catch up with the clock offset (5%)
+CLOCK_RESYNC = 0.5  # Clock offset changes bigger than this (in seconds) are jumped to instead of slewed
+
+INTERPOLATED_KINDS = ("players", "bullets")
+
+
+def lerp_angle(a: float, b: float, weight: float) -> float:
+    """Linearly interpolates between two angles along the shortest arc.
+
+    :param a: The starting angle (in degrees)
+    :param b: The ending angle (in degrees)
+    :param weight: How far between the angles to go (0 to 1)
+    :return: The interpolated angle (in degrees)
+    """
+    diff = (b - a + 180) % 360 - 180
+    return a + diff * weight
+
+
+def _lerp_state(a: dict, b: dict, weight: float) -> dict:
+    """Returns the state of an entity partway between two snapshots. Fields other than position and angle are taken
+    from whichever snapshot is closer.
+    """
+    dx = b["x"] - a["x"]
+    dy = b["y"] - a["y"]
+    if dx * dx + dy * dy > SNAP_DISTANCE * SNAP_DISTANCE:
+        return a if weight < 0.5 else b
+
+    state = dict(a if weight < 0.5 else b)
+    state["x"] = a["x"] + dx * weight
+    state["y"] = a["y"] + dy * weight
+    if "angle" in a:
+        state["angle"] = lerp_angle(a["angle"], b["angle"], weight)
+    return state
+
+
+class InterpolationBuffer:
+    """A ring buffer of timestamped snapshots that can be sampled at any point in time."""
+    def __init__(self, delay: float = INTERP_DELAY, size: int = INTERP_BUFFER_SIZE):
+        """A ring buffer of timestamped snapshots that can be sampled at any point in time.
+
+        :param delay: How far behind the server to render (in seconds)
+        :param size: The number of snapshots to keep
+        """
+        self.delay = delay
+        self.snapshots = deque(maxlen=size)  # [(server_time, snapshot), ...] in order of server time
+        self.clock_offset = None  # Estimated local time minus server time
+        self._render_offset = None  # The offset actually rendered with, which eases toward clock_offset
+        self._last_sample_time = None
+
+    def clear(self) -> None:
+        self.snapshots.clear()
+        self.clock_offset = None
+        self._render_offset = None
+        self._last_sample_time = None
+
+    def _update_render_offset(self, local_time: float) -> None:
+        """Eases the offset used for rendering toward the estimated clock offset. Jumping straight to a new estimate
+        would make everything on screen skip forward or backward.
+        """
+        if self._render_offset is None or abs(self.clock_offset - self._render_offset) > CLOCK_RESYNC:
+            self._render_offset = self.clock_offset
+        else:
+            diff = self.clock_offset - self._render_offset
+            max_change = (local_time - self._last_sample_time) * CLOCK_SLEW
+            self._render_offset += max(-max_change, min(max_change, diff))
+        self._last_sample_time = local_time
+
+    def push(self, server_time: float, snapshot: dict, local_time: float) -> None:
+        """Adds a snapshot to the buffer. Snapshots older than the newest one already stored are ignored.
+
+        :param server_time: The server's simulation time when the snapshot was taken
+        :param snapshot: The snapshot
+        :param local_time: The client's time when the snapshot arrived
+        :return: None
+        """
+        if self.snapshots and server_time <= self.snapshots[-1][0]:
+            return
+        self.snapshots.append((server_time, snapshot))
+
+        # Packets that arrive early reveal the real offset right away, while late ones are only followed slowly so
+        # that a single delayed packet doesn't make everything jump
+        offset = local_time - server_time
+        if self.clock_offset is None or offset < self.clock_offset:
+            self.clock_offset = offset
+        else:
+            self.clock_offset += (offset - self.clock_offset) * CLOCK_SMOOTHING
+
+    def sample(self, local_time: float) -> dict | None:
+        """Returns the state of the interpolated kinds of entities at the current render time.
+
+        :param local_time: The client's current time
+        :return: A dict of ``{kind: {entity_id: state}}``, or None if the buffer is empty
+        """
+        if not self.snapshots:
+            return None
+
+        self._update_render_offset(local_time)
+        render_time = local_time - self._render_offset - self.delay
+        snapshots = self.snapshots
+
+        # Outside the buffered range, hold the nearest snapshot instead of guessing
+        if render_time <= snapshots[0][0]:
+            return {kind: snapshots[0][1][kind] for kind in INTERPOLATED_KINDS}
+        if render_time >= snapshots[-1][0]:
+            return {kind: snapshots[-1][1][kind] for kind in INTERPOLATED_KINDS}
+
+        # Searching from the newest end, since the render time is usually only a few snapshots behind it
+        index = len(snapshots) - 1
+        while snapshots[index - 1][0] > render_time:
+            index -= 1
+        time_a, snapshot_a = snapshots[index - 1]
+        time_b, snapshot_b = snapshots[index]
+        weight = (render_time - time_a) / (time_b - time_a)
+
+        output = {}
+        for kind in INTERPOLATED_KINDS:
+            entities_a = snapshot_a[kind]
+            entities_b = snapshot_b[kind]
+            # Entities only appear once they exist in the older snapshot, and stay until they're gone from it
+            output[kind] = {
+                entity_id: _lerp_state(state, entities_b[entity_id], weight) if entity_id in entities_b else state
+                for entity_id, state in entities_a.items()
+            }
+        return output
+
+    def __repr__(self):
+        return f'InterpolationBuffer({len(self.snapshots)} snapshots, {self.delay * 1000:.0f}ms delay)'
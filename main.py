@@ -32,16 +32,26 @@ screen.viewport = pygame.display.set_mode((cst.WINWIDTH, cst.WINHEIGHT),
 
 
 def redraw_game_window() -> None:
-    """Draws all sprites onto the screen
+    """Draws all sprites onto the screen. Game states in dirty-rect mode only present the parts of the screen that
+    changed, and keep the buffer between frames.
 
     Returns:
         None
     """
-    gs.gamestack.update()
-    screen.viewport.blit(screen.buffer_screen, visuals.screen_shake_queue.run())
-    pygame.display.flip()
-
-    screen.buffer_screen.fill((0, 255, 255))
+    gamestate = gs.gamestack.stack[-1]
+    dirty = gs.gamestack.update()
+    shake = visuals.screen_shake_queue.run()
+    if dirty is None:
+        screen.viewport.blit(screen.buffer_screen, shake)
+        pygame.display.flip()
+    elif dirty:
+        for rect in dirty:
+            screen.viewport.blit(screen.buffer_screen, rect, rect)
+        pygame.display.update(dirty)
+
+    if gamestate.all_sprites.full_redraw:
+        screen.buffer_screen.fill(gamestate.all_sprites.background)
+    screen.drawn_text.clear()
 
 
 main_room = rooms.Room(0, 0)
@@ -287,7 +297,8 @@ async def main(max_frame_rate) -> None:
 
         events_to_handle = list(pygame.event.get())
         events_handled = loop.create_task(handle_events(events_to_handle))
-        await loop.run_in_executor(None, pygame.display.flip)  # noqa
+        if gs.gamestack.stack[-1].all_sprites.full_redraw:
+            await loop.run_in_executor(None, pygame.display.flip)  # noqa
         await events_handled
 
 
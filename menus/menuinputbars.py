@@ -46,6 +46,7 @@ class InputBox(cb.ActorBase):
         # start with a white box
         self.image = pygame.Surface((width, height))
         self.image.fill((255, 255, 255))
+        self._drawn_state = None  # The text and border color the box was last drawn with
 
         self.name = name
         arr.append(self)
@@ -95,6 +96,13 @@ class InputBox(cb.ActorBase):
 
         if self.character_limit_flag:
             self.draw_warning()
+
+        # Only redrawing the box when what it shows has changed
+        if (self.text, self.border_color) == self._drawn_state:
+            return
+        self._drawn_state = (self.text, self.border_color)
+        self.dirty = 1
+
         # draw box
         self.image.fill((255, 255, 255))
         pygame.draw.rect(self.image, self.border_color, self.image.get_rect(), 2)
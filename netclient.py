@@ -1,13 +1,18 @@
 from PodSixNet.Connection import connection, ConnectionListener
+from collections import deque
+import itertools
 import constants as cst
-import pickle
+import netcodec
 import socket
 import time
 import ipaddress
 
 from pygame.math import Vector2 as vec
 
+from interpolation import InterpolationBuffer
 from menus.menuinputbars import arr
+from snapshots import SnapshotReceiver
+import simulation
 
 import gamestack as gs
 from servermanager import servermanager
@@ -18,6 +23,11 @@ from menus.StartUpmenu import Header
 
 PING_INTERVAL = 2
 PING_TIMEOUT = 6
+RECONCILE_TOLERANCE = 4  # How far the predicted position can drift from the server's before it is corrected
+
+MOVE_SEND_RATE = 60  # The most movement inputs sent per second (lowered to the server's tick rate if that's lower)
+MOVE_DEAD_BAND = 0.5  # Movements shorter than this (in pixels) are held back until they add up
+ANGLE_DEAD_BAND = 1.0  # Turns smaller than this (in degrees) are held back until they add up
 
 
 class NetClient(ConnectionListener):
@@ -33,6 +43,21 @@ class NetClient(ConnectionListener):
         self.bullets = {}
         self.portals = {}
         self.walls = {}
+        self.snapshots = SnapshotReceiver()
+        self.interpolation = InterpolationBuffer()
+        self.move_seq = 0
+        self.pending_inputs = deque()  # [(seq, dx, dy), ...] sent, but not yet applied by the server
+        self.last_sent_pos = None  # Where the server will put the player once it applies every pending input
+        self.last_sent_angle = 0.0
+        self.last_move_time = 0.0
+        self.move_send_interval = 1 / MOVE_SEND_RATE
+        self.suppressed_moves = 0  # Calls to send_move that didn't send anything
+
+        # Players and bullets as they should be drawn this frame, interpolated between snapshots
+        self.render_players = {}
+        self.render_bullets = {}
+
+        self.redirect_port = None  # The port a server pool's supervisor told the client to connect to instead
 
         self.last_ping = 0
         self.last_pong = None
@@ -60,6 +85,10 @@ class NetClient(ConnectionListener):
         self.client_player.health_bar.add_to_gamestate()
         self.client_player.gun_heat = 0
         self.client_player.realizer.clear()
+        self.snapshots.clear()
+        self.interpolation.clear()
+        self.render_players = {}
+        self.render_bullets = {}
 
         room_pos = self.client_player.room.pos
         self.client_player.pos.x = room_pos.x + 640
@@ -67,12 +96,12 @@ class NetClient(ConnectionListener):
 
         self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.udp_socket.setblocking(False)
-        server_req = {
-            "action": "udp_request"
-        }
-        server_req_bin = pickle.dumps(server_req)
+        self.move_seq = 0
+        self.pending_inputs.clear()
+        self.last_sent_pos = None
+        self.last_move_time = 0.0
         try:
-            self.udp_socket.sendto(server_req_bin, self.server_address)
+            self.udp_socket.sendto(netcodec.encode_udp_request(), self.server_address)
         except Exception as e:
             print(e)
             return
@@ -130,28 +159,75 @@ class NetClient(ConnectionListener):
             self.client_player.pos.x = room_pos.x + old_rel_x
         if old_rel_y is not None:
             self.client_player.pos.y = room_pos.y + old_rel_y
+        self.last_sent_pos = self.client_player.pos - room_pos
+
+        # Never sending inputs faster than the server can apply them
+        self.move_send_interval = 1 / min(MOVE_SEND_RATE, data["tick_rate"])
 
         self.connected = True
 
+    def Network_redirect(self, data):
+        # Connected to a server pool, whose supervisor has picked the server to join. Followed after pumping, since
+        # reconnecting from inside a handler would pump the same messages again.
+        self.redirect_port = data["port"]
+
+    def _follow_redirect(self):
+        host = self.server_address[0]
+        port = self.redirect_port
+        self.redirect_port = None
+        print(f"Redirected to port {port}")
+
+        connection.close()
+        self.udp_socket.close()
+        self.server_address = (host, port)
+        self.establish_connection()
+
     def Network_pong(self, data):
         # print("Pong received")
         self.last_pong = time.time()
 
-    def Network_update_players(self, data):
-        if self.my_id is not None:
-            self.players = data["players"]
+    def Network_snapshot(self, data):
+        snapshot = self.snapshots.receive(data)
+        if snapshot is None:  # The baseline this delta was built on is gone, so ask for the whole world
+            connection.Send({"action": "request_full_snapshot"})
+            return
+        connection.Send({"action": "ack_snapshot", "seq": data["seq"]})
+
+        # These dicts are shared with the snapshot history and must be treated as read-only
+        self.players = snapshot["players"]
+        self.bullets = snapshot["bullets"]
+        self.portals = snapshot["portals"]
+        self.walls = snapshot["walls"]
+        self.interpolation.push(data["time_ms"] / 1000, snapshot, time.perf_counter())
+
+        if self.my_id is not None and self.my_id in self.players:
             self.client_player.hp = self.players[self.my_id]["hp"]
+            self._reconcile(self.players[self.my_id])
 
-    def Network_update_bullets(self, data):
-        self.bullets = data["bullets"]
+    def _reconcile(self, server_state: dict) -> None:
+        """Checks the locally predicted position of the player against the server's. The server's position only
+        includes the inputs it has acknowledged, so the inputs still in flight are replayed on top of it. If the
+        result disagrees with where the player is, the player is moved to match.
+
+        :param server_state: The player's state in the latest snapshot
+        :return: None
+        """
+        if self.last_sent_pos is None:
+            return
 
-    def Network_destroy_bullet(self, data):
-        bullet_id = data["id"]
-        if bullet_id in self.bullets:
-            del self.bullets[bullet_id]
+        acked = server_state["last_input"]
+        while self.pending_inputs and self.pending_inputs[0][0] <= acked:
+            self.pending_inputs.popleft()
 
-    def Network_update_portals(self, data):
-        self.portals = data["portals"]
+        predicted = vec(server_state["x"], server_state["y"])
+        for _, dx, dy in self.pending_inputs:
+            predicted.x += dx
+            predicted.y += dy
+
+        correction = predicted - self.last_sent_pos
+        if correction.length() > RECONCILE_TOLERANCE:
+            self.client_player.pos += correction
+            self.last_sent_pos = predicted
 
     def Network_teleport_player(self, data):
         print(f"Teleport player {data['player_id']}")
@@ -165,17 +241,17 @@ class NetClient(ConnectionListener):
 
         self.client_player.room.last_tp_dirs = (dir_in, dir_out)
 
-        width = (self.players[pid]["hit_w"] + portal_out["hit_w"]) // 2 + 4
-        height = (self.players[pid]["hit_h"] + portal_out["hit_h"]) // 2 + 4
-
         print(f"Player vel: {self.client_player.vel.x}, {self.client_player.vel.y}")
         print(f"Room vel: {self.client_player.room.vel.x}, {self.client_player.room.vel.y}")
 
         room_vel_before = vec(self.client_player.room.vel.x / (screen.dt * cst.M_FPS), self.client_player.room.vel.y / (screen.dt * cst.M_FPS))
 
+        # Landing where the server puts the player
+        self.client_player.pos.x, self.client_player.pos.y = simulation.get_player_exit(
+            portal_out, self.players[pid]["hit_w"], self.players[pid]["hit_h"], simulation.PLAYER_EXIT_GAP
+        )
+
         if dir_out == cst.SOUTH:
-            self.client_player.pos.x = portal_out["x"]
-            self.client_player.pos.y = portal_out["y"] + height
             if dir_in == cst.SOUTH:
                 self.client_player.vel.y += abs(room_vel_before.y)
             elif dir_in == cst.EAST:
@@ -186,8 +262,6 @@ class NetClient(ConnectionListener):
                 self.client_player.vel.y += abs(room_vel_before.x)
 
         elif dir_out == cst.EAST:
-            self.client_player.pos.x = portal_out["x"] + width
-            self.client_player.pos.y = portal_out["y"]
             if dir_in == cst.SOUTH:
                 self.client_player.vel.x += abs(room_vel_before.y)
                 self.client_player.vel.y += abs(room_vel_before.x)
@@ -198,8 +272,6 @@ class NetClient(ConnectionListener):
                 self.client_player.vel.y -= abs(room_vel_before.x)
 
         elif dir_out == cst.NORTH:
-            self.client_player.pos.x = portal_out["x"]
-            self.client_player.pos.y = portal_out["y"] - height
             if dir_in == cst.EAST:
                 self.client_player.vel.x += abs(room_vel_before.y)
                 self.client_player.vel.y -= abs(room_vel_before.x)
@@ -210,8 +282,6 @@ class NetClient(ConnectionListener):
                 self.client_player.vel.y -= abs(room_vel_before.x)
 
         elif dir_out == cst.WEST:
-            self.client_player.pos.x = portal_out["x"] - width
-            self.client_player.pos.y = portal_out["y"]
             if dir_in == cst.SOUTH:
                 self.client_player.vel.x -= abs(room_vel_before.y)
                 self.client_player.vel.y += abs(room_vel_before.x)
@@ -222,18 +292,12 @@ class NetClient(ConnectionListener):
                 self.client_player.vel.x -= abs(room_vel_before.x)
 
         self.client_player.pos += self.client_player.room.pos
+        # The server teleports the player too, so the jump must not be sent as movement
+        self.last_sent_pos = self.client_player.pos - self.client_player.room.pos
 
         self.client_player.room.update_binds(dir_in, dir_out)
         self.client_player.room.readjust_binds_after_tp(dir_in, dir_out)
 
-    def Network_destroy_portal(self, data):
-        portal_id = data["id"]
-        if portal_id in self.portals:
-            del self.portals[portal_id]
-
-    def Network_update_walls(self, data):
-        self.walls = data["walls"]
-
     def Network_game_end(self, data):
         self.handle_timeout()
         header = Header(f"{data['winner']} won!", pos=(cst.WINWIDTH // 2 - 260, 180), color=(0, 130, 0))
@@ -249,20 +313,20 @@ class NetClient(ConnectionListener):
             #print("Pre pump error! error msg: " + str(e))
             pass
 
+        if self.redirect_port is not None:
+            self._follow_redirect()
+
     def Loop(self):
         if not self.connected:
             return
 
         # UDP Send/Receive
         try:
-            data, _ = self.udp_socket.recvfrom(1024)
-            data_dec = pickle.loads(data)
-
-            if data_dec["action"] == "udp_request":
-                msg = {
-                    "action": "udp_request"
-                }
-                self.udp_socket.sendto(pickle.dumps(msg), self.server_address)
+            data, _ = self.udp_socket.recvfrom(netcodec.MAX_DATAGRAM_SIZE)
+            data_dec = netcodec.decode(data)
+
+            if data_dec is not None and data_dec["action"] == "udp_request":
+                self.udp_socket.sendto(netcodec.encode_udp_request(self.my_id), self.server_address)
         except BlockingIOError:
             pass
         except ConnectionResetError:
@@ -273,8 +337,14 @@ class NetClient(ConnectionListener):
         connection.Pump()
         self.Pump()
 
+        render_state = self.interpolation.sample(time.perf_counter())
+        if render_state is not None:
+            self.render_players = render_state["players"]
+            self.render_bullets = render_state["bullets"]
+
         if (time.time() - self.last_pong) > PING_INTERVAL:
             connection.Send({"action": "ping"})
+            self.udp_socket.sendto(netcodec.encode_ping(self.my_id), self.server_address)
 
         if (time.time() - self.last_pong) > PING_TIMEOUT:
             print("Ping timeout")
@@ -296,31 +366,40 @@ class NetClient(ConnectionListener):
         connection.Close()
 
     def send_move(self, x, y, angle):
-        if not self.connected:
+        if not self.connected or self.last_sent_pos is None:
             return
 
-        connection.Send({
-            "action": "move",
-            "x": x,
-            "y": y,
-            "angle": angle
-        })
+        now = time.perf_counter()
+        if now - self.last_move_time < self.move_send_interval:
+            self.suppressed_moves += 1
+            return
+
+        # Sending how far the player moved instead of where it is, so that the server decides where it ends up
+        dx = x - self.last_sent_pos.x
+        dy = y - self.last_sent_pos.y
+        turn = abs((angle - self.last_sent_angle + 180) % 360 - 180)
+        if dx * dx + dy * dy < MOVE_DEAD_BAND * MOVE_DEAD_BAND and turn < ANGLE_DEAD_BAND:
+            self.suppressed_moves += 1
+            return
+
+        self.last_sent_pos = vec(x, y)
+        self.last_sent_angle = angle
+        self.last_move_time = now
+
+        self.move_seq += 1
+        self.pending_inputs.append((self.move_seq, dx, dy))
+
+        # Every input the server hasn't applied yet is sent again, so one lost datagram doesn't lose any movement
+        unacked = itertools.islice(self.pending_inputs, max(0, len(self.pending_inputs) - netcodec.MAX_MOVES), None)
+        moves = [(move_dx, move_dy) for _, move_dx, move_dy in unacked]
+        self.udp_socket.sendto(netcodec.encode_move(self.my_id, self.move_seq, moves, angle), self.server_address)
 
     def send_fire(self, bullet_type: str, x, y, vel_x, vel_y, hit_w: int, hit_h: int):
         if not self.connected:
             return
 
-        fire = {
-            "action": "fire",
-            "bullet_type": bullet_type,
-            "x": x,
-            "y": y,
-            "vel_x": vel_x,
-            "vel_y": vel_y,
-            "hit_w": hit_w,
-            "hit_h": hit_h
-        }
-        self.udp_socket.sendto(pickle.dumps(fire), self.server_address)
+        fire = netcodec.encode_fire(self.my_id, bullet_type, x, y, vel_x, vel_y, hit_w, hit_h)
+        self.udp_socket.sendto(fire, self.server_address)
 
     def cleanup(self):
         try:
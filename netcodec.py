@@ -0,0 +1,161 @@
+"""
+Contains the binary format of the datagrams sent between clients and the server over UDP.
+
+Every datagram starts with the same header: the protocol version, the message type, and the ID of the sending player
+(-1 if the player doesn't have an ID yet). The rest of the datagram is a fixed-size body that depends on the message
+type. Move datagrams are followed by a short list of movements, so that every datagram also repeats the inputs that
+were sent before it and a lost datagram doesn't lose any movement. Datagrams that are malformed or use a different
+protocol version are rejected instead of being trusted.
+"""
+import math
+import struct
+
+from bullettable import BULLET_TYPES, BULLET_TYPE_CODES
+
+PROTOCOL_VERSION = 3
+MAX_DATAGRAM_SIZE = 512  # Bigger than any valid datagram, so oversized ones are truncated and then rejected
+MAX_MOVES = 8  # The most movement inputs a single move datagram can carry
+
+MSG_UDP_REQUEST = 0
+MSG_PING = 1
+MSG_MOVE = 2
+MSG_FIRE = 3
+
+NO_PLAYER_ID = -1
+
+HEADER = struct.Struct("!BBi")  # version, message type, player ID
+BODIES = {
+    MSG_UDP_REQUEST: struct.Struct("!"),
+    MSG_PING: struct.Struct("!"),
+    MSG_MOVE: struct.Struct("!IfB"),  # seq of the newest movement, angle, number of movements
+    MSG_FIRE: struct.Struct("!Bffffhh"),  # bullet type, x, y, vel_x, vel_y, hit_w, hit_h
+}
+MOVEMENT = struct.Struct("!ff")  # dx, dy of each movement in a move datagram, oldest first
+ACTIONS = {
+    MSG_UDP_REQUEST: "udp_request",
+    MSG_PING: "ping",
+    MSG_MOVE: "move",
+    MSG_FIRE: "fire",
+}
+
+
+def _pack(msg_type: int, player_id: int | None, *fields) -> bytes:
+    if player_id is None:
+        player_id = NO_PLAYER_ID
+    return HEADER.pack(PROTOCOL_VERSION, msg_type, player_id) + BODIES[msg_type].pack(*fields)
+
+
+# ------------------------------- Encoding ------------------------------- #
+def encode_udp_request(player_id: int | None = None) -> bytes:
+    """Encodes the datagram that opens the UDP path between a client and the server.
+
+    :param player_id: The ID of the sending player, if it has one
+    :return: The encoded datagram
+    """
+    return _pack(MSG_UDP_REQUEST, player_id)
+
+
+def encode_ping(player_id: int | None) -> bytes:
+    """Encodes a keepalive datagram.
+
+    :param player_id: The ID of the sending player
+    :return: The encoded datagram
+    """
+    return _pack(MSG_PING, player_id)
+
+
+def encode_move(player_id: int | None, seq: int, moves: list[tuple[float, float]], angle: float) -> bytes:
+    """Encodes the latest movement inputs from a player. The inputs have consecutive sequence numbers, ending at seq.
+
+    :param player_id: The ID of the moving player
+    :param seq: The sequence number of the newest input. Inputs the server has already applied are skipped.
+    :param moves: How far the player moved along the x and y axes in each input, oldest first. Only the newest
+        MAX_MOVES are sent.
+    :param angle: The angle the player is facing
+    :return: The encoded datagram
+    """
+    moves = moves[-MAX_MOVES:]
+    return (_pack(MSG_MOVE, player_id, seq & 0xFFFFFFFF, angle, len(moves))
+            + b"".join(MOVEMENT.pack(dx, dy) for dx, dy in moves))
+
+
+def encode_fire(player_id: int | None, bullet_type: str, x: float, y: float, vel_x: float, vel_y: float,
+                hit_w: int, hit_h: int) -> bytes:
+    """Encodes a bullet fired by a player.
+
+    :param player_id: The ID of the player that fired the bullet
+    :param bullet_type: The name of the bullet's type. Must be in BULLET_TYPES.
+    :param x: The x-position of the bullet's center
+    :param y: The y-position of the bullet's center
+    :param vel_x: The x-axis component of the bullet's velocity
+    :param vel_y: The y-axis component of the bullet's velocity
+    :param hit_w: The width of the bullet's hitbox
+    :param hit_h: The height of the bullet's hitbox
+    :return: The encoded datagram
+    """
+    return _pack(MSG_FIRE, player_id, BULLET_TYPE_CODES[bullet_type], x, y, vel_x, vel_y, hit_w, hit_h)
+
+
+# ------------------------------- Decoding ------------------------------- #
+def decode(datagram: bytes) -> dict | None:
+    """Decodes a datagram into a message dict in the same shape as the TCP messages (an "action" key plus fields).
+
+    :param datagram: The raw bytes received
+    :return: The decoded message (with the sender's ID under "id"), or None if the datagram is invalid
+    """
+    if len(datagram) < HEADER.size:
+        return None
+
+    version, msg_type, player_id = HEADER.unpack_from(datagram)
+    body = BODIES.get(msg_type)
+    if version != PROTOCOL_VERSION or body is None or len(datagram) < HEADER.size + body.size:
+        return None
+
+    extra = 0  # The size of the movements following the body of a move datagram
+    if msg_type == MSG_MOVE:
+        extra = datagram[HEADER.size + body.size - 1] * MOVEMENT.size
+    if len(datagram) != HEADER.size + body.size + extra:
+        return None
+
+    player_id = None if player_id == NO_PLAYER_ID else player_id
+    fields = body.unpack_from(datagram, HEADER.size)
+
+    # Float32 values can't overflow a float64 sum, so the sum is only finite if every value is finite
+    if msg_type == MSG_FIRE:
+        type_code, x, y, vel_x, vel_y, hit_w, hit_h = fields
+        if type_code >= len(BULLET_TYPES) or hit_w <= 0 or hit_h <= 0 or not math.isfinite(x + y + vel_x + vel_y):
+            return None
+        return {
+            "action": "fire",
+            "id": player_id,
+            "bullet_type": BULLET_TYPES[type_code],
+            "x": x,
+            "y": y,
+            "vel_x": vel_x,
+            "vel_y": vel_y,
+            "hit_w": hit_w,
+            "hit_h": hit_h,
+        }
+
+    if msg_type == MSG_MOVE:
+        seq, angle, count = fields
+        moves = [MOVEMENT.unpack_from(datagram, HEADER.size + body.size + i * MOVEMENT.size) for i in range(count)]
+        if not 0 < count <= MAX_MOVES or not math.isfinite(angle + sum(dx + dy for dx, dy in moves)):
+            return None
+        return {"action": "move", "id": player_id, "seq": seq, "moves": moves, "angle": angle}
+
+    return {"action": ACTIONS[msg_type], "id": player_id}
+
+
+if __name__ == '__main__':
+    import pickle
+    import timeit
+
+    fire = encode_fire(3, "standard", 640.5, 360.25, 10.0, -4.5, 6, 6)
+    fire_pickle = pickle.dumps({
+        "action": "fire", "bullet_type": "standard", "x": 640.5, "y": 360.25,
+        "vel_x": 10.0, "vel_y": -4.5, "hit_w": 6, "hit_h": 6
+    })
+    print(f'Fire datagram: {len(fire)} bytes (pickle: {len(fire_pickle)} bytes)')
+    print(timeit.timeit(lambda: decode(fire), number=100000))
+    print(timeit.timeit(lambda: pickle.loads(fire_pickle), number=100000))
@@ -53,6 +53,19 @@ class Portal(cb.ActorBase):
         if self.facing == cst.WEST:
             self.set_rects(self.pos.x, self.pos.y, 64, 64, 20, 54)
 
+    def get_data(self) -> dict:
+        """Returns the portal as the plain data the simulation package works with.
+
+        :return: A dict with the portal's "x", "y", "hit_w", "hit_h", and "facing"
+        """
+        return {
+            "x": self.pos.x,
+            "y": self.pos.y,
+            "hit_w": self.hitbox.width,
+            "hit_h": self.hitbox.height,
+            "facing": self.facing,
+        }
+
     def movement(self):
         # Setting position to offset of where bullet landed
         self.pos = self.landedOn.pos + self.pos_offset
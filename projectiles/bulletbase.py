@@ -1,4 +1,3 @@
-import copy
 import random as rand
 import time
 
@@ -14,6 +13,7 @@ import calc
 import classbases as cb
 import constants as cst
 import groups
+import simulation
 
 
 class BulletBase(cb.ActorBase):
@@ -33,39 +33,34 @@ class BulletBase(cb.ActorBase):
         self.hit = None
         self.side_hit = None
 
+        self.path_start = None  # Where the bullet was before its last move, relative to the room
+
+    def accel_movement(self) -> None:
+        room = cb.get_room()
+        self.path_start = self.pos - room.pos
+        super().accel_movement()
+
     def get_accel(self) -> vec:
         room = cb.get_room()
         final_accel = vec(self.vel_const.x / 15, self.vel_const.y / 15)
         final_accel += room.get_accel()
         return final_accel
 
-    def land(self, target) -> None:
+    def land(self, target, side: str | None = None) -> None:
         """Destroys the bullet and renders an explosion or bounces the bullet
 
         :param target: The sprite the bullet collided with
+        :param side: The side of the target that was hit. If None, it is found from where the bullet is.
         :return: None
         """
         self.hit = target
-        self.side_hit = calc.triangle_collide(self, self.hit)
+        self.side_hit = side if side is not None else calc.triangle_collide(self, self.hit)
         self.ric_count -= 1
-
-        boom_pos_x = 0
-        boom_pos_y = 0
+        hit_box = (self.hit.pos.x, self.hit.pos.y, self.hit.hitbox.width, self.hit.hitbox.height)
 
         # Bullet explodes
         if self.ric_count <= 0 or self.hit in groups.all_enemies:
-            if self.side_hit == cst.SOUTH:
-                boom_pos_x = self.pos.x
-                boom_pos_y = self.hit.pos.y + self.hit.hitbox.height // 2
-            if self.side_hit == cst.EAST:
-                boom_pos_x = self.hit.pos.x + self.hit.hitbox.width // 2
-                boom_pos_y = self.pos.y
-            if self.side_hit == cst.NORTH:
-                boom_pos_x = self.pos.x
-                boom_pos_y = self.hit.pos.y - self.hit.hitbox.height // 2
-            if self.side_hit == cst.WEST:
-                boom_pos_x = self.hit.pos.x - self.hit.hitbox.width // 2
-                boom_pos_y = self.pos.y
+            boom_pos_x, boom_pos_y = simulation.get_contact_point(self.pos.x, self.pos.y, *hit_box, self.side_hit)
 
             self.kill()
             groups.all_explosions.add(explosions.StdBulletExplode(self, boom_pos_x, boom_pos_y))
@@ -75,95 +70,98 @@ class BulletBase(cb.ActorBase):
         else:
             room = cb.get_room()
             room_vel = room.vel
+            margin = abs(room_vel.y) if self.side_hit in (cst.SOUTH, cst.NORTH) else abs(room_vel.x)
 
-            if self.side_hit == cst.SOUTH:
-                self.pos.y = self.hit.pos.y + self.hit.hitbox.height // 2 + self.hitbox.height // 2 + abs(room_vel.y)
-                self.vel_const.y = -self.vel_const.y
-                self.vel.y = -self.vel.y
+            self.pos.x, self.pos.y = simulation.push_out(
+                self.pos.x, self.pos.y, self.hitbox.width, self.hitbox.height, *hit_box, self.side_hit, margin
+            )
+            self.vel_const.x, self.vel_const.y = simulation.reflect(self.vel_const.x, self.vel_const.y, self.side_hit)
+            self.vel.x, self.vel.y = simulation.reflect(self.vel.x, self.vel.y, self.side_hit)
 
-            elif self.side_hit == cst.EAST:
-                self.pos.x = self.hit.pos.x + self.hit.hitbox.width // 2 + self.hitbox.width // 2 + abs(room_vel.x)
-                self.vel_const.x = -self.vel_const.x
-                self.vel.x = -self.vel.x
+            self.rotate_image(calc.get_vec_angle(self.vel.x, self.vel.y))
 
-            elif self.side_hit == cst.NORTH:
-                self.pos.y = self.hit.pos.y - self.hit.hitbox.height // 2 - self.hitbox.height // 2 - abs(room_vel.y)
-                self.vel_const.y = -self.vel_const.y
-                self.vel.y = -self.vel.y
+    def get_first_hit(self, sprite_group) -> tuple[object, str | None] | None:
+        """Finds the first sprite in a group the bullet ran into along the path it moved last frame, and moves the
+        bullet back to where it touched it. Testing the whole path keeps fast bullets from skipping over thin walls.
 
-            elif self.side_hit == cst.WEST:
-                self.pos.x = self.hit.pos.x - self.hit.hitbox.width // 2 - self.hitbox.width // 2 - abs(room_vel.x)
-                self.vel_const.x = -self.vel_const.x
-                self.vel.x = -self.vel.x
+        :param sprite_group: The group to check for a collision with
+        :return: The sprite that was hit and the side of it that was hit, or None if nothing was hit
+        """
+        room = cb.get_room()
+        start = self.path_start + room.pos if self.path_start is not None else vec(self.pos)
+        dx = self.pos.x - start.x
+        dy = self.pos.y - start.y
+        path = self.hitbox.union(self.hitbox.move(-dx, -dy))
+
+        first_hit = None
+        for sprite in sprite_group:
+            if not sprite.in_gamestate or not path.colliderect(sprite.hitbox):
+                continue
 
-            self.rotate_image(calc.get_vec_angle(self.vel.x, self.vel.y))
+            hit = simulation.sweep_box(
+                start.x, start.y, self.hitbox.width, self.hitbox.height, dx, dy,
+                sprite.pos.x, sprite.pos.y, sprite.hitbox.width, sprite.hitbox.height
+            )
+            if hit is not None and (first_hit is None or hit[0] < first_hit[0]):
+                first_hit = (hit[0], sprite, hit[1])
+
+        if first_hit is None:
+            return None
+
+        time_hit, sprite, side = first_hit
+        self.pos.x = start.x + dx * time_hit
+        self.pos.y = start.y + dy * time_hit
+        self.path_start = None  # The rest of the path is decided by whatever happens at the hit
+        self.center_rects()
+        return sprite, side
 
     def proj_collide(self, sprite_group, can_hurt) -> None:
         """Checks for a collision with all sprites within a specific sprite group and allows the bullet to act
-        accordingly.
+        accordingly. Sprites that can't be hurt (walls and portals) are swept against the bullet's whole path.
 
         :param sprite_group: The group to check for a collision with
         :param can_hurt: Can the projectile damage sprites in the group to check for? True if yes, false if no.
         :return: None
         """
-        for colliding_sprite in sprite_group:
-            if not self.hitbox.colliderect(colliding_sprite.hitbox):
-                continue
+        if can_hurt:
+            for colliding_sprite in sprite_group:
+                if not self.hitbox.colliderect(colliding_sprite.hitbox):
+                    continue
 
-            if not colliding_sprite.in_gamestate:
-                continue
+                if not colliding_sprite.in_gamestate:
+                    continue
 
-            if can_hurt:
                 self.inflict_damage(sprite_group, colliding_sprite)
                 if hasattr(colliding_sprite, 'last_hit'):
                     colliding_sprite.last_hit = time.time()
                 self.land(colliding_sprite)
+            return
 
-            elif not can_hurt:
-                if sprite_group == groups.all_portals:
-                    if len(groups.all_portals) == 2:
-                        for portal in groups.all_portals:
-                            if self.hitbox.colliderect(portal.hitbox):
-                                self.teleport(portal)
-                                self.rotate_image(calc.get_vec_angle(self.vel.x, self.vel.y))
-                        return
+        first_hit = self.get_first_hit(sprite_group)
+        if first_hit is None:
+            return
 
-                    elif len(groups.all_portals) < 2:
-                        self.land(self)
-                        return
+        colliding_sprite, side = first_hit
+        if sprite_group == groups.all_portals:
+            if len(groups.all_portals) == 2:
+                self.teleport(colliding_sprite)
+                self.rotate_image(calc.get_vec_angle(self.vel.x, self.vel.y))
+            elif len(groups.all_portals) < 2:
+                self.land(self)
+            return
 
-                else:
-                    self.land(colliding_sprite)
-                    return
+        self.land(colliding_sprite, side)
 
     def teleport(self, portal_in) -> None:
         """Sends the projectile from one portal to the other."""
         portal_out = calc.get_other_portal(portal_in)
-        dir_in = portal_in.facing
-        dir_out = portal_out.facing
-
-        dist_offset = copy.copy(self.pos.x) - copy.copy(portal_in.pos.x)
-        dir_list = {cst.SOUTH: 180, cst.EAST: 90, cst.NORTH: 0, cst.WEST: 270}
-
-        if dir_in == cst.SOUTH:
-            dist_offset = copy.copy(self.pos.x) - copy.copy(portal_in.pos.x)
-
-        elif dir_in == cst.EAST:
-            dir_list.update({cst.EAST: 180, cst.NORTH: 90, cst.WEST: 0, cst.SOUTH: 270})
-            dist_offset = copy.copy(self.pos.y) - copy.copy(portal_in.pos.y)
-
-        elif dir_in == cst.NORTH:
-            dir_list.update({cst.NORTH: 180, cst.WEST: 90, cst.SOUTH: 0, cst.EAST: 270})
-            dist_offset = copy.copy(self.pos.x) - copy.copy(portal_in.pos.x)
-
-        elif dir_in == cst.WEST:
-            dir_list.update({cst.WEST: 180, cst.SOUTH: 90, cst.EAST: 0, cst.NORTH: 270})
-            dist_offset = copy.copy(self.pos.y) - copy.copy(portal_in.pos.y)
+        offset = simulation.get_entry_offset(self.pos.x, self.pos.y, portal_in.get_data())
+        turn = simulation.get_portal_turn(portal_in.facing, portal_out.facing)
 
         room = cb.get_room()
-        self._align_sprite(portal_out, dist_offset, dir_out)
-        self.vel = self.vel.rotate(dir_list[dir_out]) + room.vel
-        self.vel_const = self.vel_const.rotate(dir_list[dir_out])
+        self._align_sprite(portal_out, offset, portal_out.facing)
+        self.vel = self.vel.rotate(turn) + room.vel
+        self.vel_const = self.vel_const.rotate(turn)
 
     def inflict_damage(self, sprite_group, receiver) -> None:
         """Calculates the damage a bullet should inflict on a sprite and subtracts it from that sprite's HP
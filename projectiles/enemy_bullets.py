@@ -38,8 +38,8 @@ class EnemyStdBullet(proj.BulletBase):
     def movement(self):
         if self.in_gamestate:
             self.proj_collide(groups.all_players, True)
-            self.proj_collide(groups.all_walls, False)
             self.proj_collide(groups.all_portals, False)
+            self.proj_collide(groups.all_walls, False)
 
             if calc.get_game_tdiff(self.start_time) <= 5:
                 self.accel = self.get_accel()
@@ -81,8 +81,8 @@ class AmbusherDasher(proj.BulletBase):
     def movement(self):
         if self.in_gamestate:
             self.proj_collide(groups.all_players, True)
-            self.proj_collide(groups.all_walls, False)
             self.proj_collide(groups.all_portals, False)
+            self.proj_collide(groups.all_walls, False)
 
             # TODO: Update movement logic to use accel_movement
             if calc.get_game_tdiff(self.start_time) <= 10:
@@ -46,8 +46,8 @@ class PlayerStdBullet(proj.BulletBase):
         if self.in_gamestate:
             self.proj_collide(groups.all_enemies, True)
             self.proj_collide(groups.all_sentries, True)
-            self.proj_collide(groups.all_walls, False)
             self.proj_collide(groups.all_portals, False)
+            self.proj_collide(groups.all_walls, False)
 
             if calc.get_game_tdiff(self.start_time) <= 5:
                 self.accel = self.get_accel()
@@ -81,8 +81,8 @@ class PlayerLaserBullet(proj.BulletBase):
         if self.in_gamestate:
             self.proj_collide(groups.all_enemies, True)
             self.proj_collide(groups.all_sentries, True)
-            self.proj_collide(groups.all_walls, False)
             self.proj_collide(groups.all_portals, False)
+            self.proj_collide(groups.all_walls, False)
 
             if calc.get_game_tdiff(self.start_time) <= 5:
                 self.accel = self.get_accel()
@@ -128,8 +128,8 @@ class PlayerChakram(proj.BulletBase):
         if self.in_gamestate:
             self.proj_collide(groups.all_enemies, True)
             self.proj_collide(groups.all_sentries, True)
-            self.proj_collide(groups.all_walls, False)
             self.proj_collide(groups.all_portals, False)
+            self.proj_collide(groups.all_walls, False)
 
             if calc.get_game_tdiff(self.start_time) <= 5:
                 self.accel = self.get_accel()
@@ -224,8 +224,8 @@ class PlayerHomingBullet(proj.BulletBase):
         if self.in_gamestate:
             self.proj_collide(groups.all_enemies, True)
             self.proj_collide(groups.all_sentries, True)
-            self.proj_collide(groups.all_walls, False)
             self.proj_collide(groups.all_portals, False)
+            self.proj_collide(groups.all_walls, False)
 
             if calc.get_game_tdiff(self.start_time) <= 5:
                 self.accel = self.get_accel()
@@ -259,39 +259,36 @@ class PortalBullet(proj.BulletBase):
         self.rotate_image(calc.get_vec_angle(self.vel.x, self.vel.y))
 
     def proj_collide(self, sprite_group, can_hurt: bool):
-        for collidingSprite in sprite_group:
-            if not self.hitbox.colliderect(collidingSprite.hitbox):
-                continue
-            
-            if not collidingSprite.in_gamestate:
-                continue
+        if can_hurt:
+            super().proj_collide(sprite_group, can_hurt)
+            return
 
-            if can_hurt:
-                self.inflict_damage(sprite_group, collidingSprite)
-                self.land(collidingSprite)
+        first_hit = self.get_first_hit(sprite_group)
+        if first_hit is None:
+            return
 
-            elif not can_hurt:
-                # If the projectile hits a portal
-                if sprite_group == groups.all_portals:
-                    if len(groups.all_portals) == 2:
-                        for portal in groups.all_portals:
-                            if self.hitbox.colliderect(portal.hitbox):
-                                self.teleport(portal)
+        collidingSprite, side = first_hit
+        # If the projectile hits a portal
+        if sprite_group == groups.all_portals:
+            if len(groups.all_portals) == 2:
+                self.teleport(collidingSprite)
 
-                elif sprite_group == groups.all_walls:
-                    self.land(collidingSprite)
-                    self._spawn_portal(collidingSprite)
-                
-                else:
-                    self.land(collidingSprite)
+        elif sprite_group == groups.all_walls:
+            self.land(collidingSprite, side)
+            self._spawn_portal(collidingSprite, side)
 
-    def _spawn_portal(self, surface) -> None:
+        else:
+            self.land(collidingSprite, side)
+
+    def _spawn_portal(self, surface, side: str | None = None) -> None:
         """Spawns a portal on the surface that the portal bullet hit.
 
         :param surface: The surface the portal bullet landed on.
+        :param side: The side of the surface that was hit. If None, it is found from where the bullet is.
         :return: None
         """
-        side = calc.triangle_collide(self, surface)
+        if side is None:
+            side = calc.triangle_collide(self, surface)
         if side == cst.SOUTH:
             groups.all_portals.add(portals.Portal(self, self.pos.x, surface.pos.y + surface.hitbox.height // 2, side))
             portals.portal_count_check()
@@ -307,9 +304,9 @@ class PortalBullet(proj.BulletBase):
 
     def movement(self):
         if self.in_gamestate:
+            self.proj_collide(groups.all_portals, False)
             self.proj_collide(groups.all_walls, False)
             self.proj_collide(groups.all_portal_blockers, False)
-            self.proj_collide(groups.all_portals, False)
 
             if calc.get_game_tdiff(self.start_time) <= 5:
                 self.accel = self.get_accel()
@@ -8,23 +8,18 @@ import text
 
 from pygame.math import Vector2 as vec
 
-
-class ServerRealizer:
-    def __init__(self, client):
-        self.room = cb.get_room()
-        self.net = client
-
-        self.local_players = {}
-        self.local_bullets = {}
-        self.local_portals = {}
-        self.local_walls = {}
-
-        self.walls = {}
-
-        self.portal_room_offsets = {}
-
-    @staticmethod
-    def _create_vessel(
+# The most idle vessels each pool keeps around for reuse. Vessels released past this are left for garbage collection.
+POOL_SIZES = {
+    "standard": 512,
+    "portal_bullet": 64,
+    "player": 16,
+    "portal": 8,
+}
+
+
+class VesselPool:
+    def __init__(
+            self,
             sprite_path: str,
             sprites_per_row: int,
             num_sprites: int,
@@ -32,43 +27,119 @@ class ServerRealizer:
             rect_width: int,
             rect_height: int,
             hit_width: int,
-            hit_height: int
-    ) -> cb.ActorBase:
+            hit_height: int,
+            max_size: int = 64
+    ):
+        """A pool of identical vessels for displaying server-side objects on client-side. Vessels are handed back to
+        the pool when the object they display disappears, so that the next object of the same kind can reuse them
+        instead of building a new sprite.
+
+        :param sprite_path: The path of the vessels' spritesheet
+        :param sprites_per_row: The number of sprites within each row of the spritesheet
+        :param num_sprites: The number of images in the vessels' animation
+        :param img_offset: The index of the frame to begin the snip from
+        :param rect_width: The width of the vessels' rects
+        :param rect_height: The height of the vessels' rects
+        :param hit_width: The width of the vessels' hitboxes
+        :param hit_height: The height of the vessels' hitboxes
+        :param max_size: The most idle vessels to keep for reuse (the high-water mark)
+        """
+        self.sprite_path = sprite_path
+        self.sprites_per_row = sprites_per_row
+        self.num_sprites = num_sprites
+        self.img_offset = img_offset
+        self.rect_size = (rect_width, rect_height)
+        self.hit_size = (hit_width, hit_height)
+        self.max_size = max_size
+
+        self.free = []
+        self.created = 0
+
+    def _create_vessel(self) -> cb.ActorBase:
         """Creates an empty vessel to display on client-side
 
-        :param sprite_path:
-        :param sprites_per_row:
-        :param num_sprites:
-        :param rect_width:
-        :param rect_height:
-        :param hit_width:
-        :param hit_height:
         :return: The created actor
         """
         vessel = cb.ActorBase()
+        vessel.set_images(os.path.join(os.getcwd(), self.sprite_path), self.rect_size[0], self.rect_size[1],
+                          self.sprites_per_row, self.num_sprites, self.img_offset)
+        vessel.pool = self
+        self.created += 1
+        return vessel
 
-        vessel.add_to_gamestate()
-        vessel.set_images(os.path.join(os.getcwd(), sprite_path), rect_width, rect_height, sprites_per_row, num_sprites, img_offset)
-        vessel.set_rects(0, 0, rect_width, rect_height, hit_width, hit_height)
+    def acquire(self) -> cb.ActorBase:
+        """Returns an idle vessel from the pool, or a new one if the pool is empty. The vessel is added to its game
+        state with its first image and no rotation.
 
+        :return: The vessel
+        """
+        vessel = self.free.pop() if self.free else self._create_vessel()
+        vessel.index = 0
+        vessel.render_images()
+        vessel.set_rects(0, 0, self.rect_size[0], self.rect_size[1], self.hit_size[0], self.hit_size[1])
+        vessel.add_to_gamestate()
         return vessel
 
+    def release(self, vessel: cb.ActorBase) -> None:
+        """Removes a vessel from its game state and keeps it for reuse, unless the pool is already full.
+
+        :param vessel: The vessel to hand back
+        :return: None
+        """
+        vessel.remove_from_gamestate()
+        if len(self.free) < self.max_size:
+            self.free.append(vessel)
+
+    def prefill(self, count: int) -> None:
+        """Builds vessels ahead of time so that the first burst of objects doesn't have to.
+
+        :param count: The number of idle vessels the pool should have, capped at its high-water mark
+        :return: None
+        """
+        while len(self.free) < min(count, self.max_size):
+            self.free.append(self._create_vessel())
+
+    def __len__(self):
+        return len(self.free)
+
+    def __repr__(self):
+        return f'VesselPool({self.sprite_path}, {len(self.free)} free, {self.created} created)'
+
+
+class ServerRealizer:
+    def __init__(self, client, pool_sizes: dict = None):
+        """Displays the players, bullets, portals, and walls the server sends to the client.
+
+        :param client: The network client receiving the server's snapshots
+        :param pool_sizes: Overrides for the high-water marks in POOL_SIZES, by vessel kind
+        """
+        self.room = cb.get_room()
+        self.net = client
+
+        self.local_players = {}
+        self.local_bullets = {}
+        self.local_portals = {}
+        self.local_walls = {}
+
+        self.walls = {}
+
+        self.portal_room_offsets = {}
+
+        sizes = dict(POOL_SIZES, **(pool_sizes or {}))
+        self.pools = {
+            "standard": VesselPool("sprites/bullets/bullets.png", 8, 1, 0, 32, 32, 8, 8, sizes["standard"]),
+            "portal_bullet": VesselPool("sprites/bullets/bullets.png", 8, 5, 8, 32, 32, 8, 8, sizes["portal_bullet"]),
+            "player": VesselPool("sprites/orbeeto/orbeeto.png", 5, 5, 0, 64, 64, 32, 32, sizes["player"]),
+            "portal": VesselPool("sprites/portals/portals.png", 8, 16, 0, 64, 64, 64, 64, sizes["portal"]),
+        }
+
     def realize_players(self):
         # print(self.local_players)
-        for pid, player in self.net.players.items():
+        for pid, player in self.net.render_players.items():
             if pid not in self.local_players:
                 if pid != self.net.my_id:
                     # print("Drawing new player sprite")
-                    self.local_players[pid] = self._create_vessel(
-                        "sprites/orbeeto/orbeeto.png",
-                        5,
-                        5,
-                        0,
-                        64,
-                        64,
-                        32,
-                        32
-                    )
+                    self.local_players[pid] = self.pools["player"].acquire()
                     self.local_players[pid].pos = vec(player["x"] + self.room.pos.x, player["y"] + self.room.pos.y)
             else:
                 self.local_players[pid].pos = vec(player["x"] + self.room.pos.x, player["y"] + self.room.pos.y)
@@ -76,7 +147,7 @@ class ServerRealizer:
                 self.local_players[pid].center_rects()
                 if player["hp"] <= 0:
                     # print(f"Player with ID {pid} has died and will no longer be shown")
-                    self.local_players[pid].remove_from_gamestate()
+                    self.local_players[pid].pool.release(self.local_players[pid])
                     del self.local_players[pid]
 
             # draws a username label over everyone's character
@@ -84,24 +155,21 @@ class ServerRealizer:
                 username = str(player["username"])
                 text.draw_text(f"{username}", player["x"] + self.room.pos.x - (11 * (len(username) / 2)), player["y"] + self.room.pos.y - 60, 18, font_family="Monospace")
 
-        for p_tup in [tup for tup in self.local_players.items() if tup[0] not in self.net.players.keys()]:
-            p_tup[1].remove_from_gamestate()
+        for p_tup in [tup for tup in self.local_players.items() if tup[0] not in self.net.render_players.keys()]:
+            p_tup[1].pool.release(p_tup[1])
             del self.local_players[p_tup[0]]
 
     def realize_bullets(self):
-        for bid, bullet in self.net.bullets.items():
+        for bid, bullet in self.net.render_bullets.items():
+            vessel = self.local_bullets.get(bid)
+            if vessel is not None and vessel.pool is not self.pools[bullet["bullet_type"]]:
+                # The ID now belongs to a bullet of another type, which needs a vessel from another pool
+                vessel.pool.release(vessel)
+                del self.local_bullets[bid]
+
             if bullet["bullet_type"] == "standard":
                 if bid not in self.local_bullets:
-                    self.local_bullets[bid] = self._create_vessel(
-                        "sprites/bullets/bullets.png",
-                        8,
-                        1,
-                        0,
-                        32,
-                        32,
-                        8,
-                        8
-                    )
+                    self.local_bullets[bid] = self.pools["standard"].acquire()
                     self.local_bullets[bid].pos = vec(bullet["x"] + self.room.pos.x, bullet["y"] + self.room.pos.y)
                     self.local_bullets[bid].rotate_image(calc.get_vec_angle(bullet["vel_x"], bullet["vel_y"]))
                 else:
@@ -111,16 +179,7 @@ class ServerRealizer:
 
             elif bullet["bullet_type"] == "portal_bullet":
                 if bid not in self.local_bullets:
-                    self.local_bullets[bid] = self._create_vessel(
-                        'sprites/bullets/bullets.png',
-                        8,
-                        5,
-                        8,
-                        32,
-                        32,
-                        8,
-                        8
-                    )
+                    self.local_bullets[bid] = self.pools["portal_bullet"].acquire()
                     self.local_bullets[bid].pos = vec(bullet["x"] + self.room.pos.x, bullet["y"] + self.room.pos.y)
                     self.local_bullets[bid].rotate_image(calc.get_vec_angle(bullet["vel_x"], bullet["vel_y"]))
                 else:
@@ -129,23 +188,14 @@ class ServerRealizer:
                     self.local_bullets[bid].center_rects()
 
         # Destroy realization when server says bullet is dead
-        for b_tup in [tup for tup in self.local_bullets.items() if tup[0] not in self.net.bullets.keys()]:
-            b_tup[1].remove_from_gamestate()
+        for b_tup in [tup for tup in self.local_bullets.items() if tup[0] not in self.net.render_bullets.keys()]:
+            b_tup[1].pool.release(b_tup[1])
             del self.local_bullets[b_tup[0]]
 
     def realize_portals(self):
         for pid, portal in self.net.portals.items():
             if pid not in self.local_portals:
-                self.local_portals[pid] = self._create_vessel(
-                    "sprites/portals/portals.png",
-                    8,
-                    16,
-                    0,
-                    64,
-                    64,
-                    64,
-                    64,
-                )
+                self.local_portals[pid] = self.pools["portal"].acquire()
 
                 self.local_portals[pid].pos = vec(portal["x"] + self.room.pos.x, portal["y"] + self.room.pos.y)
 
@@ -156,7 +206,8 @@ class ServerRealizer:
                 self.local_portals[pid].center_rects()
 
         for p_tup in [tup for tup in self.local_portals.items() if tup[0] not in self.net.portals.keys()]:
-            p_tup[1].remove_from_gamestate()
+            p_tup[1].pool.release(p_tup[1])
+            del self.local_portals[p_tup[0]]
 
     def realize_walls(self):
         for wall_id, wall in self.net.walls.items():
@@ -168,19 +219,14 @@ class ServerRealizer:
                     wall["hit_h"] // wall["block_height"]
                 )
 
+                # Walls are static, so they follow the room on their own once placed
                 self.local_walls[wall_id].pos = vec(wall["x"] + self.room.pos.x, wall["y"] + self.room.pos.y)
-            else:
-                self.local_walls[wall_id].pos = vec(wall["x"] + self.room.pos.x, wall["y"] + self.room.pos.y)
-                self.local_walls[wall_id].center_rects()
 
     def clear(self):
         """
-        Removes all player instances from the realizer
+        Removes all player, bullet, and portal instances from the realizer, handing their vessels back to their pools
         """
-        player_ids_to_delete = []
-        for player_id, sprite in self.local_players.items():
-            sprite.remove_from_gamestate()
-            player_ids_to_delete.append(player_id)
-
-        for player_id in player_ids_to_delete:
-            del self.local_players[player_id]
+        for local in (self.local_players, self.local_bullets, self.local_portals):
+            for sprite in local.values():
+                sprite.pool.release(sprite)
+            local.clear()
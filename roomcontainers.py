@@ -35,6 +35,8 @@ class RoomContainer(cb.AbstractBase):
         """
         for sprite in self.sprites():
             sprite.add_to_gamestate()
+            if sprite.is_static:  # Static sprites never leave their spot in the room
+                continue
             sprite.accel = vec(0, 0)
             sprite.vel = vec(0, 0)
 
@@ -15,9 +15,12 @@ import screen
 import calc
 import classbases as cb
 import constants as cst
+import gamestack as gs
 import groups
 import players
 import roomcontainers
+import simulation
+import staticlayer
 import tiles
 import trinkets
 import visual_elems
@@ -141,10 +144,17 @@ class Room(cb.AbstractBase):
         """
         super().__init__()
         groups.all_rooms.append(self)
+        gs.s_action.all_sprites.set_camera(cb.get_camera_pos)  # The action's static sprites are anchored to the room
         self.room = vec((room_x, room_y))
         self.size = vec((0, 0))
         self.last_dir_entered = None
 
+        self.pos = vec(0, 0)  # Where the room's top-left corner is on the screen. Static sprites are drawn relative to it
+        self.pos_offset = vec(0, 0)
+        self.vel = vec(0, 0)
+        self.accel = vec(0, 0)
+        self.camera_vel = vec(0, 0)  # The velocity the room's position moves with, which static sprites follow
+
         self.player1 = players.Player()
 
         self.last_mvm_rel = {  # Last movement key release
@@ -159,6 +169,7 @@ class Room(cb.AbstractBase):
                       cst.WEST: ctrl.K_MOVE_LEFT}
 
         self.last_tp_dirs = (cst.SOUTH, cst.SOUTH)
+        self.static_layer = None
 
         self.border_south = tiles.RoomBorder(0, self.size.y // 16, self.size.x // 16, 1)
         self.border_east = tiles.RoomBorder(cst.WINWIDTH // 16, 0, 1, self.size.y // 16)
@@ -171,10 +182,6 @@ class Room(cb.AbstractBase):
 
         self.trans_screen = RoomTransition(self)
 
-        self.pos = vec(0, 0)
-        self.pos_offset = vec(0, 0)
-        self.vel = vec(0, 0)
-        self.accel = vec(0, 0)
         self.accel_const = self.player1.accel_const
 
         self._room_specs = {
@@ -399,17 +406,29 @@ class Room(cb.AbstractBase):
     def accel_movement(self) -> None:
         """Calculates the room's acceleration, velocity, and position
         """
+        self._move_camera(vec(self.accel))
+
         # if self.vel.magnitude() > 25:
         #     self.vel = self.vel.normalize() * 25
         self.accel.x += self.vel.x * cst.FRIC
         self.accel.y += self.vel.y * cst.FRIC
         self.vel += self.accel * (screen.dt * cst.M_FPS)
 
-        self.pos = vec(self.border_west.pos.x + self.border_west.hitbox.width // 2,
-                       self.border_north.pos.y + self.border_north.height // 2) - self.pos_offset
-
         self.player1.print_label()
 
+    def _move_camera(self, accel: vec) -> None:
+        """Moves the room's position exactly the way each static sprite used to move itself, speed cap included, so
+        the room's geometry scrolls the same as it did before it was anchored to the room.
+
+        :param accel: The acceleration the room was given this frame
+        :return: None
+        """
+        if self.camera_vel.magnitude() > 25:
+            self.camera_vel = self.camera_vel.normalize() * 25
+        accel += self.camera_vel * cst.FRIC
+        self.camera_vel += accel * (screen.dt * cst.M_FPS)
+        self.pos += self.camera_vel * (screen.dt * cst.M_FPS) + self.accel_const * accel
+
     def get_accel(self) -> vec:
         """Returns the acceleration value to give to the room
 
@@ -510,17 +529,21 @@ class Room(cb.AbstractBase):
         """
         if not is_additive:
             self.vel = vec(value_x, value_y)
+            self.camera_vel = vec(value_x, value_y)
             for sprite in self._get_sprites_to_recenter():
                 sprite.vel = vec(value_x, value_y)
         if is_additive:
             self.vel.x += value_x
             self.vel.y += value_y
+            self.camera_vel.x += value_x
+            self.camera_vel.y += value_y
             for sprite in self._get_sprites_to_recenter():
                 sprite.vel.x += value_x
                 sprite.vel.y += value_y
 
     def _get_sprites_to_recenter(self) -> list:
-        """Returns a list containing all sprites that should be relocated when the player is centered.
+        """Returns a list containing all sprites that should be relocated when the player is centered. Static sprites
+        are left out, since they follow the room's position without being moved.
 
         Returns:
             list: A list containing all sprites that should be relocated when the player is centered
@@ -528,39 +551,26 @@ class Room(cb.AbstractBase):
         output_list = []
         for sprite in [s
                        for s in itertools.chain(self.sprites(), groups.all_drops)
-                       if s.in_gamestate]:
+                       if s.in_gamestate and not s.is_static]:
             output_list.append(sprite)
 
         for container in [c for c in groups.all_containers if c.room == self.room]:
             for sprite in container:
-                output_list.append(sprite)
+                if not sprite.is_static:
+                    output_list.append(sprite)
 
         return output_list
 
     # -------------------------------- Teleporting ------------------------------- #
-    def _align_player_tp(self, portal_out, width, height) -> None:
+    def _align_player_tp(self, portal_out) -> None:
         """Sets the player at the proper position after teleporting when the room can scroll.
 
         :param portal_out: The exit portal sprite
-        :param width: Half the sum of the player's hitbox width plus the portal's hitbox width
-        :param height: Half the sum of the player's hitbox height plus the portal's hitbox height
         :return: None
         """
-        if portal_out.facing == cst.SOUTH:
-            self.player1.pos.x = portal_out.pos.x
-            self.player1.pos.y = portal_out.pos.y + height
-
-        elif portal_out.facing == cst.EAST:
-            self.player1.pos.x = portal_out.pos.x + width
-            self.player1.pos.y = portal_out.pos.y
-
-        elif portal_out.facing == cst.NORTH:
-            self.player1.pos.x = portal_out.pos.x
-            self.player1.pos.y = portal_out.pos.y - height
-
-        elif portal_out.facing == cst.WEST:
-            self.player1.pos.x = portal_out.pos.x - width
-            self.player1.pos.y = portal_out.pos.y
+        self.player1.pos.x, self.player1.pos.y = simulation.get_player_exit(
+            portal_out.get_data(), self.player1.hitbox.width, self.player1.hitbox.height
+        )
 
     def teleport_player(self, portal_in, portal_out) -> None:
         """Teleports the player when the room is scrolling.
@@ -575,9 +585,7 @@ class Room(cb.AbstractBase):
         dir_angles = {cst.SOUTH: 180, cst.EAST: 90, cst.NORTH: 0, cst.WEST: 270}
 
         # Actually teleporting the player
-        self._align_player_tp(portal_out,
-                              (portal_out.hitbox.width + self.player1.hitbox.width) // 2,
-                              (portal_out.hitbox.height + self.player1.hitbox.height) // 2)
+        self._align_player_tp(portal_out)
         self.update_binds(dir_in, dir_out)
         self.readjust_binds_after_tp(dir_in, dir_out)  # If the key wasn't held while tp-ing, don't reverse binding
 
@@ -664,6 +672,7 @@ class Room(cb.AbstractBase):
         :return: None
         """
         self.vel = self.vel.rotate(angle)
+        self.camera_vel = self.camera_vel.rotate(angle)
 
         for sprite in self._get_sprites_to_recenter():
             sprite.vel = sprite.vel.rotate(angle)
@@ -676,6 +685,7 @@ class Room(cb.AbstractBase):
         """
         room_vel_copy = self.vel.copy()
         player_vel_copy = self.player1.vel.copy()
+        self.camera_vel = player_vel_copy.rotate(angle)
         for sprite in self._get_sprites_to_recenter():
             sprite.vel = player_vel_copy.rotate(angle)
         self.player1.vel = room_vel_copy.rotate(angle)
@@ -703,22 +713,23 @@ class Room(cb.AbstractBase):
     def _player_block_from_side(self, sprite) -> None:
         width = (self.player1.hitbox.width + sprite.hitbox.width) // 2
         height = (self.player1.hitbox.height + sprite.hitbox.height) // 2
-        if calc.triangle_collide(self.player1, sprite) == cst.SOUTH and (
+        side = calc.triangle_collide(self.player1, sprite)
+        if side == cst.SOUTH and (
                 self.player1.vel.y < 0 or sprite.vel.y > 0) and self.player1.pos.y <= sprite.pos.y + height:
             self.player1.vel.y = 0
             self.player1.pos.y = sprite.pos.y + height
 
-        elif calc.triangle_collide(self.player1, sprite) == cst.EAST and (
+        elif side == cst.EAST and (
                 self.player1.vel.x < 0 or sprite.vel.x > 0) and self.player1.pos.x <= sprite.pos.x + width:
             self.player1.vel.x = 0
             self.player1.pos.x = sprite.pos.x + width
 
-        elif calc.triangle_collide(self.player1, sprite) == cst.NORTH and (
+        elif side == cst.NORTH and (
                 self.player1.vel.y > 0 or sprite.vel.y < 0) and self.player1.pos.y >= sprite.pos.y - height:
             self.player1.vel.y = 0
             self.player1.pos.y = sprite.pos.y - height
 
-        elif calc.triangle_collide(self.player1, sprite) == cst.WEST and (
+        elif side == cst.WEST and (
                 self.player1.vel.x > 0 or sprite.vel.x < 0) and self.player1.pos.x >= sprite.pos.x - width:
             self.player1.vel.x = 0
             self.player1.pos.x = sprite.pos.x - width
@@ -727,25 +738,26 @@ class Room(cb.AbstractBase):
     def _sprite_block_from_side(instig, sprite) -> None:
         width = (instig.hitbox.width + sprite.hitbox.width) // 2
         height = (instig.hitbox.height + sprite.hitbox.height) // 2
-        if (calc.triangle_collide(instig, sprite) == cst.SOUTH and
+        side = calc.triangle_collide(instig, sprite)
+        if (side == cst.SOUTH and
                 instig.pos.y <= sprite.pos.y + height and (
                 instig.vel.y < 0 or sprite.vel.y > 0)):
             instig.vel.y = 0
             instig.pos.y = sprite.pos.y + height
 
-        elif (calc.triangle_collide(instig, sprite) == cst.EAST and
+        elif (side == cst.EAST and
                 instig.pos.x <= sprite.pos.x + width and (
                 instig.vel.x < 0 or sprite.vel.x > 0)):
             instig.vel.x = 0
             instig.pos.x = sprite.pos.x + width
 
-        elif (calc.triangle_collide(instig, sprite) == cst.NORTH and
+        elif (side == cst.NORTH and
                 instig.pos.y >= sprite.pos.y - height and (
                 instig.vel.y > 0 or sprite.vel.y < 0)):
             instig.vel.y = 0
             instig.pos.y = sprite.pos.y - height
 
-        elif (calc.triangle_collide(instig, sprite) == cst.WEST and
+        elif (side == cst.WEST and
                 instig.pos.x >= sprite.pos.x - width and (
                 instig.vel.x > 0 or sprite.vel.x < 0)):
             instig.vel.x = 0
@@ -811,6 +823,7 @@ class Room(cb.AbstractBase):
         # self._get_room_change_trajectory(scroll_copy_x, scroll_copy_y, self.is_scrolling_x, self.is_scrolling_y,
         #                                  player_vel_copy, room_vel_copy)
         self.vel = vec(0, 0)
+        self.camera_vel = vec(0, 0)
 
     def get_room_change_trajectory(self, prev_room_scroll_x: bool, prev_room_scroll_y: bool, new_room_scroll_x: bool,
                                    new_room_scroll_y: bool, player_vel: vec, room_vel: vec) -> None:
@@ -842,6 +855,11 @@ class Room(cb.AbstractBase):
         for sprite in self.sprites():
             sprite.kill()
 
+        if self.static_layer is not None:
+            self.static_layer.clear()
+
+        self.pos = vec(0, 0)  # The new room's sprites are placed relative to its top-left corner
+
         for portal in groups.all_portals:
             portal.kill()
 
@@ -859,26 +877,25 @@ class Room(cb.AbstractBase):
         self._init_room(this_room.width, this_room.height, this_room.scroll.x, this_room.scroll.y)
 
         # ----- Centering the room when the room is smaller than the window size ----- #
+        # Moving the room moves everything static within it, so the borders and walls stay lined up
         if self.border_east.pos.x - 16 < cst.WINWIDTH:
             self.pos_offset.x = cst.WINWIDTH // 2 - self.border_north.hitbox.width // 2
-            self.border_north.pos.x = cst.WINWIDTH // 2
-            self.border_south.pos.x = cst.WINWIDTH // 2
-            self.border_east.pos.x = cst.WINWIDTH // 2 + self.border_north.hitbox.width // 2 + 8
-            self.border_west.pos.x = cst.WINWIDTH // 2 - self.border_north.hitbox.width // 2 - 8
             self.player1.pos.x += self.pos_offset.x
         else:
             self.pos_offset.x = 0
 
         if self.border_south.pos.y - 16 < cst.WINHEIGHT:
             self.pos_offset.y = cst.WINHEIGHT // 2 - self.border_east.hitbox.height // 2
-            self.border_east.pos.y = cst.WINHEIGHT // 2
-            self.border_west.pos.y = cst.WINHEIGHT // 2
-            self.border_south.pos.y = cst.WINHEIGHT // 2 + self.border_east.hitbox.height // 2 + 8
-            self.border_north.pos.y = cst.WINHEIGHT // 2 - self.border_east.hitbox.height // 2 - 8
-            self.player1.pos.y += cst.WINHEIGHT // 2 - self.border_east.hitbox.height // 2
+            self.player1.pos.y += self.pos_offset.y
         else:
             self.pos_offset.y = 0
 
+        self.pos = vec(self.pos_offset)
+
+        # Baking the room's walls, floors, and borders so they can be drawn as a few large chunks
+        containers = [c for c in groups.all_containers if c.room == self.room]
+        self.static_layer = staticlayer.StaticLayer(itertools.chain(self.sprites(), *containers))
+
     def _get_room_layout(self) -> list:
         """Returns the layout of the current room.
 
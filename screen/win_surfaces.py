@@ -4,4 +4,6 @@ import constants as cst
 buffer_screen = pygame.Surface((cst.WINWIDTH, cst.WINHEIGHT))
 viewport = pygame.display.set_mode((cst.WINWIDTH, cst.WINHEIGHT), pygame.SCALED, 0, 0, 1)
 
+drawn_text = []  # [(image, rect), ...] The text drawn onto buffer_screen this frame
+
 dt = 0.0
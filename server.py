@@ -1,19 +1,17 @@
-import pickle
-
 from PodSixNet.Server import Server
 from PodSixNet.Channel import Channel
-from cv2 import data
 
-from server_rooms import ServerRoom
-import calc
-import copy
+from server_match import Match, MATCH_TICK_BUDGET
+from tickscheduler import TickScheduler, TICK_RATE, SEND_RATE, MAX_CATCH_UP
+import argparse
 import constants as cst
+import netcodec
 import socket
-
-import pygame
-from pygame.math import Vector2 as vec
+import time
 
 PING_TIMEOUT = 6
+MAX_DATAGRAMS_PER_STEP = 256  # Any datagrams past this are left in the socket buffer until the next step
+UDP_RECV_BUFFER_SIZE = 1 << 20  # Room for bursts of input between steps instead of the OS dropping them
 
 
 class PlayerChannel(Channel):
@@ -22,8 +20,8 @@ class PlayerChannel(Channel):
         self.id = None
         self.ip = None
         self.state = {
-            "x": 0,
-            "y": 0,
+            "x": cst.WINWIDTH // 2,  # Where the client places its player when it connects
+            "y": cst.WINHEIGHT // 2,
             "vel_x": 0,
             "vel_y": 0,
             "hp": 50,
@@ -31,10 +29,28 @@ class PlayerChannel(Channel):
             "hit_h": 32,
             "angle": 0,
             "username": None,
-            "lobby_mode": False
+            "lobby_mode": False,
+            "last_input": 0,  # The sequence number of the newest movement input applied to this player
         }
+        self.acked_seq = None  # The newest snapshot the client has confirmed receiving
+        self.view_history = {}  # {snapshot seq: the area-of-interest cell the client was sent that snapshot for}
+        self.view_cell = None  # The area-of-interest cell the client's viewport is in
+        self.last_move_seq = None  # The sequence number of the newest move received over UDP
+        self.move_budget = 0.0  # How far the player is allowed to move before the next step (in pixels)
+        self.match = None  # The match the player is in
+
+    def SendEncoded(self, payload: bytes) -> int:
+        """Queues a message that has already been serialized with ``encode_message``. Lets the same bytes be sent to many
+        channels without serializing the message again for each one.
+
+        :param payload: The encoded message
+        :return: The number of bytes queued
+        """
+        self.sendqueue.append(payload)
+        return len(payload)
+
     def Network_set_server_settings(self, data):
-        self._server.server_setting_player_number = data["setting"]
+        self.match.server_setting_player_number = data["setting"]
 
     def Network_set_username(self, data):
         self.state["username"] = data["username"]
@@ -43,13 +59,15 @@ class PlayerChannel(Channel):
         self._server.track_ping(self.ip)
         self.Send({"action": "pong"})
 
-    def Network_move(self, data):
-        self.state["x"] = data["x"]
-        self.state["y"] = data["y"]
-        self.state["angle"] = data["angle"]
+    def Network_ack_snapshot(self, data):
+        if self.acked_seq is None or data["seq"] > self.acked_seq:
+            self.acked_seq = data["seq"]
+
+    def Network_request_full_snapshot(self, data):
+        self.acked_seq = None
 
     def Network_fire(self, data):
-        bullet_id = self._server.spawn_bullet(
+        bullet_id = self.match.spawn_bullet(
             owner=self.id,
             bullet_type=data["bullet_type"],
             x=data["x"],
@@ -69,253 +87,136 @@ class PlayerChannel(Channel):
 class OrbeetoServer(Server):
     channelClass = PlayerChannel
 
-    def __init__(self, host="0.0.0.0", port=12345):
+    def __init__(self, host="0.0.0.0", port=12345, tick_rate=TICK_RATE, tick_budget=MATCH_TICK_BUDGET):
         Server.__init__(self, localaddr=(host, port))
         self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RECV_BUFFER_SIZE)
         self.udp_socket.bind((host, port))
         self.udp_socket.setblocking(False)
 
-        self.players = {}  # {channel.id: channel}
-        self.bullets = {}
-        self.walls = {}
-        self.portals = {}
+        self.tick_rate = tick_rate
+        self.tick_budget = tick_budget
+        self.matches = {}  # {match.id: match}
+        self.player_matches = {}  # {channel.id: match}, for routing datagrams to the sender's match
 
-        self.player_pings = {} # {ip: last_ping}
-        self.disconnected_players = {}  # {ip: disconnect_data}
-                                        # disconnect_data = { old_id, ip, channel.state}
-        self.server_setting_player_number = None
-
-        self.next_player_id = 0
-        self.next_bullet_id = 0
-        self.next_portal_id = 0
+        self.udp_drained = 0  # Datagrams read from the UDP socket
+        self.udp_dropped = 0  # Datagrams that were read but ignored for being invalid or unverified
+        self.udp_capped_steps = 0  # Steps that stopped reading because they hit MAX_DATAGRAMS_PER_STEP
 
-        self.current_room = vec(0, 0)
-        self._build_room(0, 0)
+        self.player_pings = {} # {ip: last_ping}
 
-        self.lobby_mode = True
-        self.game_over = False
+        self.next_player_id = 0  # Player IDs are unique across every match, so datagrams can be routed by ID
+        self.next_match_id = 0
 
     def Connected(self, channel, addr):
+        channel.ip = addr[0]
+
         # Check if player has connected before
-        joined_before = False
-        for old_ip, old_player in self.disconnected_players.items():
-            if old_ip == addr[0]:
-                print(old_player)
-                joined_before = True
-                break
-
-        if not joined_before:
+        old_match = self._find_disconnected_match(channel.ip)
+        if old_match is None:
             channel.id = self.next_player_id
-            channel.ip = addr[0]
-            self.players[channel.id] = channel
-
             self.next_player_id += 1
-            channel.Send({"action": "init", "id": channel.id, "old_room_rel_pos_x": None, "old_room_rel_pos_y": None})
-            print(f"New player with IP {channel.ip} connected.")
-            self.track_ping(channel.ip)
+            self._find_open_match().add_player(channel)
+            print(f"New player with IP {channel.ip} connected to match {channel.match.id}.")
 
         else:  # Player has joined server before
-            channel.id = self.disconnected_players[addr[0]]["old_id"]
-            channel.ip = addr[0]
-            channel.state = self.disconnected_players[addr[0]]["state"]
-            self.players[channel.id] = channel
-
-            del self.disconnected_players[addr[0]]
-            channel.Send({
-                "action": "init",
-                "id": channel.id,
-                "old_room_rel_pos_x": channel.state["x"],
-                "old_room_rel_pos_y": channel.state["y"]
-            })
-            print(f"Player with IP {channel.ip} has reconnected.")
-            self.track_ping(channel.ip)
-
-    def _build_room(self, room_x, room_y):
-        self.walls.clear()
-        self.walls = {
-            ServerRoom.get_next_wall_id(): ServerRoom.new_wall(0, 0, 16, 16, 4, 180),
-            ServerRoom.get_next_wall_id(): ServerRoom.new_wall(4, 0, 16, 16, 316, 4),
-            ServerRoom.get_next_wall_id(): ServerRoom.new_wall(4, 176, 16, 16, 316, 4),
-        }
+            old_match.readd_player(channel)
+            print(f"Player with IP {channel.ip} has reconnected to match {old_match.id}.")
+
+        self.player_matches[channel.id] = channel.match
+        channel.Send({
+            "action": "init",
+            "id": channel.id,
+            "old_room_rel_pos_x": channel.state["x"],
+            "old_room_rel_pos_y": channel.state["y"],
+            "tick_rate": self.tick_rate
+        })
+        self.track_ping(channel.ip)
+
+    # ------------------------------- Matches ------------------------------- #
+    def create_match(self) -> Match:
+        """Starts a new, empty match.
+
+        :return: The new match
+        """
+        match = Match(self.next_match_id, self.tick_rate, self.tick_budget)
+        self.matches[match.id] = match
+        self.next_match_id += 1
+        return match
+
+    def _find_open_match(self) -> Match:
+        """Returns the match a new player should join: the oldest match that is still open, or a new match if every
+        match is full or already being played.
+
+        :return: The match to join
+        """
+        for match in self.matches.values():
+            if match.is_open():
+                return match
+        return self.create_match()
+
+    def _find_disconnected_match(self, ip: str) -> Match | None:
+        """Returns the match a player with the given IP disconnected from, if any.
+
+        :param ip: The IP of the connecting player
+        :return: The match the player left, or None if the player isn't expected back anywhere
+        """
+        for match in self.matches.values():
+            if ip in match.disconnected_players:
+                return match
+        return None
 
+    def _close_finished_matches(self) -> None:
+        """Removes every match that nobody is playing or coming back to anymore.
+
+        :return: None
+        """
+        finished = [match for match in self.matches.values() if match.is_finished()]
+        for match in finished:
+            for disconnect_data in match.disconnected_players.values():
+                self.player_matches.pop(disconnect_data["old_id"], None)
+            del self.matches[match.id]
+            print(f"Closed match {match.id}.")
+
+    # ------------------------------- Players ------------------------------- #
     def track_ping(self, ip: str):
         self.player_pings[ip] = time.time()
 
     def remove_player(self, channel):
-        if channel.id in self.players:
-            # Saving player data in case they reconnect
-            disconnect_data = {
-                "old_id": channel.id,
-                "ip": channel.ip,
-                "state": channel.state
-            }
-            self.disconnected_players[channel.ip] = disconnect_data
-
-            del self.players[channel.id]
-            del self.player_pings[channel.ip]
-
-    def spawn_bullet(self, owner, bullet_type: str, x, y, vel_x, vel_y, hit_w: int, hit_h: int):
-        if self.lobby_mode:
-            print("lobby mode")
-            return
-
-        bullet_id = self.next_bullet_id
-        self.next_bullet_id += 1
-
-        self.bullets[bullet_id] = {
-            "owner": owner,
-            "bullet_type": bullet_type,
-            "x": x,
-            "y": y,
-            "vel_x": vel_x,
-            "vel_y": vel_y,
-            "hit_w": hit_w,
-            "hit_h": hit_h,
-        }
+        if channel.match is not None and channel.id in channel.match.players:
+            channel.match.remove_player(channel)
+            self.player_pings.pop(channel.ip, None)  # Players sharing an IP share a ping entry
 
-    def destroy_bullet(self, bullet_id):
-        if bullet_id in self.bullets:
-            del self.bullets[bullet_id]
-
-            bullet_destroyed = {
-                "action": "destroy_bullet",
-                "id": bullet_id,
-            }
-
-            for client in self.players.values():
-                client.Send(bullet_destroyed)
-
-    def spawn_portal(self, owner, landed_on_data, facing, bullet_x, bullet_y):
-        portal_id = self.next_portal_id
-        self.next_portal_id += 1
-
-        true_x = bullet_x
-        true_y = bullet_y
-        hit_width = 54
-        hit_height = 20
-
-        if facing == cst.SOUTH:
-            true_y = landed_on_data["y"] + landed_on_data["hit_h"] // 2
-        elif facing == cst.EAST:
-            true_x = landed_on_data["x"] + landed_on_data["hit_w"] // 2
-            hit_width = 20
-            hit_height = 54
-        elif facing == cst.NORTH:
-            true_y = landed_on_data["y"] - landed_on_data["hit_h"] // 2
-        elif facing == cst.WEST:
-            true_x = landed_on_data["x"] - landed_on_data["hit_w"] // 2
-            hit_width = 20
-            hit_height = 54
-
-        offset_x = true_x - landed_on_data["x"]
-        offset_y = true_y - landed_on_data["y"]
-
-        self.portals[portal_id] = {
-            "owner": owner,
-            "landed_on": landed_on_data,
-            "facing": facing,
-            "x": true_x,
-            "y": true_y,
-            "offset_x": offset_x,
-            "offset_y": offset_y,
-            "hit_w": hit_width,
-            "hit_h": hit_height,
-            "linked_to": None
-        }
+    def _get_channels(self):
+        """Returns the channel of every connected player, in every match."""
+        for match in self.matches.values():
+            yield from match.players.values()
 
-        # TODO: Scan list after spawning portal to link portals
-        found = []
-        for pid, portal in [tup for tup in self.portals.items() if tup[1]["owner"] == owner]:
-            found.append(pid)
-
-        if len(found) > 2:
-            pid_to_del = min(found)
-            del found[found.index(pid_to_del)]
-            self.destroy_portal(pid_to_del)
-
-            new_link1 = found[0]
-            new_link2 = found[1]
-            print(f"New oldest: {new_link1} | Newest: {new_link2}")
-
-            self.portals[new_link1]["linked_to"] = new_link2
-            self.portals[new_link2]["linked_to"] = new_link1
-            return
-
-        if len(found) == 2:
-            new_link1 = found[0]
-            new_link2 = found[1]
-
-            self.portals[new_link1]["linked_to"] = new_link2
-            self.portals[new_link2]["linked_to"] = new_link1
-            return
-
-    def destroy_portal(self, portal_id):
-        if portal_id in self.portals:
-            del self.portals[portal_id]
-
-    def broadcast(self):
-        players_state = {
-            "action": "update_players",
-            "players": {
-                pid: ch.state
-                for pid, ch in self.players.items()
-            },
-        }
-        bullets_state = {
-            "action": "update_bullets",
-            "bullets": {
-                bid: bullet
-                for bid, bullet in self.bullets.items()
-            }
-        }
-        portals_state = {
-            "action": "update_portals",
-            "portals": {
-                portal_id: portal
-                for portal_id, portal in self.portals.items()
-            }
-        }
-        walls_state = {
-            "action": "update_walls",
-            "walls": {
-                wall_id: wall
-                for wall_id, wall in self.walls.items()
-            }
-        }
+    # ------------------------------- Stepping ------------------------------- #
+    def tick(self):
+        """Advances every match by one step and immediately sends a snapshot of the result.
 
-        for client in self.players.values():
-            client.Send(players_state)
-            client.Send(bullets_state)
-            client.Send(portals_state)
-            client.Send(walls_state)
+        :return: None
+        """
+        self.step()
+        self.send_snapshot()
 
-    def tick(self):
+    def send_snapshot(self):
+        """Broadcasts the current state of every match to its clients.
+
+        :return: None
+        """
+        for match in self.matches.values():
+            match.send_snapshot()
+
+    def step(self):
+        """Reads the input of every player, then advances every match by one fixed-length step.
+
+        :return: None
+        """
         # UDP Sending/Receiving
-        try:
-            data, addr = self.udp_socket.recvfrom(1024)
-            dec_data = pickle.loads(data)
-
-            match dec_data["action"]:
-                case "udp_request":
-                    print(f"UDP request received from {addr}")
-
-                case "fire":
-                    self.spawn_bullet(
-                        owner=0,
-                        bullet_type=dec_data["bullet_type"],
-                        x=dec_data["x"],
-                        y=dec_data["y"],
-                        vel_x=dec_data["vel_x"],
-                        vel_y=dec_data["vel_y"],
-                        hit_w=dec_data["hit_w"],
-                        hit_h=dec_data["hit_h"],
-                    )
-
-                case _:
-                    pass
-        except BlockingIOError:
-            pass
+        self._drain_datagrams()
 
         # Checking for disconnections
         ips_to_remove = []
@@ -325,253 +226,160 @@ class OrbeetoServer(Server):
 
         for ip in ips_to_remove:
             # Finding and removing player
-            for ch in self.players.values():
+            for ch in self._get_channels():
                 if ch.ip == ip:
                     self.remove_player(ch)
                     break
 
-        # TCP Sending/Receiving
-        for pid, ch in self.players.items():
-            self._handle_player_teleport(pid, ch.state)
-
-        to_destroy = []  # Bullets to destroy after iteration
-        for bid, b in self.bullets.items():
-            b["x"] += b["vel_x"] * 0.75
-            b["y"] += b["vel_y"] * 0.75
+        for match in self.matches.values():
+            match.step()
 
-            self._handle_bullets_through_portals(b)
-            self._handle_player_hit(b, bid, to_destroy)
+        self._close_finished_matches()
 
-            wall_coll_result = self._handle_bullet_wall_collision(bid, b, to_destroy)
-            if wall_coll_result is not None:
-                side_hit, data_hit = wall_coll_result
-                # TODO: Spawn bullet shatter on client side
+    def get_load_report(self) -> dict:
+        """Returns how busy the server is and which players it is expecting back, for a supervisor deciding where to
+        send new players.
 
-            # TODO: Find way to reference room
-            # Destroy bullets OOB
-            if b["x"] >= 1280 * 4 or b["x"] <= 0 or b["y"] >= 720 * 4 or b["y"] <= 0:
-                to_destroy.append(bid)
-
-        for bullet in to_destroy:
-            self.destroy_bullet(bullet)
-
-        # Updating Portals
-        for portal_id, portal in self.portals.items():
-            portal["x"] = portal["landed_on"]["x"] + portal["offset_x"]
-            portal["y"] = portal["landed_on"]["y"] + portal["offset_y"]
-
-        self.broadcast()
-
-        if self.server_setting_player_number is None:
-            return
-
-        if self.lobby_mode and self._get_num_unique_players() >= int(self.server_setting_player_number):
-            self._exit_lobby_mode()
-
-        # Win condition
-        if not self.lobby_mode and not self.game_over and self._get_num_alive_players() == 1:
-            self.game_over = True
-            self._declare_winner()
-
-    def _declare_winner(self):
-        winner = ""
-        for ch in self.players.values():
-            if ch.state["hp"] > 0:
-                winner = ch.state["username"]
-
-        print(f"Winner is: {winner}")
-        game_end = {
-            "action": "game_end",
-            "winner": winner
+        :return: A dict of the server's load
+        """
+        return {
+            "load": sum(match.load for match in self.matches.values()) * self.tick_rate,  # Fraction of a core used
+            "matches": len(self.matches),
+            "open_matches": sum(1 for match in self.matches.values() if match.is_open()),
+            "players": sum(len(match.players) for match in self.matches.values()),
+            "disconnected": [ip for match in self.matches.values() for ip in match.disconnected_players],
         }
-        for client in self.players.values():
-            client.Send(game_end)
-
-    def _exit_lobby_mode(self):
-        self.lobby_mode = False
-        for pid, ch in self.players.items():
-            ch.state["lobby_mode"] = False
-        for ip, state_data in self.disconnected_players.items():
-            state_data["state"]["lobby_mode"] = False
-
-    def _get_num_unique_players(self) -> int:
-        return len(self.players) + len(self.disconnected_players)
-
-    def _get_num_alive_players(self) -> int:
-        count = 0
-        for pid, ch in self.players.items():
-            if ch.state["hp"] > 0:
-                count += 1
-        return count
-
-    def _handle_player_teleport(self, player_id, player):
-        player_hitbox = pygame.Rect(
-            player["x"] - player["hit_w"] // 2,
-            player["y"] - player["hit_h"] // 2,
-            player["hit_w"],
-            player["hit_h"]
-        )
-
-        for portal_id, portal in self.portals.items():
-            portal_hitbox = pygame.Rect(
-                portal["x"] - portal["hit_w"] // 2,
-                portal["y"] - portal["hit_h"] // 2,
-                portal["hit_w"],
-                portal["hit_h"]
-            )
 
-            if not player_hitbox.colliderect(portal_hitbox):
-                continue
-
-            if portal["linked_to"] is None:
-                # print("No connecting portal")
-                continue
+    def get_stats(self) -> str:
+        """Returns a summary of the matches being hosted and the UDP traffic received.
 
-            client = self.players[player_id]
-            client.Send({
-                "action": "teleport_player",
-                "player_id": player_id,
-                "portal_out_id": portal["linked_to"],
-            })
-
-    def _handle_player_hit(self, b_data, bid, to_destroy):
-        bullet_hitbox = pygame.Rect(
-            b_data["x"] - b_data["hit_w"] // 2,
-            b_data["y"] - b_data["hit_h"] // 2,
-            b_data["hit_w"],
-            b_data["hit_h"]
-        )
-
-        for pid, ch in self.players.items():
-            player = ch.state
-
-            player_hitbox = pygame.Rect(
-                player["x"] - player["hit_w"] // 2,
-                player["y"] - player["hit_h"] // 2,
-                player["hit_w"],
-                player["hit_h"]
-            )
+        :return: The summary
+        """
+        players = sum(len(match.players) for match in self.matches.values())
+        over_budget = sum(1 for match in self.matches.values() if match.load > match.tick_budget)
+        return (f"{len(self.matches)} matches ({over_budget} over budget), {players} players | "
+                f"UDP: {self.udp_drained} drained, {self.udp_dropped} dropped, {self.udp_capped_steps} capped steps")
+
+    # ------------------------------- UDP ------------------------------- #
+    def _get_udp_sender(self, message: dict, addr) -> PlayerChannel | None:
+        """Returns the channel of the player a datagram claims to come from, as long as the datagram was actually sent
+        from that player's IP.
+
+        :param message: The decoded datagram
+        :param addr: The address the datagram was received from
+        :return: The sender's channel, or None if the sender can't be verified
+        """
+        match = self.player_matches.get(message["id"])
+        channel = match.players.get(message["id"]) if match is not None else None
+        if channel is None or channel.ip != addr[0]:
+            return None
+        return channel
 
-            if not bullet_hitbox.colliderect(player_hitbox):
-                continue
+    def _drain_datagrams(self) -> None:
+        """Reads and handles every datagram waiting on the UDP socket, up to MAX_DATAGRAMS_PER_STEP, so that input
+        never queues up behind a single read per step.
 
-            if player["hp"] <= 0:
+        :return: None
+        """
+        for _ in range(MAX_DATAGRAMS_PER_STEP):
+            try:
+                data, addr = self.udp_socket.recvfrom(netcodec.MAX_DATAGRAM_SIZE)
+            except BlockingIOError:
+                return
+            except ConnectionResetError:  # Windows reports unreachable clients on the next read
                 continue
 
-            # Intentional: let players take damage from own bullets
-            if b_data["bullet_type"] != "portal_bullet":
-                player["hp"] -= 1
-                to_destroy.append(bid)
-
-    def _handle_bullets_through_portals(self, b_data):
-        bullet_hitbox = pygame.Rect(
-            b_data["x"] - b_data["hit_w"] // 2,
-            b_data["y"] - b_data["hit_h"] // 2,
-            b_data["hit_w"],
-            b_data["hit_h"]
-        )
+            self.udp_drained += 1
+            if not self._handle_datagram(data, addr):
+                self.udp_dropped += 1
+        else:
+            self.udp_capped_steps += 1
 
-        for portal_id, portal in self.portals.items():
-            portal_hitbox = pygame.Rect(
-                portal["x"] - portal["hit_w"] // 2,
-                portal["y"] - portal["hit_h"] // 2,
-                portal["hit_w"],
-                portal["hit_h"]
-            )
+    def _handle_datagram(self, data: bytes, addr) -> bool:
+        """Decodes and handles a single datagram received over UDP. Invalid or unverified datagrams are ignored.
 
-            if not bullet_hitbox.colliderect(portal_hitbox):
-                continue
-
-            if portal["linked_to"] is None:
-                # print("No connecting portal")
-                continue
-
-            other_portal = self.portals[portal["linked_to"]]
-            dir_in = portal["facing"]
-            dir_out = other_portal["facing"]
-
-            dist_offset = copy.copy(b_data["x"]) - copy.copy(portal["x"])
-            dir_list = {cst.SOUTH: 180, cst.EAST: 90, cst.NORTH: 0, cst.WEST: 270}
-
-            if dir_in == cst.EAST:
-                dir_list.update({cst.EAST: 180, cst.NORTH: 90, cst.WEST: 0, cst.SOUTH: 270})
-                dist_offset = copy.copy(b_data["y"]) - copy.copy(portal["y"])
-            elif dir_in == cst.NORTH:
-                dir_list.update({cst.NORTH: 180, cst.WEST: 90, cst.SOUTH: 0, cst.EAST: 270})
-            elif dir_in == cst.WEST:
-                dir_list.update({cst.WEST: 180, cst.SOUTH: 90, cst.EAST: 0, cst.NORTH: 270})
-                dist_offset = copy.copy(b_data["y"]) - copy.copy(portal["y"])
-
-            # Aligning sprite at other portal
-            out_width = (other_portal["hit_w"] + b_data["hit_w"]) // 2
-            out_height = (other_portal["hit_h"] + b_data["hit_h"]) // 2
-
-            if dir_out == cst.SOUTH:
-                b_data["x"] = other_portal["x"] - dist_offset
-                b_data["y"] = other_portal["y"] + out_height
-            elif dir_out == cst.EAST:
-                b_data["x"] = other_portal["x"] + out_width
-                b_data["y"] = other_portal["y"] - dist_offset
-            elif dir_out == cst.NORTH:
-                b_data["x"] = other_portal["x"] + dist_offset
-                b_data["y"] = other_portal["y"] - out_height
-            elif dir_out == cst.WEST:
-                b_data["x"] = other_portal["x"] - out_width
-                b_data["y"] = other_portal["y"] + dist_offset
-
-            current_bullet_vel = vec(b_data["vel_x"], b_data["vel_y"])
-            new_bullet_vel = current_bullet_vel.rotate(dir_list[dir_out])
-            b_data["vel_x"] = new_bullet_vel.x
-            b_data["vel_y"] = new_bullet_vel.y
-
-    def _handle_bullet_wall_collision(self, bid: int, b_data: dict[str, any], destroy_list: list[int]):
-        """Handles collisions between bullets and walls.
-
-        :param b_data: Bullet data being evaluated
-        :param destroy_list: A list containing all bullet IDs to be deleted after iterating all bullets
-        :return: The side the bullet hit a wall and the wall object data
+        :param data: The raw datagram
+        :param addr: The address the datagram was received from
+        :return: Whether the datagram was accepted
         """
-        bullet_hitbox = pygame.Rect(
-            b_data["x"] - b_data["hit_w"] // 2,
-            b_data["y"] - b_data["hit_h"] // 2,
-            b_data["hit_w"],
-            b_data["hit_h"]
-        )
-
-        for wall_id, wall in self.walls.items():
-            wall_width = wall["width"] * wall["block_width"]
-            wall_height = wall["height"] * wall["block_height"]
-            wall_hitbox = pygame.Rect(
-                wall["x"] - wall_width // 2,
-                wall["y"] - wall_height // 2,
-                wall_width,
-                wall_height
-            )
-
-            if not bullet_hitbox.colliderect(wall_hitbox):
-                continue
+        message = netcodec.decode(data)
+        if message is None:
+            return False
+
+        if message["action"] == "udp_request":
+            print(f"UDP request received from {addr}")
+            return True
+
+        sender = self._get_udp_sender(message, addr)
+        if sender is None:
+            return False
+
+        match message["action"]:
+            case "ping":
+                self.track_ping(sender.ip)
+
+            case "move":
+                if sender.last_move_seq is not None and message["seq"] <= sender.last_move_seq:
+                    return False  # Arrived out of order, so every input in it has already been applied
+                sender.match.apply_move(sender, message)
+
+            case "fire":
+                sender.match.spawn_bullet(
+                    owner=sender.id,
+                    bullet_type=message["bullet_type"],
+                    x=message["x"],
+                    y=message["y"],
+                    vel_x=message["vel_x"],
+                    vel_y=message["vel_y"],
+                    hit_w=message["hit_w"],
+                    hit_h=message["hit_h"],
+                )
+
+        return True
+
+
+def serve(server: OrbeetoServer, scheduler: TickScheduler, stats_interval: float = 0, report=None,
+          report_interval: float = 1.0) -> None:
+    """Runs a server forever.
+
+    :param server: The server to run
+    :param scheduler: The scheduler that decides when the server steps and sends snapshots
+    :param stats_interval: Seconds between printed statistics reports (0 to disable)
+    :param report: Called with the server every report_interval seconds, if given
+    :param report_interval: Seconds between calls to report
+    :return: None
+    """
+    last_stats = last_report = time.time()
+    while True:
+        server.Pump()
+        scheduler.update(server.step, server.send_snapshot)
 
-            instig_vec = vec(b_data["x"], b_data["y"])
-            wall_vec = vec(wall["x"], wall["y"])
-            wall_hit = vec(wall_width, wall_height)
-            side = calc.triangle_collide(instig_vec, wall_vec, wall_hit)
+        now = time.time()
+        if stats_interval and now - last_stats >= stats_interval:
+            print(scheduler)
+            print(server.get_stats())
+            last_stats = now
 
-            if b_data["bullet_type"] == "standard":
-                destroy_list.append(bid)
-            elif b_data["bullet_type"] == "portal_bullet":
-                destroy_list.append(bid)
-                self.spawn_portal(b_data["owner"], wall, side, b_data["x"], b_data["y"])
+        if report is not None and now - last_report >= report_interval:
+            report(server)
+            last_report = now
 
-            return side, wall
+        time.sleep(scheduler.get_sleep_time())
 
 
 if __name__ == "__main__":
-    import time
-
-    server = OrbeetoServer()
+    parser = argparse.ArgumentParser(description="Runs an Orbeeto server.")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="simulation steps per second")
+    parser.add_argument("--send-rate", type=int, default=SEND_RATE, help="snapshots sent per second")
+    parser.add_argument("--max-catch-up", type=int, default=MAX_CATCH_UP,
+                        help="most steps run at once before time is dropped")
+    parser.add_argument("--tick-budget", type=float, default=MATCH_TICK_BUDGET,
+                        help="seconds each match may spend on a step before it counts as an overrun")
+    parser.add_argument("--stats-interval", type=float, default=0,
+                        help="seconds between statistics reports (0 to disable)")
+    args = parser.parse_args()
+
+    server = OrbeetoServer(tick_rate=args.tick_rate, tick_budget=args.tick_budget)
+    scheduler = TickScheduler(args.tick_rate, args.send_rate, args.max_catch_up)
     print(f"Server running on {server.socket.getsockname()}")
-    while True:
-        server.tick()
-        server.Pump()
-
-        time.sleep(0.01)
+    serve(server, scheduler, args.stats_interval)
@@ -0,0 +1,634 @@
+"""
+Contains a single match: the players, bullets, portals, and walls of one game, and the simulation that runs it.
+
+One server process hosts many matches at once. The server owns the sockets and routes every player's messages to the
+match the player is in, while each match steps its own world, keeps its own snapshot history, and tracks how much of
+the server's time it is using.
+"""
+from PodSixNet.Channel import Channel
+from PodSixNet.rencode import dumps
+
+from bullettable import BulletTable, BULLET_TYPE_CODES
+from server_rooms import ServerRoom
+from snapshots import SnapshotHistory, make_delta, SNAPSHOT_HISTORY
+from spatialhash import SpatialHash
+from tickscheduler import TICK_RATE
+import constants as cst
+import interest
+import math
+import time
+
+import numpy as np
+import pygame
+from pygame.math import Vector2 as vec
+
+import simulation
+
+MAX_PLAYER_SPEED = 25 * cst.M_FPS  # The fastest a player can move (in pixels per second), matching the client's cap
+MOVE_BURST = 0.25  # How many seconds of unused movement a player can save up, to absorb bursty input delivery
+MOVE_STEP = 8  # The longest step a move is resolved against walls in (in pixels), so thin walls can't be skipped
+ROOM_BOUNDS = (0, 0, 1280 * 4, 720 * 4)  # TODO: Find way to reference room
+BULLET_SPEED = 0.75 * TICK_RATE  # How far bullets move per second, as a multiple of their velocity
+
+MATCH_TICK_BUDGET = 0.002  # How long one step of a match should take (in seconds) before it counts as an overrun
+MATCH_IDLE_TIMEOUT = 60  # How long a running match waits for its players to reconnect before being closed (in seconds)
+LOAD_SMOOTHING = 0.1  # How quickly a match's measured load follows the length of its latest steps
+
+
+def encode_message(data: dict) -> bytes:
+    """Serializes a message into the exact bytes ``Channel.Send`` would queue for it.
+
+    :param data: The message to serialize
+    :return: The encoded message, terminator included
+    """
+    return dumps(data) + Channel.endchars.encode()
+
+
+class Match:
+    def __init__(self, match_id: int, tick_rate: int = TICK_RATE, tick_budget: float = MATCH_TICK_BUDGET):
+        """A single game, with its own players, world, and simulation.
+
+        :param match_id: The ID of the match
+        :param tick_rate: The number of steps the match is advanced by per second
+        :param tick_budget: How long one step of the match should take (in seconds)
+        """
+        self.id = match_id
+        self.players = {}  # {channel.id: channel}
+        self.bullets = BulletTable()
+        self.walls = {}
+        self.portals = {}
+
+        # Collision broadphase grids, keyed by the same IDs as the dicts above
+        self.player_grid = SpatialHash()
+        self.wall_grid = SpatialHash()
+        self.portal_grid = SpatialHash()
+
+        self.step_length = 1 / tick_rate
+        self.sim_time = 0.0  # Seconds of simulation run so far, used to timestamp snapshots
+        self.snapshots = SnapshotHistory()
+        self.views = {}  # {seq: {cell: the part of that snapshot sent to clients in the cell}}
+        self.broadcast_encodes = 0  # The number of messages serialized by the last broadcast
+        self.broadcast_bytes = 0  # The number of bytes serialized by the last broadcast
+
+        self.tick_budget = tick_budget
+        self.load = 0.0  # A smoothed measure of how long each step takes (in seconds)
+        self.overruns = 0  # Steps that took longer than the tick budget
+        self.empty_since = None  # The simulation time the last connected player left at
+
+        self.disconnected_players = {}  # {ip: disconnect_data}
+                                        # disconnect_data = { old_id, ip, channel.state}
+        self.server_setting_player_number = None
+
+        self.next_portal_id = 0
+
+        self.current_room = vec(0, 0)
+        self._build_room(0, 0)
+
+        self.lobby_mode = True
+        self.game_over = False
+
+    def __repr__(self):
+        return (f'Match({self.id}, {len(self.players)} players, {self.bullets.count} bullets, '
+                f'{self.load * 1000:.2f}ms/step, {self.overruns} overruns)')
+
+    # ------------------------------- Players ------------------------------- #
+    def is_open(self) -> bool:
+        """Returns whether new players can still join the match. Players can only join while the match is in its
+        lobby and has room for them.
+
+        :return: Whether the match can be joined
+        """
+        if not self.lobby_mode or self.game_over:
+            return False
+        if self.server_setting_player_number is None:
+            return True
+        return self._get_num_unique_players() < int(self.server_setting_player_number)
+
+    def is_finished(self) -> bool:
+        """Returns whether the match can be closed. Matches close once nobody is connected and nobody is expected
+        back: right away for lobbies and finished games, or after MATCH_IDLE_TIMEOUT for games still being played.
+
+        :return: Whether the match can be closed
+        """
+        if self.players:
+            return False
+        if self.lobby_mode or self.game_over or not self.disconnected_players:
+            return True
+        return self.empty_since is not None and self.sim_time - self.empty_since >= MATCH_IDLE_TIMEOUT
+
+    def add_player(self, channel) -> None:
+        """Adds a newly connected player to the match.
+
+        :param channel: The channel of the player, with its ID and IP already set
+        :return: None
+        """
+        channel.match = self
+        self.players[channel.id] = channel
+        self.empty_since = None
+
+    def readd_player(self, channel) -> None:
+        """Puts a player back into the match they disconnected from, restoring their old ID and state.
+
+        :param channel: The channel of the reconnecting player, with its IP already set
+        :return: None
+        """
+        disconnect_data = self.disconnected_players.pop(channel.ip)
+        channel.id = disconnect_data["old_id"]
+        channel.state = disconnect_data["state"]
+        self.add_player(channel)
+
+    def remove_player(self, channel) -> None:
+        """Removes a player from the match, saving its state in case it reconnects.
+
+        :param channel: The channel of the player
+        :return: None
+        """
+        if channel.id in self.players:
+            # Saving player data in case they reconnect
+            disconnect_data = {
+                "old_id": channel.id,
+                "ip": channel.ip,
+                "state": channel.state
+            }
+            self.disconnected_players[channel.ip] = disconnect_data
+
+            del self.players[channel.id]
+            self.player_grid.remove(channel.id)
+            if not self.players:
+                self.empty_since = self.sim_time
+
+    # ------------------------------- World ------------------------------- #
+    def _build_room(self, room_x, room_y):
+        self.walls.clear()
+        self.walls = {
+            ServerRoom.get_next_wall_id(): ServerRoom.new_wall(0, 0, 16, 16, 4, 180),
+            ServerRoom.get_next_wall_id(): ServerRoom.new_wall(4, 0, 16, 16, 316, 4),
+            ServerRoom.get_next_wall_id(): ServerRoom.new_wall(4, 176, 16, 16, 316, 4),
+        }
+
+        # Walls never move, so their grid only needs to be built once per room
+        self.wall_grid.clear()
+        for wall_id, wall in self.walls.items():
+            self.wall_grid.insert(wall_id, self._get_hitbox(wall))
+
+    @staticmethod
+    def _get_hitbox(data: dict) -> pygame.Rect:
+        """Returns the hitbox of a player, bullet, portal, or wall centered on its position.
+
+        :param data: The object data to build a hitbox for
+        :return: The hitbox of the object
+        """
+        return pygame.Rect(
+            data["x"] - data["hit_w"] // 2,
+            data["y"] - data["hit_h"] // 2,
+            data["hit_w"],
+            data["hit_h"]
+        )
+
+
+    def spawn_bullet(self, owner, bullet_type: str, x, y, vel_x, vel_y, hit_w: int, hit_h: int):
+        if self.lobby_mode:
+            print("lobby mode")
+            return
+
+        if bullet_type not in BULLET_TYPE_CODES:
+            print(f"Unknown bullet type: {bullet_type}")
+            return
+
+        return self.bullets.spawn(owner, bullet_type, x, y, vel_x, vel_y, hit_w, hit_h)
+
+    def destroy_bullet(self, bullet_id):
+        self.bullets.destroy(bullet_id)
+
+    def spawn_portal(self, owner, landed_on_data, facing, bullet_x, bullet_y):
+        portal_id = self.next_portal_id
+        self.next_portal_id += 1
+
+        placement = simulation.place_portal(landed_on_data, facing, bullet_x, bullet_y)
+
+        self.portals[portal_id] = {
+            "owner": owner,
+            "landed_on": landed_on_data,
+            "facing": facing,
+            "x": placement["x"],
+            "y": placement["y"],
+            "offset_x": placement["x"] - landed_on_data["x"],
+            "offset_y": placement["y"] - landed_on_data["y"],
+            "hit_w": placement["hit_w"],
+            "hit_h": placement["hit_h"],
+            "linked_to": None
+        }
+        self.portal_grid.insert(portal_id, self._get_hitbox(self.portals[portal_id]))
+
+        # TODO: Scan list after spawning portal to link portals
+        found = []
+        for pid, portal in [tup for tup in self.portals.items() if tup[1]["owner"] == owner]:
+            found.append(pid)
+
+        if len(found) > 2:
+            pid_to_del = min(found)
+            del found[found.index(pid_to_del)]
+            self.destroy_portal(pid_to_del)
+
+            new_link1 = found[0]
+            new_link2 = found[1]
+            print(f"New oldest: {new_link1} | Newest: {new_link2}")
+
+            self.portals[new_link1]["linked_to"] = new_link2
+            self.portals[new_link2]["linked_to"] = new_link1
+            return
+
+        if len(found) == 2:
+            new_link1 = found[0]
+            new_link2 = found[1]
+
+            self.portals[new_link1]["linked_to"] = new_link2
+            self.portals[new_link2]["linked_to"] = new_link1
+            return
+
+    def destroy_portal(self, portal_id):
+        if portal_id in self.portals:
+            del self.portals[portal_id]
+            self.portal_grid.remove(portal_id)
+
+    def _get_world_state(self) -> dict:
+        """Returns a snapshot of everything clients need to know about. The snapshot is made of copies, so it isn't
+        affected when the server's state changes afterward. Bullets are kept as columns, so that no dicts are built
+        for them until they are sent.
+
+        :return: The current state of the world
+        """
+        return {
+            "players": {pid: dict(ch.state) for pid, ch in self.players.items()},
+            "bullets": self.bullets.get_columns(),
+            "portals": {portal_id: dict(portal) for portal_id, portal in self.portals.items()},
+            "walls": dict(self.walls),  # Walls are never modified after being built, only replaced
+        }
+
+    def _get_view(self, snapshot: dict, seq: int, cell: tuple[int, int]) -> dict:
+        """Returns the part of a snapshot sent to the clients whose viewports are in a cell, only filtering
+        the snapshot the first time a cell is asked for.
+
+        :param snapshot: The snapshot
+        :param seq: The sequence number of the snapshot
+        :param cell: The cell
+        :return: The filtered snapshot
+        """
+        views = self.views.setdefault(seq, {})
+        view = views.get(cell)
+        if view is None:
+            view = views[cell] = interest.filter_snapshot(snapshot, {
+                "bullets": interest.get_visible_bullets(self.bullets, cell),
+                "portals": interest.get_visible_portals(self.portals, cell),
+            })
+        return view
+
+    def broadcast(self):
+        """Sends every client what has changed within its area of interest since the last snapshot it acknowledged.
+        Clients that haven't acknowledged anything yet (or whose baseline is too old) are sent everything they can
+        see.
+
+        Clients whose viewports are in the same cell see the same entities, so each delta is only built and
+        serialized once per distinct baseline and cell, and the same bytes are queued on every client sharing them.
+        """
+        snapshot = self._get_world_state()
+        seq = self.snapshots.record(snapshot)
+        self.views.pop(seq - SNAPSHOT_HISTORY, None)
+
+        payloads = {}  # {(baseline_seq, baseline cell, current cell): encoded snapshot message}
+        for client in self.players.values():
+            center = interest.get_view_center(client.state["x"], client.state["y"], ROOM_BOUNDS)
+            cell = client.view_cell = interest.get_view_cell(center, client.view_cell)
+            client.view_history[seq] = cell
+            client.view_history.pop(seq - SNAPSHOT_HISTORY, None)
+
+            baseline_seq = client.acked_seq
+            baseline_cell = client.view_history.get(baseline_seq)
+            if baseline_cell not in self.views.get(baseline_seq, {}):
+                baseline_seq = None
+                baseline_cell = None
+
+            key = (baseline_seq, baseline_cell, cell)
+            payload = payloads.get(key)
+            if payload is None:
+                baseline = self.views[baseline_seq][baseline_cell] if baseline_seq is not None else None
+                delta = make_delta(baseline, self._get_view(snapshot, seq, cell))
+                payload = encode_message({
+                    "action": "snapshot",
+                    "seq": seq,
+                    "time_ms": round(self.sim_time * 1000),  # Sent as an int, since floats lose precision
+                    "baseline": baseline_seq,
+                    **delta
+                })
+                payloads[key] = payload
+
+            client.SendEncoded(payload)
+
+        self.broadcast_encodes = len(payloads)
+        self.broadcast_bytes = sum(len(payload) for payload in payloads.values())
+
+    def send_snapshot(self):
+        """Broadcasts the current state of the world to every client.
+
+        :return: None
+        """
+        self.broadcast()
+        self.bullets.retire_ids(self.snapshots.latest_seq)  # This snapshot is the first without the destroyed bullets
+        self.bullets.recycle_ids(self._get_oldest_baseline())
+
+    def _get_oldest_baseline(self) -> int:
+        """Returns the oldest snapshot any client could still be sent a delta against. Snapshots that are still in
+        flight could be acknowledged later, so a client that hasn't acknowledged a kept snapshot could end up using any
+        of them.
+
+        :return: The sequence number of the snapshot
+        """
+        oldest = self.snapshots.latest_seq - self.snapshots.size + 1
+        acked = [client.acked_seq for client in self.players.values()]
+        if acked and None not in acked:
+            oldest = max(oldest, min(acked))
+        return oldest
+
+    def step(self):
+        """Advances the match by one fixed-length step, and measures how much of its tick budget the step used.
+
+        :return: None
+        """
+        start = time.perf_counter()
+        self._simulate()
+        elapsed = time.perf_counter() - start
+
+        self.load += (elapsed - self.load) * LOAD_SMOOTHING
+        if elapsed > self.tick_budget:
+            self.overruns += 1
+
+    def _simulate(self):
+        self.sim_time += self.step_length
+
+        # Each player may move one step's worth farther, which its movement inputs then spend
+        max_budget = MAX_PLAYER_SPEED * MOVE_BURST
+        for ch in self.players.values():
+            ch.move_budget = min(ch.move_budget + MAX_PLAYER_SPEED * self.step_length, max_budget)
+
+        # TCP Sending/Receiving
+        for pid, ch in self.players.items():
+            self.player_grid.insert(pid, self._get_hitbox(ch.state))
+
+        for pid, ch in self.players.items():
+            self._handle_player_teleport(pid, ch.state)
+
+        bullets = self.bullets
+        to_destroy = self._sweep_bullets(BULLET_SPEED * self.step_length)  # Bullets to destroy after all collisions
+        to_destroy.extend(self._handle_player_hits())
+
+        # Destroy bullets OOB
+        to_destroy.extend(bullets.out_of_bounds(*ROOM_BOUNDS).tolist())
+
+        for bullet in to_destroy:
+            self.destroy_bullet(bullet)
+
+        # Updating Portals
+        for portal_id, portal in self.portals.items():
+            portal["x"] = portal["landed_on"]["x"] + portal["offset_x"]
+            portal["y"] = portal["landed_on"]["y"] + portal["offset_y"]
+            self.portal_grid.move(portal_id, self._get_hitbox(portal))
+
+        if self.server_setting_player_number is None:
+            return
+
+        if self.lobby_mode and self._get_num_unique_players() >= int(self.server_setting_player_number):
+            self._exit_lobby_mode()
+
+        # Win condition
+        if not self.lobby_mode and not self.game_over and self._get_num_alive_players() == 1:
+            self.game_over = True
+            self._declare_winner()
+
+    def apply_move(self, channel: Channel, message: dict) -> None:
+        """Moves a player by the movement inputs in a move datagram, skipping the ones already applied from earlier
+        datagrams. The server owns every player's position, so inputs that move farther than the player's speed allows
+        are shortened, and players can't leave the room or pass through walls.
+
+        :param channel: The channel of the moving player
+        :param message: The decoded move datagram
+        :return: None
+        """
+        first_seq = message["seq"] - len(message["moves"]) + 1
+        for seq, (dx, dy) in enumerate(message["moves"], first_seq):
+            if channel.last_move_seq is None or seq > channel.last_move_seq:
+                self._move_player(channel, dx, dy)
+
+        state = channel.state
+        state["angle"] = message["angle"]
+        state["last_input"] = message["seq"]
+        channel.last_move_seq = message["seq"]
+
+    def _move_player(self, channel: Channel, dx: float, dy: float) -> None:
+        """Moves a player by a single movement input.
+
+        :param channel: The channel of the moving player
+        :param dx: How far the player moved along the x-axis
+        :param dy: How far the player moved along the y-axis
+        :return: None
+        """
+        dist = math.hypot(dx, dy)
+        if dist > channel.move_budget:
+            scale = channel.move_budget / dist
+            dx *= scale
+            dy *= scale
+            dist = channel.move_budget
+        channel.move_budget -= dist
+
+        # Moved in short steps, so that a long move stops at the first wall in the way instead of jumping past it
+        steps = max(1, math.ceil(dist / MOVE_STEP))
+        left, top, right, bottom = ROOM_BOUNDS
+        state = channel.state
+        for _ in range(steps):
+            state["x"] = min(max(state["x"] + dx / steps, left), right)
+            state["y"] = min(max(state["y"] + dy / steps, top), bottom)
+            self._block_player(state)
+
+    def _block_player(self, state: dict) -> None:
+        """Pushes a player out of every wall it overlaps, the same way the client blocks its own player.
+
+        :param state: The state of the player
+        :return: None
+        """
+        for wall_id in self.wall_grid.query(self._get_hitbox(state)):
+            wall = self.walls[wall_id]
+            state["x"], state["y"], _ = simulation.block_from_side(
+                state["x"], state["y"], state["hit_w"], state["hit_h"],
+                wall["x"], wall["y"], wall["hit_w"], wall["hit_h"]
+            )
+
+    def _declare_winner(self):
+        winner = ""
+        for ch in self.players.values():
+            if ch.state["hp"] > 0:
+                winner = ch.state["username"]
+
+        print(f"Winner is: {winner}")
+        game_end = {
+            "action": "game_end",
+            "winner": winner
+        }
+        for client in self.players.values():
+            client.Send(game_end)
+
+    def _exit_lobby_mode(self):
+        self.lobby_mode = False
+        for pid, ch in self.players.items():
+            ch.state["lobby_mode"] = False
+        for ip, state_data in self.disconnected_players.items():
+            state_data["state"]["lobby_mode"] = False
+
+    def _get_num_unique_players(self) -> int:
+        return len(self.players) + len(self.disconnected_players)
+
+    def _get_num_alive_players(self) -> int:
+        count = 0
+        for pid, ch in self.players.items():
+            if ch.state["hp"] > 0:
+                count += 1
+        return count
+
+    def _handle_player_teleport(self, player_id, player):
+        player_hitbox = self.player_grid.rects[player_id]
+
+        for portal_id in self.portal_grid.query(player_hitbox):
+            portal = self.portals[portal_id]
+
+            if portal["linked_to"] is None:
+                # print("No connecting portal")
+                continue
+
+            # The server moves the player itself, to the same spot the client will put it
+            portal_out = self.portals[portal["linked_to"]]
+            player["x"], player["y"] = simulation.get_player_exit(
+                portal_out, player["hit_w"], player["hit_h"], simulation.PLAYER_EXIT_GAP
+            )
+            self.player_grid.move(player_id, self._get_hitbox(player))
+
+            client = self.players[player_id]
+            client.Send({
+                "action": "teleport_player",
+                "player_id": player_id,
+                "portal_out_id": portal["linked_to"],
+            })
+            return
+
+    def _handle_player_hits(self) -> list[int]:
+        """Damages every living player touched by a standard bullet.
+
+        :return: The IDs of the bullets that hit a player
+        """
+        to_destroy = []
+        standard = self.bullets.type == BULLET_TYPE_CODES["standard"]
+
+        for pid, ch in self.players.items():
+            player = ch.state
+            if player["hp"] <= 0:
+                continue
+
+            # Intentional: let players take damage from own bullets
+            hitbox = self.player_grid.rects[pid]
+            hits = self.bullets.hit_test(hitbox.x, hitbox.y, hitbox.width, hitbox.height, standard)
+
+            hits = hits[:int(player["hp"])]  # Bullets pass through a player once they've died
+            player["hp"] -= len(hits)
+            to_destroy.extend(hits.tolist())
+
+        return to_destroy
+
+    def _sweep_bullets(self, scale: float) -> list[int]:
+        """Moves every bullet along its velocity, stopping bullets at the first wall or linked portal in their path.
+        Whole paths are tested rather than where bullets end up, so fast bullets can't skip over thin walls.
+
+        :param scale: The fraction of each bullet's velocity to move it by
+        :return: The IDs of the bullets that hit a wall
+        """
+        bullets = self.bullets
+        to_destroy = []
+
+        # Only bullets whose path shares a grid cell with a wall or portal need to be swept
+        swept = bullets.get_swept_hitboxes(scale)
+        cell_size = self.wall_grid.cell_size
+        oversized = (swept[2] - swept[0] > cell_size) | (swept[3] - swept[1] > cell_size)  # Too long for touching()
+        near = bullets.alive & (oversized | self.wall_grid.touching(*swept) | self.portal_grid.touching(*swept))
+        ids = np.flatnonzero(near)
+        if not ids.size:
+            bullets.integrate(scale)
+            return to_destroy
+
+        x, y = bullets.x[ids], bullets.y[ids]
+        hit_w, hit_h = bullets.hit_w[ids], bullets.hit_h[ids]
+        dx, dy = bullets.vx[ids] * scale, bullets.vy[ids] * scale
+
+        first_time = np.full(ids.size, np.inf)
+        first_side = np.zeros(ids.size, np.int8)
+        first_target = np.zeros(ids.size, np.int64)
+        first_is_portal = np.zeros(ids.size, np.bool_)
+
+        for wall_id, wall in self.walls.items():
+            times, sides = simulation.sweep_boxes(
+                x, y, hit_w, hit_h, dx, dy, wall["x"], wall["y"], wall["hit_w"], wall["hit_h"]
+            )
+            sooner = times < first_time
+            first_time[sooner] = times[sooner]
+            first_side[sooner] = sides[sooner]
+            first_target[sooner] = wall_id
+
+        for portal_id, portal in self.portals.items():
+            if portal["linked_to"] is None:
+                continue  # Unlinked portals are passed through, onto the wall behind them
+
+            times, sides = simulation.sweep_boxes(
+                x, y, hit_w, hit_h, dx, dy, portal["x"], portal["y"], portal["hit_w"], portal["hit_h"]
+            )
+            sooner = times <= first_time  # Portals sit on top of walls, so they win ties
+            sooner &= np.isfinite(times)
+            first_time[sooner] = times[sooner]
+            first_side[sooner] = sides[sooner]
+            first_target[sooner] = portal_id
+            first_is_portal[sooner] = True
+
+        # Bullets that hit something stop where they touched it
+        hit = np.flatnonzero(np.isfinite(first_time))
+        travel = np.ones(bullets.capacity)
+        travel[ids[hit]] = first_time[hit]
+        bullets.integrate(scale, travel)
+
+        for index in hit.tolist():
+            bid = int(ids[index])
+            b = bullets.get(bid)
+            target = int(first_target[index])
+
+            if first_is_portal[index]:
+                portal = self.portals[target]
+                simulation.send_through_portal(b, portal, self.portals[portal["linked_to"]])
+                bullets.set_motion(bid, b["x"], b["y"], b["vel_x"], b["vel_y"])
+                continue
+
+            wall = self.walls[target]
+            side = simulation.SIDES[first_side[index]]
+            self._handle_bullet_wall_collision(bid, b, wall, side, to_destroy)
+            # TODO: Spawn bullet shatter on client side
+
+        return to_destroy
+
+    def _handle_bullet_wall_collision(self, bid: int, b_data: dict[str, any], wall: dict, side: str,
+                                      destroy_list: list[int]) -> None:
+        """Handles a bullet hitting a wall.
+
+        :param bid: The ID of the bullet
+        :param b_data: Bullet data being evaluated
+        :param wall: The data of the wall that was hit
+        :param side: The side of the wall that was hit
+        :param destroy_list: A list containing all bullet IDs to be deleted after iterating all bullets
+        :return: None
+        """
+        if b_data["bullet_type"] == "standard":
+            destroy_list.append(bid)
+        elif b_data["bullet_type"] == "portal_bullet":
+            destroy_list.append(bid)
+            self.spawn_portal(b_data["owner"], wall, side, b_data["x"], b_data["y"])
@@ -6,11 +6,19 @@ class ServerManager:
         self.proc = None
         atexit.register(self.stop)
 
-    def start(self):
+    def start(self, workers: int = 0):
+        """Starts a server in a new process.
+
+        :param workers: The number of worker processes to spread matches across, or 0 for a single server process.
+                        Clients connect the same way either way.
+        """
         if not self.proc:
             self.print_settings()
             python_exec = sys.executable
-            self.proc = subprocess.Popen([python_exec, "server.py"])
+            if workers:
+                self.proc = subprocess.Popen([python_exec, "serverpool.py", "--workers", str(workers)])
+            else:
+                self.proc = subprocess.Popen([python_exec, "server.py"])
             print("Server started")
 
     def stop(self):
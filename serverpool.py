@@ -0,0 +1,252 @@
+"""
+Contains the supervisor that spreads matches across a pool of server processes, one per core.
+
+Python only runs one thread at a time per process, so a single server can only ever use one core no matter how many
+matches it hosts. The supervisor starts a worker process per core, each running its own OrbeetoServer on its own port,
+and listens on the public port itself. Every client that connects to the supervisor is told which worker to connect to
+instead:
+
+- Players who disconnected from a match are sent back to the worker hosting that match.
+- New players are sent to a worker with a lobby that still has room, so lobbies fill up before new ones are made.
+- When no lobby has room, the new match is started on the worker with the lowest measured tick load.
+
+Workers report their load to the supervisor a few times per second over a queue.
+"""
+from PodSixNet.Server import Server
+from PodSixNet.Channel import Channel
+
+from server_match import MATCH_TICK_BUDGET
+from tickscheduler import TickScheduler, TICK_RATE, SEND_RATE, MAX_CATCH_UP
+import argparse
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import time
+
+REPORT_INTERVAL = 0.25  # Seconds between load reports sent by each worker
+WORKER_TIMEOUT = 5  # Workers that haven't reported for this long (in seconds) aren't sent new players
+
+
+def run_worker(index: int, host: str, port: int, tick_rate: int, send_rate: int, max_catch_up: int,
+               tick_budget: float, reports: multiprocessing.Queue) -> None:
+    """Runs one worker's server forever. This is the entry point of every worker process.
+
+    :param index: The index of the worker in the pool
+    :param host: The address to listen on
+    :param port: The port to listen on
+    :param tick_rate: Simulation steps per second
+    :param send_rate: Snapshots sent per second
+    :param max_catch_up: The most steps run at once before time is dropped
+    :param tick_budget: How long each match may spend on a step (in seconds)
+    :param reports: The queue load reports are sent to the supervisor on
+    :return: None
+    """
+    # Imported here so that the supervisor itself never loads the simulation
+    from server import OrbeetoServer, serve
+
+    server = OrbeetoServer(host, port, tick_rate, tick_budget)
+    scheduler = TickScheduler(tick_rate, send_rate, max_catch_up)
+    print(f"Worker {index} running on {server.socket.getsockname()}")
+
+    supervisor = multiprocessing.parent_process()
+
+    def report(srv):
+        if supervisor is not None and not supervisor.is_alive():
+            raise SystemExit  # Nothing can reach this worker once the supervisor is gone
+        reports.put((index, srv.get_load_report()))
+
+    serve(server, scheduler, report=report, report_interval=REPORT_INTERVAL)
+
+
+class Worker:
+    def __init__(self, index: int, port: int, process: multiprocessing.Process):
+        """The supervisor's record of one worker process.
+
+        :param index: The index of the worker in the pool
+        :param port: The port the worker listens on
+        :param process: The worker's process
+        """
+        self.index = index
+        self.port = port
+        self.process = process
+
+        # Taken from the worker's latest report
+        self.load = 0.0
+        self.matches = 0
+        self.open_matches = 0
+        self.players = 0
+        self.disconnected = frozenset()
+        self.last_report = None
+
+        self.pending_matches = 0  # Matches started here since the latest report, which it doesn't include yet
+
+    def update(self, report: dict, now: float) -> None:
+        self.load = report["load"]
+        self.matches = report["matches"]
+        self.open_matches = report["open_matches"]
+        self.players = report["players"]
+        self.disconnected = frozenset(report["disconnected"])
+        self.last_report = now
+        self.pending_matches = 0
+
+    def is_alive(self, now: float) -> bool:
+        if not self.process.is_alive():
+            return False
+        # Workers get a grace period to start up before their first report
+        return self.last_report is None or now - self.last_report <= WORKER_TIMEOUT
+
+    def get_expected_load(self) -> float:
+        """Returns the worker's load, counting matches started since its latest report as average matches.
+
+        :return: The expected fraction of a core the worker uses
+        """
+        if not self.pending_matches:
+            return self.load
+        per_match = self.load / self.matches if self.matches else 0.0
+        return self.load + per_match * self.pending_matches
+
+    def __repr__(self):
+        return (f'Worker({self.index}, port {self.port}, {self.load * 100:.1f}% load, {self.matches} matches, '
+                f'{self.players} players)')
+
+
+class SupervisorChannel(Channel):
+    """A client connected to the supervisor, which only stays connected until it is redirected to a worker.
+    Messages the client sends before it is redirected are ignored, since it sends them again to the worker."""
+    def Close(self):
+        pass
+
+
+class ServerPool(Server):
+    channelClass = SupervisorChannel
+
+    def __init__(self, host="0.0.0.0", port=12345, workers=None, tick_rate=TICK_RATE, send_rate=SEND_RATE,
+                 max_catch_up=MAX_CATCH_UP, tick_budget=MATCH_TICK_BUDGET):
+        """Listens for clients on the public port and sends each of them to one of a pool of worker servers.
+
+        :param host: The address to listen on
+        :param port: The public port. Workers listen on the ports right after it.
+        :param workers: The number of worker processes (defaults to the number of cores)
+        :param tick_rate: Simulation steps per second
+        :param send_rate: Snapshots sent per second
+        :param max_catch_up: The most steps run at once before time is dropped
+        :param tick_budget: How long each match may spend on a step (in seconds)
+        """
+        Server.__init__(self, localaddr=(host, port))
+        self.host = host
+        self.reports = multiprocessing.Queue()
+        self.workers = []
+
+        for index in range(workers or os.cpu_count() or 1):
+            worker_port = port + 1 + index
+            process = multiprocessing.Process(
+                target=run_worker,
+                args=(index, host, worker_port, tick_rate, send_rate, max_catch_up, tick_budget, self.reports),
+                daemon=True,
+            )
+            self.workers.append(Worker(index, worker_port, process))
+
+        self.redirects = 0
+
+    def start(self) -> None:
+        for worker in self.workers:
+            worker.process.start()
+
+    def stop(self) -> None:
+        for worker in self.workers:
+            if worker.process.is_alive():
+                worker.process.terminate()
+        for worker in self.workers:
+            worker.process.join()
+
+    def Connected(self, channel, addr):
+        worker = self._choose_worker(addr[0])
+        if worker is None:
+            print(f"No worker available for {addr[0]}.")
+            channel.close()
+            return
+
+        channel.Send({"action": "redirect", "port": worker.port})
+        self.redirects += 1
+
+    def _choose_worker(self, ip: str) -> Worker | None:
+        """Decides which worker a connecting player should be sent to.
+
+        :param ip: The IP of the connecting player
+        :return: The worker, or None if no worker is running
+        """
+        now = time.time()
+        alive = [worker for worker in self.workers if worker.is_alive(now)]
+        if not alive:
+            return None
+
+        # Players are always sent back to the match they left
+        for worker in alive:
+            if ip in worker.disconnected:
+                return worker
+
+        # Filling the lobbies that already exist before starting new matches
+        open_workers = [worker for worker in alive if worker.open_matches]
+        if open_workers:
+            return min(open_workers, key=lambda worker: worker.get_expected_load())
+
+        # The player will start a new match, so it goes wherever there is the most room
+        worker = min(alive, key=lambda worker: (worker.get_expected_load(), worker.matches + worker.pending_matches))
+        worker.pending_matches += 1
+        worker.open_matches = 1  # Until the next report, so the players after this one join the same lobby
+        return worker
+
+    def read_reports(self) -> None:
+        """Applies every load report the workers have sent since the last call.
+
+        :return: None
+        """
+        now = time.time()
+        while True:
+            try:
+                index, report = self.reports.get_nowait()
+            except queue.Empty:
+                return
+            self.workers[index].update(report, now)
+
+    def get_stats(self) -> str:
+        lines = [f"{self.redirects} players redirected"]
+        lines.extend(repr(worker) for worker in self.workers)
+        return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs a pool of Orbeeto servers, one per core.")
+    parser.add_argument("--port", type=int, default=12345, help="the public port (workers use the ports after it)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (defaults to the core count)")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="simulation steps per second")
+    parser.add_argument("--send-rate", type=int, default=SEND_RATE, help="snapshots sent per second")
+    parser.add_argument("--max-catch-up", type=int, default=MAX_CATCH_UP,
+                        help="most steps run at once before time is dropped")
+    parser.add_argument("--tick-budget", type=float, default=MATCH_TICK_BUDGET,
+                        help="seconds each match may spend on a step before it counts as an overrun")
+    parser.add_argument("--stats-interval", type=float, default=0,
+                        help="seconds between statistics reports (0 to disable)")
+    args = parser.parse_args()
+
+    pool = ServerPool(port=args.port, workers=args.workers, tick_rate=args.tick_rate, send_rate=args.send_rate,
+                      max_catch_up=args.max_catch_up, tick_budget=args.tick_budget)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))  # So the workers are stopped too
+    pool.start()
+    print(f"Supervisor running on {pool.socket.getsockname()} with {len(pool.workers)} workers")
+
+    last_stats = time.time()
+    try:
+        while True:
+            pool.Pump()
+            pool.read_reports()
+
+            if args.stats_interval and time.time() - last_stats >= args.stats_interval:
+                print(pool.get_stats())
+                last_stats = time.time()
+
+            time.sleep(0.01)
+    finally:
+        pool.stop()
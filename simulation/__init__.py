@@ -0,0 +1,16 @@
+"""
+Package containing the physics shared by the client and the server. Nothing in it depends on pygame sprites or a
+display, so the server can run it headless. Everything works on plain floats and the same dicts the server stores
+entities in.
+
+├-- simulation
+    ├-- geometry.py \n
+    ├-- portals.py \n
+    ├-- sweep.py \n
+    ├-- walls.py \n
+"""
+# __init__.py
+from .geometry import *
+from .portals import *
+from .sweep import *
+from .walls import *
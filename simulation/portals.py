@@ -0,0 +1,103 @@
+"""
+Contains how portals are placed on walls and how things pass through them.
+
+Portals are dicts with at least "x", "y", "hit_w", "hit_h", and "facing" keys, the same shape the server stores them
+in. Sprites can pass their own values in the same shape.
+"""
+import constants as cst
+
+from .geometry import rotate, get_portal_turn
+
+PORTAL_LENGTH = 54  # The size of a portal along the wall it sits on
+PORTAL_DEPTH = 20  # The size of a portal out from the wall it sits on
+PLAYER_EXIT_GAP = 4  # The space left between a networked player and the portal it comes out of
+
+
+def place_portal(surface: dict, facing: str, x: float, y: float) -> dict:
+    """Finds where a portal that landed on a surface sits.
+
+    :param surface: The wall or block the portal landed on (a dict with "x", "y", "hit_w", and "hit_h")
+    :param facing: The side of the surface the portal landed on
+    :param x: The x-position of the bullet that made the portal
+    :param y: The y-position of the bullet that made the portal
+    :return: A dict with the "x", "y", "hit_w", "hit_h", and "facing" of the portal
+    """
+    hit_w = PORTAL_LENGTH
+    hit_h = PORTAL_DEPTH
+
+    if facing == cst.SOUTH:
+        y = surface["y"] + surface["hit_h"] // 2
+    elif facing == cst.EAST:
+        x = surface["x"] + surface["hit_w"] // 2
+        hit_w, hit_h = PORTAL_DEPTH, PORTAL_LENGTH
+    elif facing == cst.NORTH:
+        y = surface["y"] - surface["hit_h"] // 2
+    elif facing == cst.WEST:
+        x = surface["x"] - surface["hit_w"] // 2
+        hit_w, hit_h = PORTAL_DEPTH, PORTAL_LENGTH
+
+    return {"x": x, "y": y, "hit_w": hit_w, "hit_h": hit_h, "facing": facing}
+
+
+def get_entry_offset(x: float, y: float, portal_in: dict) -> float:
+    """Returns how far along a portal something entered it, measured from the portal's center.
+
+    :param x: The x-position of whatever is entering the portal
+    :param y: The y-position of whatever is entering the portal
+    :param portal_in: The portal being entered
+    :return: The offset along the portal
+    """
+    if portal_in["facing"] in (cst.EAST, cst.WEST):
+        return y - portal_in["y"]
+    return x - portal_in["x"]
+
+
+def get_exit_position(portal_out: dict, offset: float, hit_w: float, hit_h: float,
+                      margin: float = 0) -> tuple[float, float]:
+    """Returns where something comes out of a portal, just clear of it and at the same offset it went in at.
+
+    :param portal_out: The portal being left from
+    :param offset: How far along the other portal it went in (see get_entry_offset)
+    :param hit_w: The width of its hitbox
+    :param hit_h: The height of its hitbox
+    :param margin: Extra space to leave between it and the portal
+    :return: The position it comes out at
+    """
+    width = (portal_out["hit_w"] + hit_w) // 2
+    height = (portal_out["hit_h"] + hit_h) // 2
+    facing = portal_out["facing"]
+
+    if facing == cst.SOUTH:
+        return portal_out["x"] - offset, portal_out["y"] + height + margin
+    if facing == cst.EAST:
+        return portal_out["x"] + width + margin, portal_out["y"] - offset
+    if facing == cst.NORTH:
+        return portal_out["x"] + offset, portal_out["y"] - height - margin
+    return portal_out["x"] - width - margin, portal_out["y"] + offset
+
+
+def get_player_exit(portal_out: dict, hit_w: float, hit_h: float, gap: float = 0) -> tuple[float, float]:
+    """Returns where a player comes out of a portal. Players always come out of the center of the portal.
+
+    :param portal_out: The portal being left from
+    :param hit_w: The width of the player's hitbox
+    :param hit_h: The height of the player's hitbox
+    :param gap: Extra space to leave between the player and the portal
+    :return: The position the player comes out at
+    """
+    return get_exit_position(portal_out, 0, hit_w, hit_h, gap)
+
+
+def send_through_portal(entity: dict, portal_in: dict, portal_out: dict) -> None:
+    """Moves an entity from one portal to the other, turning its velocity to match the portal it leaves from.
+
+    :param entity: The entity (a dict with "x", "y", "vel_x", "vel_y", "hit_w", and "hit_h"). Modified in place.
+    :param portal_in: The portal being entered
+    :param portal_out: The portal being left from
+    :return: None
+    """
+    offset = get_entry_offset(entity["x"], entity["y"], portal_in)
+    entity["x"], entity["y"] = get_exit_position(portal_out, offset, entity["hit_w"], entity["hit_h"])
+    entity["vel_x"], entity["vel_y"] = rotate(
+        entity["vel_x"], entity["vel_y"], get_portal_turn(portal_in["facing"], portal_out["facing"])
+    )
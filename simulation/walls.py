@@ -0,0 +1,94 @@
+"""
+Contains how moving things are stopped by, bounce off of, and land on solid boxes like walls.
+
+Boxes are passed as the position of their center and their size, so sprites and the server's dicts can both use these
+functions without building anything per collision.
+"""
+import constants as cst
+
+from .geometry import get_collision_side
+
+
+def push_out(x: float, y: float, hit_w: float, hit_h: float, box_x: float, box_y: float, box_w: float, box_h: float,
+             side: str | None, margin: float = 0) -> tuple[float, float]:
+    """Moves something overlapping a box just outside of the given side of it.
+
+    :param x: The x-position of whatever is overlapping the box
+    :param y: The y-position of whatever is overlapping the box
+    :param hit_w: The width of its hitbox
+    :param hit_h: The height of its hitbox
+    :param box_x: The x-position of the center of the box
+    :param box_y: The y-position of the center of the box
+    :param box_w: The width of the box
+    :param box_h: The height of the box
+    :param side: The side of the box to move it out of. If None, it isn't moved.
+    :param margin: Extra space to leave between it and the box
+    :return: Its new position
+    """
+    if side == cst.EAST:
+        return box_x + (hit_w + box_w) // 2 + margin, y
+    if side == cst.SOUTH:
+        return x, box_y + (hit_h + box_h) // 2 + margin
+    if side == cst.WEST:
+        return box_x - (hit_w + box_w) // 2 - margin, y
+    if side == cst.NORTH:
+        return x, box_y - (hit_h + box_h) // 2 - margin
+    return x, y
+
+
+def block_from_side(x: float, y: float, hit_w: float, hit_h: float, box_x: float, box_y: float, box_w: float,
+                    box_h: float) -> tuple[float, float, str]:
+    """Stops something overlapping a box at whichever side of the box it ran into.
+
+    :param x: The x-position of whatever is overlapping the box
+    :param y: The y-position of whatever is overlapping the box
+    :param hit_w: The width of its hitbox
+    :param hit_h: The height of its hitbox
+    :param box_x: The x-position of the center of the box
+    :param box_y: The y-position of the center of the box
+    :param box_w: The width of the box
+    :param box_h: The height of the box
+    :return: Its new position and the side of the box it ran into
+    """
+    side = get_collision_side(x, y, box_x, box_y, box_w, box_h)
+    new_x, new_y = push_out(x, y, hit_w, hit_h, box_x, box_y, box_w, box_h, side)
+    return new_x, new_y, side
+
+
+def reflect(vel_x: float, vel_y: float, side: str | None) -> tuple[float, float]:
+    """Bounces a velocity off of a side of a box.
+
+    :param vel_x: The x-component of the velocity
+    :param vel_y: The y-component of the velocity
+    :param side: The side of the box that was hit
+    :return: The velocity after bouncing
+    """
+    if side in (cst.EAST, cst.WEST):
+        return -vel_x, vel_y
+    if side in (cst.SOUTH, cst.NORTH):
+        return vel_x, -vel_y
+    return vel_x, vel_y
+
+
+def get_contact_point(x: float, y: float, box_x: float, box_y: float, box_w: float, box_h: float,
+                      side: str | None) -> tuple[float, float]:
+    """Returns the point on the surface of a box where something hit it, for placing effects like explosions.
+
+    :param x: The x-position of whatever hit the box
+    :param y: The y-position of whatever hit the box
+    :param box_x: The x-position of the center of the box
+    :param box_y: The y-position of the center of the box
+    :param box_w: The width of the box
+    :param box_h: The height of the box
+    :param side: The side of the box that was hit
+    :return: The point of contact
+    """
+    if side == cst.SOUTH:
+        return x, box_y + box_h // 2
+    if side == cst.EAST:
+        return box_x + box_w // 2, y
+    if side == cst.NORTH:
+        return x, box_y - box_h // 2
+    if side == cst.WEST:
+        return box_x - box_w // 2, y
+    return 0, 0
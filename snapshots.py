@@ -0,0 +1,168 @@
+"""
+Contains the delta-compressed snapshot system the server uses to send the state of the world to its clients.
+
+Every tick the server records a snapshot of the world under a sequence number. Each client acknowledges the snapshots
+it receives, and the next snapshot it is sent only contains what was created, changed, or destroyed since the last one
+it acknowledged (its baseline). Clients without a usable baseline are sent the whole world instead.
+
+On the server, bullets are recorded as ``BulletColumns`` rather than a dict per bullet, and compared a column at a time.
+Clients always receive and rebuild plain dicts.
+"""
+from bullettable import BulletColumns
+
+SNAPSHOT_KINDS = ("players", "bullets", "portals", "walls")
+SNAPSHOT_HISTORY = 64  # How many past snapshots are kept around to use as baselines
+
+
+def make_delta(baseline: dict | None, current: dict) -> dict:
+    """Returns the differences between two snapshots of the world.
+
+    :param baseline: The snapshot the receiver already has. None if the receiver has nothing (a full resync).
+    :param current: The snapshot the receiver should end up with. Any kind may be stored as ``BulletColumns`` instead
+        of a dict, as long as it is stored the same way in the baseline.
+    :return: A dict with the keys "created", "changed", and "destroyed". "created" holds the full state of every new
+        entity, "changed" holds only the fields that differ for every changed entity, and "destroyed" holds the IDs
+        of every removed entity. Each is keyed by entity kind, and kinds without any entries are left out.
+    """
+    created = {}
+    changed = {}
+    destroyed = {}
+
+    for kind in SNAPSHOT_KINDS:
+        new_entities = current[kind]
+        if isinstance(new_entities, BulletColumns):
+            kind_created, kind_changed, kind_destroyed = new_entities.diff(
+                baseline[kind] if baseline is not None else None
+            )
+        else:
+            kind_created, kind_changed, kind_destroyed = _diff_entities(
+                baseline[kind] if baseline is not None else {}, new_entities
+            )
+
+        if kind_created:
+            created[kind] = kind_created
+        if kind_changed:
+            changed[kind] = kind_changed
+        if kind_destroyed:
+            destroyed[kind] = kind_destroyed
+
+    return {
+        "created": created,
+        "changed": changed,
+        "destroyed": destroyed,
+    }
+
+
+def _diff_entities(old_entities: dict, new_entities: dict) -> tuple[dict, dict, list]:
+    """Returns the differences between two versions of the entities of one kind. See make_delta.
+
+    :param old_entities: The entities the receiver already has, keyed by ID
+    :param new_entities: The entities the receiver should end up with, keyed by ID
+    :return: The created entities, the changed fields of the changed entities, and the IDs of the destroyed entities
+    """
+    created = {}
+    changed = {}
+    for entity_id, state in new_entities.items():
+        old_state = old_entities.get(entity_id)
+        if old_state is None:
+            created[entity_id] = state
+        elif old_state is not state and old_state != state:
+            changed[entity_id] = {
+                field: value
+                for field, value in state.items()
+                if field not in old_state or old_state[field] != value
+            }
+
+    destroyed = [entity_id for entity_id in old_entities if entity_id not in new_entities]
+    return created, changed, destroyed
+
+
+def apply_delta(baseline: dict | None, delta: dict) -> dict:
+    """Rebuilds a snapshot of the world from a baseline and the differences sent on top of it. The baseline is not
+    modified, and entities that did not change are shared between the two snapshots, so neither should be mutated.
+
+    :param baseline: The snapshot the delta was made against. None if the delta is a full resync.
+    :param delta: The differences returned by ``make_delta``
+    :return: The new snapshot
+    """
+    snapshot = {}
+    for kind in SNAPSHOT_KINDS:
+        entities = dict(baseline[kind]) if baseline is not None else {}
+
+        for entity_id in delta["destroyed"].get(kind, ()):
+            entities.pop(entity_id, None)
+
+        for entity_id, fields in delta["changed"].get(kind, {}).items():
+            state = dict(entities[entity_id])
+            state.update(fields)
+            entities[entity_id] = state
+
+        entities.update(delta["created"].get(kind, {}))
+        snapshot[kind] = entities
+
+    return snapshot
+
+
+class SnapshotHistory:
+    """Keeps the most recent snapshots of the world so they can be used as baselines."""
+    def __init__(self, size: int = SNAPSHOT_HISTORY):
+        """Keeps the most recent snapshots of the world so they can be used as baselines.
+
+        :param size: The number of snapshots to keep
+        """
+        self.size = size
+        self.snapshots = {}  # {seq: snapshot}
+        self.latest_seq = -1
+
+    def record(self, snapshot: dict) -> int:
+        """Stores a new snapshot and evicts the oldest one if the history is full.
+
+        :param snapshot: The snapshot to store. It must not be mutated afterward.
+        :return: The sequence number assigned to the snapshot
+        """
+        self.latest_seq += 1
+        self.snapshots[self.latest_seq] = snapshot
+        self.snapshots.pop(self.latest_seq - self.size, None)
+        return self.latest_seq
+
+    def get(self, seq: int | None) -> dict | None:
+        """Returns a stored snapshot, or None if it has already been evicted (or seq is None)."""
+        return self.snapshots.get(seq)
+
+    def clear(self) -> None:
+        self.snapshots.clear()
+
+
+class SnapshotReceiver:
+    """Rebuilds the snapshots sent by the server on the client side."""
+    def __init__(self, size: int = SNAPSHOT_HISTORY):
+        """Rebuilds the snapshots sent by the server on the client side.
+
+        :param size: The number of received snapshots to keep as possible baselines
+        """
+        self.history = SnapshotHistory(size)
+        self.latest = None
+
+    def receive(self, message: dict) -> dict | None:
+        """Applies a snapshot message on top of the baseline it was made against.
+
+        :param message: The snapshot message sent by the server
+        :return: The rebuilt snapshot, or None if the baseline is no longer available and a full resync is needed
+        """
+        baseline = None
+        if message["baseline"] is not None:
+            baseline = self.history.get(message["baseline"])
+            if baseline is None:
+                return None
+
+        snapshot = apply_delta(baseline, message)
+        seq = message["seq"]
+        self.history.snapshots[seq] = snapshot
+        self.history.snapshots.pop(seq - self.history.size, None)
+        self.history.latest_seq = seq
+        self.latest = snapshot
+        return snapshot
+
+    def clear(self) -> None:
+        self.history.clear()
+        self.latest = None
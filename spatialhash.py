@@ -0,0 +1,176 @@
+"""
+Contains the uniform-grid spatial hash used as a collision broadphase.
+"""
+import numpy as np
+import pygame
+
+
+class SpatialHash:
+    """A uniform grid that buckets rects by the cells they overlap so that only nearby rects need to be tested."""
+    def __init__(self, cell_size: int = 128):
+        """A uniform grid that buckets rects by the cells they overlap.
+
+        :param cell_size: The width and height of each grid cell (in pixels)
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # {(cell_x, cell_y): {key, ...}}
+        self.rects = {}  # {key: pygame.Rect}
+        self._spans = {}  # {key: (min_cell_x, min_cell_y, max_cell_x, max_cell_y)}
+        self._packed_cells = None  # Sorted array of occupied cells, rebuilt lazily for touching()
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __contains__(self, key):
+        return key in self.rects
+
+    def _get_span(self, rect: pygame.Rect) -> tuple[int, int, int, int]:
+        """Returns the range of cells a rect overlaps.
+
+        :param rect: The rect to find the cells of
+        :return: The minimum and maximum cell coordinates along each axis (inclusive)
+        """
+        size = self.cell_size
+        return (
+            rect.left // size,
+            rect.top // size,
+            (rect.right - 1) // size,
+            (rect.bottom - 1) // size
+        )
+
+    @staticmethod
+    def _pack(cell_x, cell_y):
+        """Packs cell coordinates (ints or integer arrays) into single int64 values."""
+        return (np.asarray(cell_x, np.int64) << 32) | (np.asarray(cell_y, np.int64) & 0xFFFFFFFF)
+
+    def _bucket(self, key, span: tuple[int, int, int, int]) -> None:
+        self._packed_cells = None
+        min_x, min_y, max_x, max_y = span
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                self.cells.setdefault((cell_x, cell_y), set()).add(key)
+
+    def _unbucket(self, key, span: tuple[int, int, int, int]) -> None:
+        self._packed_cells = None
+        min_x, min_y, max_x, max_y = span
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                cell = self.cells[(cell_x, cell_y)]
+                cell.discard(key)
+                if not cell:
+                    del self.cells[(cell_x, cell_y)]
+
+    def insert(self, key, rect: pygame.Rect) -> None:
+        """Adds a rect to the grid. If the key is already present, the rect is moved instead.
+
+        :param key: The ID of the object the rect belongs to
+        :param rect: The hitbox of the object
+        :return: None
+        """
+        if key in self.rects:
+            self.move(key, rect)
+            return
+
+        span = self._get_span(rect)
+        self.rects[key] = rect
+        self._spans[key] = span
+        self._bucket(key, span)
+
+    def move(self, key, rect: pygame.Rect) -> None:
+        """Updates the rect of an object already in the grid. The object is only re-bucketed if it has crossed into
+        a different set of cells.
+
+        :param key: The ID of the object being moved
+        :param rect: The new hitbox of the object
+        :return: None
+        """
+        span = self._get_span(rect)
+        self.rects[key] = rect
+
+        old_span = self._spans[key]
+        if span != old_span:
+            self._unbucket(key, old_span)
+            self._bucket(key, span)
+            self._spans[key] = span
+
+    def remove(self, key) -> None:
+        """Removes an object from the grid. Does nothing if the object isn't present.
+
+        :param key: The ID of the object to remove
+        :return: None
+        """
+        if key not in self.rects:
+            return
+
+        self._unbucket(key, self._spans[key])
+        del self.rects[key]
+        del self._spans[key]
+
+    def clear(self) -> None:
+        """Removes every object from the grid.
+
+        :return: None
+        """
+        self.cells.clear()
+        self.rects.clear()
+        self._spans.clear()
+        self._packed_cells = None
+
+    def query(self, rect: pygame.Rect) -> list:
+        """Returns the keys of every object whose rect collides with the given rect.
+
+        :param rect: The area to search
+        :return: The colliding keys, sorted so that results don't depend on bucket ordering
+        """
+        cells = self.cells
+        if not cells:
+            return []
+
+        min_x, min_y, max_x, max_y = self._get_span(rect)
+        if min_x == max_x and min_y == max_y:  # Most small rects sit inside a single cell
+            found = cells.get((min_x, min_y))
+            if not found:
+                return []
+        else:
+            found = set()
+            for cell_x in range(min_x, max_x + 1):
+                for cell_y in range(min_y, max_y + 1):
+                    cell = cells.get((cell_x, cell_y))
+                    if cell:
+                        found.update(cell)
+
+        rects = self.rects
+        hits = [key for key in found if rect.colliderect(rects[key])]
+        if len(hits) > 1:
+            hits.sort()
+        return hits
+
+    def touching(self, lefts: np.ndarray, tops: np.ndarray, rights: np.ndarray, bottoms: np.ndarray) -> np.ndarray:
+        """Checks many rects at once for whether they touch any occupied cell. Only rects that pass this test can
+        collide with something in the grid. Each rect is assumed to be no larger than a single cell, so testing the
+        cells of its four corners covers it.
+
+        :param lefts: The left edges of the rects
+        :param tops: The top edges of the rects
+        :param rights: The right edges of the rects
+        :param bottoms: The bottom edges of the rects
+        :return: A boolean array that is True for every rect that touches an occupied cell
+        """
+        if not self.cells:
+            return np.zeros(len(lefts), np.bool_)
+
+        if self._packed_cells is None:
+            cells = np.array(list(self.cells.keys()), np.int64)
+            self._packed_cells = np.sort(self._pack(cells[:, 0], cells[:, 1]))
+
+        size = self.cell_size
+        min_x, min_y = lefts // size, tops // size
+        max_x, max_y = (rights - 1) // size, (bottoms - 1) // size
+
+        output = np.zeros(len(lefts), np.bool_)
+        for cell_x, cell_y in ((min_x, min_y), (max_x, min_y), (min_x, max_y), (max_x, max_y)):
+            output |= np.isin(self._pack(cell_x, cell_y), self._packed_cells, assume_unique=False)
+        return output
+
+    def __repr__(self):
+        return f'SpatialHash({self.cell_size}, {len(self.rects)} objects, {len(self.cells)} cells)'
@@ -1,7 +1,113 @@
+"""
+Contains the spritesheet class and the asset cache that makes sure each sheet is only loaded and sliced once.
+"""
+import os
+
 import pygame
 from pygame.math import Vector2 as vec
 
 
+class AssetCache:
+    def __init__(self):
+        """A cache of every sprite sheet loaded by the game, along with the frames that have been snipped from them.
+        Sprites that use the same sheet share the same frames, so they must not draw onto them.
+        """
+        self.sheets = {}  # {path: pygame.Surface}
+        self.frames = {}  # {(path, sprites_per_row, width, height, image_count, image_offset): [pygame.Surface, ...]}
+
+        self.hits = 0
+        self.misses = 0
+
+    def load_sheet(self, file_name: str) -> pygame.Surface:
+        """Returns the image of a sprite sheet, loading it from disk only the first time it is asked for.
+
+        :param file_name: The file name of the sprite sheet
+        :return: The sprite sheet's image
+        """
+        path = os.path.abspath(file_name)
+        if path in self.sheets:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.sheets[path] = pygame.image.load(path).convert()
+        return self.sheets[path]
+
+    def get_images(self, file_name: str, sprites_per_row: int, width: int, height: int, image_count: int,
+                   image_offset: int = 0) -> list:
+        """Returns frames snipped from a sprite sheet, snipping them only the first time they are asked for.
+
+        :param file_name: The file name of the sprite sheet
+        :param sprites_per_row: The amount of sprites in each row of the sprite sheet image file
+        :param width: The width of each frame (in pixels)
+        :param height: The height of each frame (in pixels)
+        :param image_count: The number of images to "snip"
+        :param image_offset: Which image should the "snip" start from? Defaults to the first image in the spritesheet.
+        :return: A new list holding the shared frames
+        """
+        key = (os.path.abspath(file_name), sprites_per_row, width, height, image_count, image_offset)
+        if key in self.frames:
+            self.hits += 1
+        else:
+            self.misses += 1
+            sheet = self.load_sheet(file_name)
+            self.frames[key] = snip_images(sheet, sprites_per_row, width, height, image_count, image_offset)
+        return list(self.frames[key])
+
+    def get_stats(self) -> dict:
+        """Returns how well the cache is working.
+
+        :return: The number of hits, misses, cached sheets, and cached frame lists, and the hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "sheets": len(self.sheets),
+            "frame_lists": len(self.frames),
+        }
+
+    def clear(self) -> None:
+        """Empties the cache and resets its statistics.
+
+        :return: None
+        """
+        self.sheets.clear()
+        self.frames.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f'AssetCache({self.get_stats()})'
+
+
+def snip_images(sheet: pygame.Surface, sprites_per_row: int, width: int, height: int, image_count: int,
+                image_offset: int = 0) -> list:
+    """Cuts frames out of a sprite sheet's image.
+
+    :param sheet: The image of the sprite sheet
+    :param sprites_per_row: The amount of sprites in each row of the sprite sheet image file
+    :param width: The width of each frame (in pixels)
+    :param height: The height of each frame (in pixels)
+    :param image_count: The number of images to "snip"
+    :param image_offset: Which image should the "snip" start from? Defaults to the first image in the spritesheet.
+    :return: A list of the desired images
+    """
+    image_list = []
+    offset = vec(image_offset % sprites_per_row, image_offset // sprites_per_row)
+    for i in range(0, image_count):
+        if offset.x >= sprites_per_row:
+            offset.x = 0
+            offset.y += 1
+        image = pygame.Surface(vec(width, height))
+        image.blit(sheet, vec(0, 0), (offset.x * width, offset.y * height, width, height))
+        image.set_colorkey((0, 0, 0))
+        image_list.append(image)
+        offset.x += 1
+
+    return image_list
+
+
 class Spritesheet:
     def __init__(self, file_name, sprites_per_row):
         """An object that handles sprite sheets and can extract frames and animations from them
@@ -9,11 +115,13 @@ class Spritesheet:
         :param file_name: The file name of the sprite sheet to manipulate
         :param sprites_per_row: The amount of sprites in each row of the sprite sheet image file
         """
-        self.spritesheet = pygame.image.load(file_name).convert()
+        self.file_name = file_name
+        self.spritesheet = asset_cache.load_sheet(file_name)
         self.columns = sprites_per_row
 
     def get_images(self, width: int, height: int, image_count: int, image_offset: int = 0) -> list:
-        """Returns the images of the spritesheet as a list of images.
+        """Returns the images of the spritesheet as a list of images. The images are shared with every other sprite
+        using the same frames of the same sheet.
 
         :param width: The width of each frame (in pixels)
         :param height: The height of each frame (in pixels)
@@ -21,16 +129,7 @@ class Spritesheet:
         :param image_offset: Which image should the "snip" start from? Defaults to the first image in the spritesheet.
         :return: A list of the desired images
         """
-        image_list = []
-        offset = vec(image_offset % self.columns, image_offset // self.columns)
-        for i in range(0, image_count):
-            if offset.x >= self.columns:
-                offset.x = 0
-                offset.y += 1
-            image = pygame.Surface(vec(width, height))
-            image.blit(self.spritesheet, vec(0, 0), (offset.x * width, offset.y * height, width, height))
-            image.set_colorkey((0, 0, 0))
-            image_list.append(image)
-            offset.x += 1
-
-        return image_list
+        return asset_cache.get_images(self.file_name, self.columns, width, height, image_count, image_offset)
+
+
+asset_cache = AssetCache()
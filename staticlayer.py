@@ -0,0 +1,95 @@
+"""
+Contains the static layer, which bakes a room's walls, floors, and borders into a few large chunk images when the room
+loads, so that they can be drawn with a handful of blits instead of one blit per tile.
+"""
+import pygame
+from pygame.math import Vector2 as vec
+
+import classbases as cb
+import constants as cst
+import gamestack as gs
+
+CHUNK_SIZE = 512  # The width and height of each chunk (in pixels)
+
+
+class StaticChunk(cb.StaticBase):
+    is_bakeable = False
+
+    def __init__(self, chunk_x: int, chunk_y: int, layer: int, gamestate: gs.GameState = gs.s_action):
+        """One square piece of a baked static layer. Chunks are only drawn while they are on the screen.
+
+        :param chunk_x: The x-axis position of the chunk in the grid of chunks
+        :param chunk_y: The y-axis position of the chunk in the grid of chunks
+        :param layer: The layer the chunk is drawn on
+        :param gamestate: The gamestate the chunk should be a part of. Defaults to 'gs.s_action'
+        """
+        super().__init__(layer, gamestate)
+        self.chunk = (chunk_x, chunk_y)
+        self.image = pygame.Surface((CHUNK_SIZE, CHUNK_SIZE), pygame.SRCALPHA)
+
+        self.pos = vec((chunk_x + 0.5) * CHUNK_SIZE, (chunk_y + 0.5) * CHUNK_SIZE) + cb.get_camera_pos()
+        self.set_rects(self.pos.x, self.pos.y, CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE)
+
+    def update(self):
+        self.visible = self.rect.colliderect(0, 0, cst.WINWIDTH, cst.WINHEIGHT)
+
+    def __repr__(self):
+        return f'StaticChunk({self.chunk}, {self.layer})'
+
+
+class StaticLayer:
+    def __init__(self, sprites, gamestate: gs.GameState = gs.s_action):
+        """Bakes static sprites into chunk images. The baked sprites stay in their groups, so they still collide like
+        before, but they are hidden so that only the chunks are drawn.
+
+        :param sprites: The sprites to bake. Only sprites that are static, bakeable, and in their game state are baked.
+        :param gamestate: The gamestate the chunks should be a part of. Defaults to 'gs.s_action'
+        """
+        self.gamestate = gamestate
+        self.chunks = {}  # {(layer, chunk_x, chunk_y): StaticChunk}
+        self.baked = []
+
+        camera = cb.get_camera_pos()
+        for sprite in sprites:
+            if sprite.is_static and sprite.is_bakeable and sprite.in_gamestate and sprite.image is not None:
+                self._bake_sprite(sprite, sprite.rect.move(-camera.x, -camera.y))
+
+        for chunk in self.chunks.values():
+            chunk.add_to_gamestate()
+
+    def _bake_sprite(self, sprite, room_rect: pygame.Rect) -> None:
+        """Draws a sprite onto every chunk it overlaps, then hides it.
+
+        :param sprite: The sprite to bake
+        :param room_rect: The rect of the sprite's image within the room
+        :return: None
+        """
+        for chunk_x in range(room_rect.left // CHUNK_SIZE, (room_rect.right - 1) // CHUNK_SIZE + 1):
+            for chunk_y in range(room_rect.top // CHUNK_SIZE, (room_rect.bottom - 1) // CHUNK_SIZE + 1):
+                key = (sprite.layer, chunk_x, chunk_y)
+                if key not in self.chunks:
+                    self.chunks[key] = StaticChunk(chunk_x, chunk_y, sprite.layer, self.gamestate)
+                self.chunks[key].image.blit(
+                    sprite.image, (room_rect.x - chunk_x * CHUNK_SIZE, room_rect.y - chunk_y * CHUNK_SIZE)
+                )
+
+        sprite.visible = False
+        self.baked.append(sprite)
+
+    def clear(self) -> None:
+        """Removes the chunks and shows the sprites that were baked into them again.
+
+        :return: None
+        """
+        for chunk in self.chunks.values():
+            chunk.kill()
+        for sprite in self.baked:
+            sprite.visible = True
+        self.chunks = {}
+        self.baked = []
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def __repr__(self):
+        return f'StaticLayer({len(self.chunks)} chunks, {len(self.baked)} sprites)'
@@ -0,0 +1,6 @@
+"""
+Package containing the unit tests. Run them from the project root with ``python -m pytest tests``
+
+├-- tests
+    ├-- test_server_match.py
+"""
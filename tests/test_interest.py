@@ -0,0 +1,66 @@
+"""
+Tests the server's area-of-interest cells.
+"""
+import types
+import unittest
+
+import interest
+from server_match import Match, ROOM_BOUNDS
+
+
+def make_client(player_id: int, x: float, y: float) -> types.SimpleNamespace:
+    """Returns a stand-in for a connected player's channel, holding only what sending it snapshots needs.
+
+    :param player_id: The ID of the player
+    :param x: The x-position of the player
+    :param y: The y-position of the player
+    :return: The stand-in channel
+    """
+    return types.SimpleNamespace(
+        id=player_id,
+        state={"x": x, "y": y, "hit_w": 32, "hit_h": 32, "angle": 0, "last_input": 0},
+        acked_seq=None,
+        view_history={},
+        view_cell=None,
+        SendEncoded=lambda payload: len(payload),
+    )
+
+
+class TestViewCell(unittest.TestCase):
+    def test_cell_is_kept_near_its_edge(self):
+        edge = 8 * interest.AOI_CELL_SIZE
+        cell = interest.get_view_cell((edge - 10, 1000))
+        for x in (edge + 10, edge - 10, edge + interest.AOI_EXIT_MARGIN - 1, edge - 10):
+            self.assertEqual(interest.get_view_cell((x, 1000), cell), cell)
+
+    def test_cell_changes_past_exit_margin(self):
+        edge = 8 * interest.AOI_CELL_SIZE
+        cell = interest.get_view_cell((edge - 10, 1000))
+        self.assertEqual(interest.get_view_cell((edge + interest.AOI_EXIT_MARGIN, 1000), cell), (cell[0] + 1, cell[1]))
+
+    def test_area_covers_viewport_while_cell_is_kept(self):
+        cell = (8, 4)
+        left, top, right, bottom = interest.get_cell_area(cell)
+        far_x = 8 * interest.AOI_CELL_SIZE - interest.AOI_EXIT_MARGIN  # The furthest the view center can stay in cell
+        far_y = 5 * interest.AOI_CELL_SIZE + interest.AOI_EXIT_MARGIN
+        self.assertEqual(far_x - 1280 / 2 - interest.AOI_MARGIN, left)
+        self.assertEqual(far_y + 720 / 2 + interest.AOI_MARGIN, bottom)
+
+class TestBroadcast(unittest.TestCase):
+    def test_area_does_not_change_across_cell_edge(self):
+        match = Match(0)
+        client = make_client(0, 8 * interest.AOI_CELL_SIZE - 20, 1200)
+        match.add_player(client)
+        self.assertLess(client.state["x"], ROOM_BOUNDS[2] - 1280 / 2)  # Keeps the camera from clamping the view
+
+        match.broadcast()
+        cell = client.view_cell
+        for step in range(20):
+            client.state["x"] += 40 if step % 2 == 0 else -40
+            match.broadcast()
+            self.assertEqual(client.view_cell, cell)
+            self.assertEqual(client.view_history[match.snapshots.latest_seq], cell)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests the server's handling of player movement within a match.
+"""
+import types
+import unittest
+
+from server_match import Match
+from server_rooms import ServerRoom
+
+
+def make_player(x: float, y: float, move_budget: float = 1000) -> types.SimpleNamespace:
+    """Returns a stand-in for a connected player's channel, holding only what moving the player needs.
+
+    :param x: The x-position of the player
+    :param y: The y-position of the player
+    :param move_budget: How far the player is allowed to move
+    :return: The stand-in channel
+    """
+    return types.SimpleNamespace(
+        state={"x": x, "y": y, "hit_w": 32, "hit_h": 32, "angle": 0, "last_input": 0},
+        move_budget=move_budget,
+        last_move_seq=None,
+    )
+
+
+def make_move(seq: int, dx: float, dy: float, earlier: list = ()) -> dict:
+    """Returns a decoded move datagram.
+
+    :param seq: The sequence number of the newest movement
+    :param dx: How far the newest movement moves along the x-axis
+    :param dy: How far the newest movement moves along the y-axis
+    :param earlier: The movements sent before the newest one that the datagram repeats, oldest first
+    :return: The move datagram
+    """
+    return {"action": "move", "seq": seq, "moves": [*earlier, (dx, dy)], "angle": 0}
+
+
+class TestApplyMove(unittest.TestCase):
+    def setUp(self):
+        self.match = Match(0)
+        self.match.walls = {0: ServerRoom.new_wall(10, 10, 16, 16, 1, 20)}  # 16 px thick, centered on x = 168
+        self.match.wall_grid.clear()
+        self.match.wall_grid.insert(0, self.match._get_hitbox(self.match.walls[0]))
+
+    def test_open_move(self):
+        player = make_player(300, 250)
+        self.match.apply_move(player, make_move(1, 20, -10))
+        self.assertAlmostEqual(player.state["x"], 320)
+        self.assertAlmostEqual(player.state["y"], 240)
+        self.assertEqual(player.last_move_seq, 1)
+
+    def test_move_into_wall_is_blocked(self):
+        player = make_player(120, 250)
+        self.match.apply_move(player, make_move(1, 30, 0))
+        self.assertEqual(player.state["x"], 160 - 16)  # Stopped against the wall's west face
+
+    def test_long_move_cannot_pass_through_wall(self):
+        player = make_player(120, 250)
+        self.match.apply_move(player, make_move(1, 200, 0))
+        self.assertEqual(player.state["x"], 160 - 16)
+
+    def test_move_along_wall(self):
+        player = make_player(144, 250)
+        self.match.apply_move(player, make_move(1, 0, 30))
+        self.assertEqual((player.state["x"], player.state["y"]), (144, 280))
+
+    def test_repeated_inputs_are_applied_once(self):
+        player = make_player(300, 250)
+        self.match.apply_move(player, make_move(2, 10, 0, earlier=[(10, 0)]))
+        self.match.apply_move(player, make_move(3, 10, 0, earlier=[(10, 0), (10, 0)]))
+        self.assertAlmostEqual(player.state["x"], 330)
+        self.assertEqual(player.state["last_input"], 3)
+
+    def test_lost_inputs_are_recovered(self):
+        player = make_player(300, 250)
+        self.match.apply_move(player, make_move(1, 10, 0))
+        # The datagrams carrying inputs 2 and 3 were lost, but the next one repeats them
+        self.match.apply_move(player, make_move(4, 0, 5, earlier=[(10, 0), (10, 0), (10, 0)]))
+        self.assertAlmostEqual(player.state["x"], 330)
+        self.assertAlmostEqual(player.state["y"], 255)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@
 Contains all text classes that appear on-screen, as well as all on-screen text operations.
 """
 import time
+from collections import OrderedDict
 
 import pygame
 from pygame.math import Vector2 as vec
@@ -15,6 +16,87 @@ import constants as cst
 import groups
 
 
+class TextCache:
+    def __init__(self, max_entries: int = 256):
+        """A cache of system fonts and of the text images rendered with them. Fonts are looked up once per family and
+        size, and the most recently used text images are kept so that labels that don't change aren't rendered again.
+
+        :param max_entries: The most text images to keep. The least recently used ones are dropped first.
+        """
+        self.max_entries = max_entries
+        self.fonts = {}  # {(font_family, font_size): pygame.font.Font}
+        self.images = OrderedDict()  # {(text, font_family, font_size, color): pygame.Surface}
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, font_family: str, font_size: int) -> pygame.font.Font:
+        """Returns a system font, looking it up only the first time it is asked for.
+
+        :param font_family: The name of the font
+        :param font_size: The size of the font
+        :return: The font
+        """
+        key = (font_family, font_size)
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.SysFont(font_family, font_size)
+        return self.fonts[key]
+
+    def render(self, any_text: str, font_size: int, font_family: str, color: tuple) -> pygame.Surface:
+        """Returns an image of some text, only rendering it if the same text hasn't been rendered recently. The image is
+        shared, so it must not be drawn onto.
+
+        :param any_text: The text to render
+        :param font_size: The size of the font
+        :param font_family: The name of the font
+        :param color: The color of the text
+        :return: The image of the text
+        """
+        key = (any_text, font_family, font_size, tuple(color))
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            self.images.move_to_end(key)
+            return image
+
+        self.misses += 1
+        image = self.get_font(font_family, font_size).render(any_text, True, color)
+        self.images[key] = image
+        if len(self.images) > self.max_entries:
+            self.images.popitem(last=False)
+        return image
+
+    def get_stats(self) -> dict:
+        """Returns how well the cache is working.
+
+        :return: The number of hits, misses, cached fonts, and cached images, and the hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "fonts": len(self.fonts),
+            "images": len(self.images),
+        }
+
+    def clear(self) -> None:
+        """Empties the cache and resets its statistics.
+
+        :return: None
+        """
+        self.fonts.clear()
+        self.images.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f'TextCache({self.get_stats()})'
+
+
+text_cache = TextCache()
+
+
 def draw_text(any_text: str, pos_x, pos_y, font_size= 24, font_family="Arial", color=(0, 0, 0)) -> None:
     """Draws text on to the screen.
 
@@ -24,9 +106,9 @@ def draw_text(any_text: str, pos_x, pos_y, font_size= 24, font_family="Arial", c
     :param font_size: font size of the text
     :return: None
     """
-    font = pygame.font.SysFont(font_family, font_size)
-    image = font.render(any_text, True, color)
+    image = text_cache.render(any_text, font_size, font_family, color)
     screen.buffer_screen.blit(image, vec(pos_x, pos_y))
+    screen.drawn_text.append((image, pygame.Rect((pos_x, pos_y), image.get_size())))
 
 
 class IndicatorText(cb.ActorBase):
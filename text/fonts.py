@@ -1,6 +1,7 @@
 """
 Contains the custom font class and all information about every custom font.
 """
+import functools
 import os
 
 import pygame
@@ -27,6 +28,22 @@ class Font:
         self.chars_per_row = chars_per_row
         self.char_count = char_count
 
+        self._glyphs = None
+
+    def get_glyphs(self) -> list:
+        """Returns the font's glyph atlas: the image of every character in the font, in the order of its sprite sheet.
+        The atlas is only snipped from the sprite sheet the first time it is asked for.
+
+        :return: The images of the font's characters
+        """
+        if self._glyphs is None:
+            sheet = spritesheet.Spritesheet(self.path, self.chars_per_row)
+            self._glyphs = sheet.get_images(self.char_width, self.char_height, self.char_count)
+        return self._glyphs
+
+    def __repr__(self):
+        return f'Font({self.path}, {self.char_width}, {self.char_height})'
+
 
 indicator_font = Font(os.path.join(os.getcwd(), 'sprites/fonts/font.png'), 9, 14, 26, 81)
 font_small = Font(os.path.join(os.getcwd(), 'sprites/fonts/small_font.png'), 5, 7, 26, 81)
@@ -47,15 +64,16 @@ TEXT_MAP = {
 }
 
 
+@functools.lru_cache(maxsize=512)
 def text_to_image(any_text: str, a_font: Font) -> pygame.Surface:
-    """Converts a string of text into an image with a given font.
+    """Converts a string of text into an image with a given font. The most recently converted strings are cached, so
+    the returned image is shared and must not be drawn onto.
 
     :param any_text: The text string to convert into an image
     :param a_font: The font object to retrieve font data from
     :return: The converted image
     """
-    sheet = spritesheet.Spritesheet(a_font.path, a_font.chars_per_row)
-    images = sheet.get_images(a_font.char_width, a_font.char_height, a_font.char_count)
+    images = a_font.get_glyphs()
     char_list = []
 
     final_image = pygame.Surface(vec(len(any_text) * a_font.char_width, a_font.char_height))
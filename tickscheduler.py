@@ -0,0 +1,125 @@
+"""
+Contains the fixed-timestep scheduler the server runs its simulation and snapshot sends with.
+
+The simulation always advances in steps of the same length no matter how long each loop iteration takes, so bullet
+speeds and other per-tick values stay the same under load. Snapshots are sent at their own (usually lower) rate so that
+CPU and bandwidth can be tuned separately.
+"""
+import time
+
+TICK_RATE = 100  # Simulation steps per second
+SEND_RATE = 50  # Snapshots sent per second
+MAX_CATCH_UP = 5  # The most steps that can be run in a single update before time is dropped
+
+
+class TickScheduler:
+    """Decides when the simulation should step and when snapshots should be sent."""
+    def __init__(self, tick_rate: int = TICK_RATE, send_rate: int = SEND_RATE, max_catch_up: int = MAX_CATCH_UP,
+                 clock=time.perf_counter):
+        """Decides when the simulation should step and when snapshots should be sent.
+
+        :param tick_rate: The number of simulation steps per second
+        :param send_rate: The number of snapshots sent per second. Cannot be higher than the tick rate.
+        :param max_catch_up: The most steps that can be run in a single update. If the simulation falls further behind
+            than this, the extra time is dropped instead of being caught up on.
+        :param clock: The function used to get the current time (in seconds)
+        """
+        if tick_rate <= 0 or send_rate <= 0:
+            raise ValueError("Tick and send rates must be positive")
+
+        self.tick_rate = tick_rate
+        self.send_rate = min(send_rate, tick_rate)
+        self.tick_length = 1 / tick_rate
+        self.max_catch_up = max_catch_up
+        self._clock = clock
+
+        self._last_time = None
+        self._accumulator = 0.0  # Real time not yet simulated (in seconds)
+        self._send_credit = 0  # Gains send_rate every step, and a snapshot is due once it reaches tick_rate
+
+        # ---- Statistics ---- #
+        self.start_time = None
+        self.ticks = 0
+        self.sends = 0
+        self.late_updates = 0  # Updates that had to run more than one step to catch up
+        self.overruns = 0  # Updates that fell so far behind that time had to be dropped
+        self.dropped_ticks = 0
+        self.busy_time = 0.0  # Total time spent running steps and sends (in seconds)
+        self.longest_update = 0.0  # The longest time a single update took (in seconds)
+
+    def update(self, tick_call, send_call) -> int:
+        """Runs every simulation step that is due, then sends a snapshot if one is due. Should be called as often as
+        possible.
+
+        :param tick_call: The function that advances the simulation by one step
+        :param send_call: The function that sends a snapshot to the clients
+        :return: The number of steps that were run
+        """
+        now = self._clock()
+        if self._last_time is None:
+            self._last_time = now
+            self.start_time = now
+        self._accumulator += now - self._last_time
+        self._last_time = now
+
+        steps = int(self._accumulator / self.tick_length)
+        if steps > self.max_catch_up:
+            self.overruns += 1
+            self.dropped_ticks += steps - self.max_catch_up
+            self._accumulator -= (steps - self.max_catch_up) * self.tick_length
+            steps = self.max_catch_up
+        if steps > 1:
+            self.late_updates += 1
+
+        for _ in range(steps):
+            tick_call()
+            self._accumulator -= self.tick_length
+            self._send_credit += self.send_rate
+        self.ticks += steps
+
+        # Snapshots are only worth sending once the world has moved. Missed sends are not made up for.
+        if self._send_credit >= self.tick_rate:
+            self._send_credit %= self.tick_rate
+            send_call()
+            self.sends += 1
+
+        elapsed = self._clock() - now
+        self.busy_time += elapsed
+        self.longest_update = max(self.longest_update, elapsed)
+        return steps
+
+    def get_sleep_time(self) -> float:
+        """Returns how long the caller can sleep before the next step is due.
+
+        :return: The time until the next step (in seconds)
+        """
+        if self._last_time is None:
+            return 0.0
+        waited = self._clock() - self._last_time
+        return max(0.0, self.tick_length - self._accumulator - waited)
+
+    def get_stats(self) -> dict:
+        """Returns the statistics collected since the scheduler started.
+
+        :return: A dict of the scheduler's statistics
+        """
+        uptime = self._clock() - self.start_time if self.start_time is not None else 0.0
+        return {
+            "uptime": uptime,
+            "ticks": self.ticks,
+            "sends": self.sends,
+            "tick_rate": self.ticks / uptime if uptime else 0.0,
+            "send_rate": self.sends / uptime if uptime else 0.0,
+            "late_updates": self.late_updates,
+            "overruns": self.overruns,
+            "dropped_ticks": self.dropped_ticks,
+            "load": self.busy_time / uptime if uptime else 0.0,
+            "longest_update": self.longest_update,
+        }
+
+    def __repr__(self):
+        stats = self.get_stats()
+        return (f'TickScheduler({stats["tick_rate"]:.1f}/{self.tick_rate} ticks/s, '
+                f'{stats["send_rate"]:.1f}/{self.send_rate} sends/s, load {stats["load"]:.0%}, '
+                f'{self.overruns} overruns, {self.dropped_ticks} dropped ticks, '
+                f'longest update {self.longest_update * 1000:.1f}ms)')
@@ -32,7 +32,7 @@ def fancy_tile_texture(block_width: int, block_height: int, textures: list, colo
     return final_image
 
 
-class TileBase(cb.ActorBase):
+class TileBase(cb.StaticBase):
     def __init__(self, pos_x: int | float, pos_y: int | float, block_width: int, block_height: int,
                  tile_size: int = 16):
         """The base class for all tile sprites
@@ -65,12 +65,6 @@ class TileBase(cb.ActorBase):
         center.y = top_left_y + self.height // 2
         return center
 
-    def movement(self):
-        if self.in_gamestate:
-            # self.set_room_pos()
-            self.accel = self.get_accel()
-            self.accel_movement()
-
     def __repr__(self):
         return f'Wall([{self.pos.x - self.hitbox.width // 2},{self.pos.y - self.hitbox.height // 2}])'
 
@@ -110,7 +104,7 @@ class Wall(TileBase):
         pass
 
 
-class CustomWall(cb.ActorBase):
+class CustomWall(cb.StaticBase):
     def __init__(self, pos_x: float, pos_y: float, shape_art: str, tile_size: int = 64):
         """A wall with a customizable shape
 
@@ -233,15 +227,14 @@ class CustomWall(cb.ActorBase):
             else:
                 raise ValueError(f'shape_art must be a string comprised of \"x\", \"o\", or \"\\n\", not {char}')
 
-    def movement(self):
-        self.accel = self.get_accel()
-        self.accel_movement()
-
     def update(self):
-        self.center_rects()
+        pass
 
 
 class Wall3D(TileBase):
+    is_bakeable = False  # The parallax changes the image's position every frame
+    is_anchored = False
+
     def __init__(self, pos_x: float, pos_y: float, block_width: int, block_height: int,
                  image_row: int = 0, style: int = 0, style_3d: int = 0, base_color: tuple = (0, 0, 1),
                  border_color: tuple = (0, 0, 1), color1: tuple = (0, 0, 1), color2: tuple = (0, 0, 1),
@@ -290,6 +283,7 @@ class Wall3D(TileBase):
     def update(self):
         self.p_ratio_x = -(self.pos.x - cst.WINWIDTH // 2) / (cst.WINWIDTH // 2) * self.parallax_mult.x
         self.p_ratio_y = -(self.pos.y - cst.WINHEIGHT // 2) / (cst.WINHEIGHT // 2) * self.parallax_mult.y
+        self.center_rects()  # The parallax changes as the wall moves across the screen
 
 
 class PerspectiveWall(cb.ActorBase):
@@ -1,4 +1,3 @@
-import copy
 import os
 
 import pygame
@@ -8,6 +7,7 @@ import calc
 import classbases as cb
 import constants as cst
 import groups
+import simulation
 
 
 class Box(cb.ActorBase):
@@ -44,46 +44,29 @@ class Box(cb.ActorBase):
         final_accel += room.get_accel()
 
         if self.hitbox.colliderect(room.player1.hitbox):
-            if calc.triangle_collide(self, room.player1) == cst.SOUTH:
+            side = calc.triangle_collide(self, room.player1)
+            if side == cst.SOUTH:
                 final_accel.y += 0.8
-            if calc.triangle_collide(self, room.player1) == cst.EAST:
+            elif side == cst.EAST:
                 final_accel.x += 0.8
-            if calc.triangle_collide(self, room.player1) == cst.NORTH:
+            elif side == cst.NORTH:
                 final_accel.y -= 0.8
-            if calc.triangle_collide(self, room.player1) == cst.WEST:
+            elif side == cst.WEST:
                 final_accel.x -= 0.8
 
         return final_accel
 
     def teleport(self, portal_in):
         portal_out = calc.get_other_portal(portal_in)
-        dir_in = portal_in.facing
-        dir_out = portal_out.facing
-
-        dist_offset = copy.copy(self.pos.x) - copy.copy(portal_in.pos.x)
-        dir_list = {cst.SOUTH: 180, cst.EAST: 90, cst.NORTH: 0, cst.WEST: 270}
-
-        if dir_in == cst.SOUTH:
-            dist_offset = copy.copy(self.pos.x) - copy.copy(portal_in.pos.x)
-
-        elif dir_in == cst.EAST:
-            dir_list.update({cst.EAST: 180, cst.NORTH: 90, cst.WEST: 0, cst.SOUTH: 270})
-            dist_offset = copy.copy(self.pos.y) - copy.copy(portal_in.pos.y)
-
-        elif dir_in == cst.NORTH:
-            dir_list.update({cst.NORTH: 180, cst.WEST: 90, cst.SOUTH: 0, cst.EAST: 270})
-            dist_offset = copy.copy(self.pos.x) - copy.copy(portal_in.pos.x)
-
-        elif dir_in == cst.WEST:
-            dir_list.update({cst.WEST: 180, cst.SOUTH: 90, cst.EAST: 0, cst.NORTH: 270})
-            dist_offset = copy.copy(self.pos.y) - copy.copy(portal_in.pos.y)
+        offset = simulation.get_entry_offset(self.pos.x, self.pos.y, portal_in.get_data())
+        turn = simulation.get_portal_turn(portal_in.facing, portal_out.facing)
 
         # This part is changed from ActorBase to account for the room's acceleration, as well as the fact that the box
         # uses acceleration, not velocity, as its movement standard
         room = cb.get_room()
-        self._align_sprite(portal_out, dist_offset, dir_out)
+        self._align_sprite(portal_out, offset, portal_out.facing)
         true_vel = self.vel.copy() - room.vel.copy()
-        self.vel = true_vel.rotate(dir_list[dir_out]) + room.vel
+        self.vel = true_vel.rotate(turn) + room.vel
 
     def update(self):
         # Teleporting
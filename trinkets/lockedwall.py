@@ -3,7 +3,6 @@ import time
 from pygame.math import Vector2 as vec
 
 import calc
-import classbases as cb
 import constants as cst
 import groups
 import tiles
@@ -11,6 +10,8 @@ import tiles
 
 class LockedWall(tiles.Wall):
     """A locked wall that can be opened by triggering it via a switch with an identical ID value."""
+    is_bakeable = False
+
     def __init__(self, start_pos_x, start_pos_y, end_pos_x, end_pos_y, id_value: int,
                  block_width: int, block_height: int):
         super().__init__(start_pos_x, start_pos_y, block_width, block_height)
@@ -27,11 +28,9 @@ class LockedWall(tiles.Wall):
         self.switch_diff = calc.get_time_diff(self.last_state_change)
 
         self.pos = self.place_top_left(start_pos_x, start_pos_y)
-        self.start_pos = self.place_top_left(start_pos_x, start_pos_y)
+        self.start_pos = self.place_top_left(start_pos_x, start_pos_y)  # Both relative to the room
         self.end_pos = self.place_top_left(end_pos_x, end_pos_y)
 
-        self._set_room_points()
-
         self._is_moving = False
 
     def _get_activator(self):
@@ -46,51 +45,33 @@ class LockedWall(tiles.Wall):
         except StopIteration:
             raise IndexError
 
-    def _set_room_points(self):
-        room = cb.get_room()
-        self.start_room_pos = vec((self.start_pos.x + room.pos.x, self.start_pos.y + room.pos.y))
-        self.end_room_pos = vec((self.end_pos.x + room.pos.x, self.end_pos.y + room.pos.y))
-
-    def movement(self):
-        if self.in_gamestate:
-            self._set_room_points()
-            self.set_room_pos()
-
-            # Controls movement of wall when activator is activated/deactivated
-            if self.activator.get_state():
-                if not self._is_moving and self.activator.get_state() is not self.last_state:
-                    self.last_state = self.activator.get_state()
-                    self.last_state_change = time.time()
-                    self._is_moving = True
-
-                elif self._is_moving:
-                    self.pos.x = calc.cerp(self.pos.x, self.end_room_pos.x, self.switch_diff / self.speed_mult)
-                    self.pos.y = calc.cerp(self.pos.y, self.end_room_pos.y, self.switch_diff / self.speed_mult)
-                    if self.switch_diff >= self.speed_mult:
-                        self._is_moving = False
-
-            else:
-                if not self._is_moving and self.activator.get_state() is not self.last_state:
-                    self.last_state = self.activator.get_state()
-                    self.last_state_change = time.time()
-                    self._is_moving = True
-
-                elif self._is_moving:
-                    self.pos.x = calc.cerp(self.pos.x, self.start_room_pos.x, self.switch_diff / self.speed_mult)
-                    self.pos.y = calc.cerp(self.pos.y, self.start_room_pos.y, self.switch_diff / self.speed_mult)
-                    if self.switch_diff >= self.speed_mult:
-                        self._is_moving = False
-
-            self.accel = self.get_accel()
-            self.accel_movement()
+    def _slide(self) -> None:
+        """Slides the wall within its room toward its start or end position, depending on its activator."""
+        # Controls movement of wall when activator is activated/deactivated
+        target = self.end_pos if self.activator.get_state() else self.start_pos
+        if not self._is_moving and self.activator.get_state() is not self.last_state:
+            self.last_state = self.activator.get_state()
+            self.last_state_change = time.time()
+            self._is_moving = True
+
+        elif self._is_moving:
+            self.room_pos = vec(
+                calc.cerp(self.room_pos.x, target.x, self.switch_diff / self.speed_mult),
+                calc.cerp(self.room_pos.y, target.y, self.switch_diff / self.speed_mult)
+            )
+            self._rects_camera_pos = None
+            if self.switch_diff >= self.speed_mult:
+                self._is_moving = False
 
     def update(self):
         self.switch_diff = calc.get_time_diff(self.last_state_change)
+        if self.in_gamestate:
+            self._slide()
 
     def __repr__(self):
-        return f'LockedWall({self.id_value}, {self.pos}, {self.start_room_pos})'
+        return f'LockedWall({self.id_value}, {self.pos}, {self.start_pos})'
 
     def __str__(self):
-        return (f'ID value: {self.id_value}, pos: {self.pos}, Start pos: {self.start_room_pos}, '
-                f'End pos: {self.end_room_pos}')
+        return (f'ID value: {self.id_value}, pos: {self.pos}, Start pos: {self.start_pos}, '
+                f'End pos: {self.end_pos}')
     
\ No newline at end of file
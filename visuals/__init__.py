@@ -2,4 +2,5 @@
 Package containing all objects and functions related to visual effects and non-interactive imaging
 """
 from .imgtools import *
+from .rotationcache import *
 from .screenshake import *
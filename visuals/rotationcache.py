@@ -0,0 +1,82 @@
+"""
+Contains the rotation cache, which keeps rotated copies of images so that sprites facing the same way as they did
+before (or as another sprite with the same image) don't rotate their image again.
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+class RotationCache:
+    def __init__(self, angle_step: float = 1.0, max_entries: int = 4096):
+        """A least-recently-used cache of rotated images, keyed by the original image and the angle it was rotated by.
+
+        :param angle_step: The angular resolution (in degrees). Angles are truncated to a multiple of it, so a
+                           larger step means fewer cached rotations but choppier turning.
+        :param max_entries: The most rotated images to keep. The least recently used ones are dropped first.
+        """
+        self.angle_step = angle_step
+        self.max_entries = max_entries
+        self.images = OrderedDict()  # {(pygame.Surface, angle): pygame.Surface}
+
+        self.hits = 0
+        self.misses = 0
+
+    def quantize(self, angle: float) -> float:
+        """Truncates an angle toward zero to the cache's angular resolution, the same way ``int()`` truncated angles
+        before they were cached.
+
+        :param angle: The angle (in degrees)
+        :return: The truncated angle, between 0 and 360
+        """
+        return (int(angle / self.angle_step) * self.angle_step) % 360
+
+    def rotate(self, image: pygame.Surface, angle: float) -> pygame.Surface:
+        """Returns an image rotated by an angle, only rotating it if that rotation isn't cached yet. The returned image
+        is shared, so it must not be drawn onto.
+
+        :param image: The image to rotate
+        :param angle: The angle to rotate the image by (in degrees)
+        :return: The rotated image
+        """
+        key = (image, self.quantize(angle))
+        rotated = self.images.get(key)
+        if rotated is not None:
+            self.hits += 1
+            self.images.move_to_end(key)
+            return rotated
+
+        self.misses += 1
+        rotated = pygame.transform.rotate(image, key[1])
+        self.images[key] = rotated
+        if len(self.images) > self.max_entries:
+            self.images.popitem(last=False)
+        return rotated
+
+    def get_stats(self) -> dict:
+        """Returns how well the cache is working.
+
+        :return: The number of hits, misses, and cached images, and the hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "images": len(self.images),
+        }
+
+    def clear(self) -> None:
+        """Empties the cache and resets its statistics.
+
+        :return: None
+        """
+        self.images.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f'RotationCache({self.angle_step}, {self.get_stats()})'
+
+
+rotation_cache = RotationCache()